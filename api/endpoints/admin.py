@@ -0,0 +1,69 @@
+import os
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from models.schemas import ModelReloadRequest
+from services import prediction_service
+
+router = APIRouter(prefix="/admin")
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    """Admin routes are closed unless ADMIN_TOKEN is set and sent back."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=403, detail="Admin routes are disabled (ADMIN_TOKEN unset)"
+        )
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@router.get("/models", dependencies=[Depends(require_admin)])
+def active_models():
+    """Active version of every registered model (None when not loaded)."""
+    shadow = prediction_service.shadow
+    return {
+        "default": prediction_service.DEFAULT_MODEL,
+        "shadow": shadow.name if shadow is not None else None,
+        "models": {
+            name: loaded.info() if loaded is not None else None
+            for name, loaded in (
+                (name, registry.current())
+                for name, registry in prediction_service.registries.items()
+            )
+        },
+    }
+
+
+@router.post("/models/reload", dependencies=[Depends(require_admin)])
+async def reload_model(
+    request: Optional[ModelReloadRequest] = None, model: Optional[str] = Query(None)
+):
+    """
+    Load, warm up and atomically activate a model/preprocessor pair.
+    Defaults to re-reading the configured artifact files of `model`
+    (the default model if omitted).
+    """
+    try:
+        registry = prediction_service.get_registry(model)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown model '{model}'")
+    model_path = request.model_file if request else None
+    preprocessor_path = request.preprocessor_file if request else None
+
+    artifacts_dir = os.path.dirname(os.path.abspath(registry.model_path))
+    for path in filter(None, (model_path, preprocessor_path)):
+        if os.path.dirname(os.path.abspath(path)) != artifacts_dir:
+            raise HTTPException(
+                status_code=400, detail=f"Artifacts must live in {artifacts_dir}"
+            )
+
+    try:
+        loaded = await run_in_threadpool(registry.load, model_path, preprocessor_path)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Model reload failed: {e}")
+    return loaded.info()
@@ -1,11 +1,21 @@
 from fastapi import APIRouter, HTTPException
-from services.prediction_service import model_loaded
+from services import prediction_service
 
 router = APIRouter()
 
 
 @router.get("/health")
 def health_check():
-    if model_loaded:
-        return {"status": "ok", "message": "Model and preprocessor loaded."}
+    loaded = prediction_service.registry.current()
+    if loaded is not None:
+        return {
+            "status": "ok",
+            "message": "Model and preprocessor loaded.",
+            "model_version": loaded.version,
+            "models": {
+                name: registry.current().version if registry.current() else None
+                for name, registry in prediction_service.registries.items()
+            },
+            "cache": prediction_service.cache.stats(),
+        }
     raise HTTPException(status_code=500, detail="Model not loaded")
@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Response
+from services.metrics import render_latest
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+def metrics():
+    payload, content_type = render_latest()
+    return Response(content=payload, media_type=content_type)
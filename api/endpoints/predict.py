@@ -1,19 +1,198 @@
-import pandas as pd
-from fastapi import APIRouter, HTTPException
+import asyncio
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, Body, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from models.schemas import FlightFeatures
-from services.prediction_service import model, model_loaded, preprocessor
+from pydantic import ValidationError
+from services import prediction_service
+from services.metrics import stage_timer
+from services.micro_batcher import BatcherOverloaded
+from services.model_registry import LoadedModel
+from services.ndjson import LineTooLong, dump_lines, iter_lines, parse_line
+from services.prediction_service import predict_batch, predict_many
 
 router = APIRouter()
 
+MAX_BATCH_SIZE = 100_000
+CACHE_HEADER = "X-Prediction-Cache"
+# Lines parsed, encoded and scored together by /predict/stream
+STREAM_CHUNK_SIZE = int(os.getenv("PREDICT_STREAM_CHUNK_SIZE", "1000"))
+MODEL_QUERY = Query(
+    default=None, description="Model to score with (default: DEFAULT_MODEL)"
+)
 
-@router.post("/predict")
-def predict_delay(features: FlightFeatures):
-    if not model_loaded:
+
+def _resolve_model(model: Optional[str]) -> str:
+    """Name of the model to serve; 404 if unknown, 500 if not loaded."""
+    name = model or prediction_service.DEFAULT_MODEL
+    if name not in prediction_service.registries:
+        raise HTTPException(status_code=404, detail=f"Unknown model '{name}'")
+    if not prediction_service.is_model_loaded(name):
         raise HTTPException(status_code=500, detail="Model not loaded")
+    return name
+
+
+@router.post("/predict")
+async def predict_delay(
+    features: FlightFeatures, response: Response, model: Optional[str] = MODEL_QUERY
+):
+    name = _resolve_model(model)
+    batcher = prediction_service.batcher
+    record = features.dict()
+    if batcher is not None and batcher.running:
+        try:
+            label, proba, hit, version = await batcher.submit((name, record))
+        except BatcherOverloaded:
+            raise HTTPException(status_code=503, detail="Prediction queue is full")
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail="Prediction timed out")
+    else:
+        [(label, proba, hit, version)] = await run_in_threadpool(
+            predict_many, [record], name
+        )
+
+    response.headers[CACHE_HEADER] = "HIT" if hit else "MISS"
+    return {
+        "prediction": label,
+        "delay_probability": round(proba, 4),
+        "model": name,
+        "model_version": version,
+    }
+
+
+@router.post("/predict/batch")
+def predict_delay_batch(
+    response: Response,
+    items: List[Any] = Body(...),
+    model: Optional[str] = MODEL_QUERY,
+):
+    """
+    Score a list of flights with one preprocessing pass and one predict_proba call.
+    Invalid items are reported individually; results keep the input order.
+    """
+    name = _resolve_model(model)
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413, detail=f"Batch size exceeds {MAX_BATCH_SIZE} items"
+        )
+
+    results: List[Dict[str, Any]] = [{"index": i} for i in range(len(items))]
+    valid_indices, records = [], []
+
+    with stage_timer("validation"):
+        for i, item in enumerate(items):
+            try:
+                records.append(FlightFeatures(**item).dict())
+                valid_indices.append(i)
+            except (ValidationError, TypeError) as e:
+                results[i]["errors"] = _format_errors(e)
+
+    n_hits, version = 0, prediction_service.get_registry(name).current().version
+    if records:
+        labels, probas, hits, version = predict_batch(records, name)
+        n_hits = int(hits.sum())
+        for i, label, proba in zip(valid_indices, labels, probas):
+            results[i]["prediction"] = int(label)
+            results[i]["delay_probability"] = round(float(proba), 4)
+
+    response.headers[f"{CACHE_HEADER}-Hits"] = str(n_hits)
+    return {
+        "results": results,
+        "n_valid": len(records),
+        "n_errors": len(items) - len(records),
+        "model": name,
+        "model_version": version,
+    }
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for generators that are still reading the request body.
+    The stock class may listen for disconnects on `receive` concurrently,
+    stealing body messages from request.stream(); here the body reader alone
+    consumes `receive`, and it raises ClientDisconnect if the client goes away.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+
+
+@router.post("/predict/stream")
+async def predict_delay_stream(request: Request, model: Optional[str] = MODEL_QUERY):
+    """
+    Score an NDJSON upload (one flight per line) and stream NDJSON results back.
+    Lines are processed in fixed-size chunks as the body arrives, so memory
+    stays flat whatever the upload size. Each output line carries the input
+    line number; bad lines yield an "errors" record instead of ending the stream.
+    The whole stream is scored by the model version in X-Model-Version.
+    """
+    loaded = prediction_service.get_registry(_resolve_model(model)).current()
+
+    async def results():
+        chunk = []
+        async for numbered_line in iter_lines(request.stream()):
+            chunk.append(numbered_line)
+            if len(chunk) >= STREAM_CHUNK_SIZE:
+                yield await run_in_threadpool(_score_ndjson_chunk, chunk, loaded)
+                chunk = []
+        if chunk:
+            yield await run_in_threadpool(_score_ndjson_chunk, chunk, loaded)
+
+    return _DuplexStreamingResponse(
+        results(),
+        media_type="application/x-ndjson",
+        headers={"X-Model-Version": loaded.version},
+    )
+
+
+def _score_ndjson_chunk(chunk: List[Tuple[int, Any]], loaded: LoadedModel) -> bytes:
+    """Validate and score one chunk of (line number, raw line) pairs."""
+    results: List[Dict[str, Any]] = []
+    valid, records = [], []
+
+    with stage_timer("validation"):
+        for line_no, line in chunk:
+            result = {"line": line_no}
+            results.append(result)
+            if isinstance(line, LineTooLong):
+                result["errors"] = [_error(str(line), "line_too_long")]
+                continue
+            item, error = parse_line(line)
+            if error is not None:
+                result["errors"] = [_error(error, "json_invalid")]
+                continue
+            try:
+                records.append(FlightFeatures(**item).dict())
+                valid.append(result)
+            except (ValidationError, TypeError) as e:
+                result["errors"] = _format_errors(e)
+
+    if records:
+        try:
+            labels, probas = loaded.score(records)
+        except Exception as e:
+            for result in valid:
+                result["errors"] = [_error(f"Scoring failed: {e}", "scoring_error")]
+        else:
+            for result, label, proba in zip(valid, labels, probas):
+                result["prediction"] = int(label)
+                result["delay_probability"] = round(float(proba), 4)
+
+    return dump_lines(results)
+
+
+def _error(msg: str, error_type: str) -> Dict[str, Any]:
+    return {"loc": [], "msg": msg, "type": error_type}
 
-    data = pd.DataFrame([features.dict()])
-    X = preprocessor.transform(data)
-    prediction = model.predict(X)[0]
-    proba = model.predict_proba(X)[0][1]
 
-    return {"prediction": int(prediction), "delay_probability": round(proba, 4)}
+def _format_errors(error: Exception) -> List[Dict[str, Any]]:
+    """Reduce a validation error to a JSON-serializable list of issues."""
+    if not isinstance(error, ValidationError):
+        return [_error("Item must be a JSON object", "type_error")]
+    return [
+        {"loc": list(err["loc"]), "msg": err["msg"], "type": err["type"]}
+        for err in error.errors()
+    ]
@@ -1,8 +1,41 @@
-from endpoints import health, predict
+from contextlib import asynccontextmanager
+
+from endpoints import admin, health, metrics, predict
 from fastapi import FastAPI
+from services import prediction_service
+from services.metrics import prometheus_middleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background workers live for the lifetime of the app
+    registries = prediction_service.registries.values()
+    for registry in registries:
+        registry.start_watching(prediction_service.MODEL_WATCH_INTERVAL)
+    if prediction_service.backend is not None:
+        prediction_service.backend.start()
+    if prediction_service.shadow is not None:
+        prediction_service.shadow.start()
+    if prediction_service.batcher is not None:
+        await prediction_service.batcher.start()
+    yield
+    if prediction_service.batcher is not None:
+        await prediction_service.batcher.stop()
+    if prediction_service.shadow is not None:
+        prediction_service.shadow.stop()
+    if prediction_service.backend is not None:
+        prediction_service.backend.stop()
+    for registry in registries:
+        registry.stop_watching()
+
+
+app = FastAPI(title="Flight Delay Prediction API", lifespan=lifespan)
 
-app = FastAPI(title="Flight Delay Prediction API")
+# Request count, latency and in-flight instrumentation for /metrics
+app.middleware("http")(prometheus_middleware)
 
 # Register routes
 app.include_router(health.router)
 app.include_router(predict.router)
+app.include_router(metrics.router)
+app.include_router(admin.router)
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
@@ -12,3 +14,8 @@ class FlightFeatures(BaseModel):
     origin: str
     dest: str
     dep_time_blk: str
+
+
+class ModelReloadRequest(BaseModel):
+    model_file: Optional[str] = None
+    preprocessor_file: Optional[str] = None
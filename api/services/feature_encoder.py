@@ -0,0 +1,277 @@
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+
+# ───────────────────────────────────────────────────────────────
+# Compiled Feature Encoder
+# ───────────────────────────────────────────────────────────────
+
+
+class _NumericBlock:
+    """Mean imputation followed by standard scaling, as plain arrays."""
+
+    def __init__(self, columns, fill, mean, scale, offset):
+        self.columns = list(columns)
+        self.fill = fill
+        self.mean = mean
+        self.scale = scale
+        self.offset = offset
+        self.width = len(self.columns)
+
+    def values(self, records: Sequence[Mapping]) -> np.ndarray:
+        """Raw column values, NaN where missing."""
+        return np.array(
+            [[record[col] for col in self.columns] for record in records],
+            dtype=np.float64,
+        ).reshape(len(records), self.width)
+
+    def write(self, records: Sequence[Mapping], out: np.ndarray) -> None:
+        self.write_values(self.values(records), out)
+
+    def write_values(self, X: np.ndarray, out: np.ndarray) -> None:
+        """Impute and scale raw values into `out`; X is modified in place."""
+        if self.fill is not None:
+            missing = np.isnan(X)
+            if missing.any():
+                X[missing] = np.broadcast_to(self.fill, X.shape)[missing]
+        # Same in-place operation order as StandardScaler.transform
+        if self.mean is not None:
+            X -= self.mean
+        if self.scale is not None:
+            X /= self.scale
+        out[:, self.offset : self.offset + self.width] = X
+
+
+class _CategoricalBlock:
+    """Most-frequent imputation followed by one-hot encoding via index lookups."""
+
+    def __init__(self, columns, fill, categories, handle_unknown, offset):
+        self.columns = list(columns)
+        self.fill = fill
+        self.handle_unknown = handle_unknown
+        self.offset = offset
+
+        # category -> absolute output column, one dictionary per input column
+        self.index: List[Dict] = []
+        position = offset
+        for cats in categories:
+            self.index.append({cat: position + i for i, cat in enumerate(cats)})
+            position += len(cats)
+        self.width = position - offset
+
+    def codes(self, records: Sequence[Mapping]) -> np.ndarray:
+        """Output column of each value's one-hot bit, -1 for ignored unknowns."""
+        codes = np.full((len(records), len(self.columns)), -1, dtype=np.int32)
+        for j, (col, index) in enumerate(zip(self.columns, self.index)):
+            fill = self.fill[j] if self.fill is not None else None
+            for i, record in enumerate(records):
+                value = record[col]
+                if fill is not None and value != value:  # NaN, as SimpleImputer
+                    value = fill
+                position = index.get(value)
+                if position is not None:
+                    codes[i, j] = position
+                elif self.handle_unknown == "error":
+                    raise ValueError(f"Found unknown category {value!r} in '{col}'")
+        return codes
+
+    def write(self, records: Sequence[Mapping], out: np.ndarray) -> None:
+        self.write_codes(self.codes(records), out)
+
+    def write_codes(self, codes: np.ndarray, out: np.ndarray) -> None:
+        rows, cols = np.nonzero(codes >= 0)
+        out[rows, codes[rows, cols]] = 1.0
+
+
+class _OrdinalBlock(_CategoricalBlock):
+    """Most-frequent imputation followed by integer category codes, one column each."""
+
+    def __init__(
+        self, columns, fill, categories, handle_unknown, unknown_value, offset
+    ):
+        self.columns = list(columns)
+        self.fill = fill
+        self.handle_unknown = handle_unknown
+        self.unknown_value = unknown_value
+        self.offset = offset
+
+        # category -> code, one dictionary per input column
+        self.index = [{cat: i for i, cat in enumerate(cats)} for cats in categories]
+        self.width = len(self.columns)
+
+    def write_codes(self, codes: np.ndarray, out: np.ndarray) -> None:
+        values = codes.astype(np.float64)
+        values[codes < 0] = self.unknown_value
+        out[:, self.offset : self.offset + self.width] = values
+
+
+class CompiledEncoder:
+    """
+    Pure NumPy replica of the fitted ColumnTransformer built by
+    ml/training/preprocessing.py::preprocessing.
+
+    Means, scales and category -> column indices (or ordinal codes) are
+    extracted once at load time; transform() then writes each record straight
+    into a preallocated buffer, bypassing pandas and sklearn dispatch. Output
+    is bit-identical to preprocessor.transform(pd.DataFrame(records)), always
+    dense, also for preprocessors fitted with sparse one-hot output.
+    """
+
+    def __init__(self, blocks: list, n_features: int, dtype=np.float64):
+        self.blocks = blocks
+        self.n_features = n_features
+        self.dtype = np.dtype(dtype)
+
+    @classmethod
+    def from_preprocessor(cls, preprocessor) -> "CompiledEncoder":
+        """
+        Compile a fitted ColumnTransformer.
+        Raises ValueError when it contains a step this encoder cannot replicate.
+        """
+        if not hasattr(preprocessor, "transformers_"):
+            raise ValueError("Expected a fitted ColumnTransformer")
+
+        blocks, dtypes, offset = [], [np.float64], 0
+        for name, transformer, columns in preprocessor.transformers_:
+            if transformer == "drop" or len(columns) == 0:
+                continue
+            if transformer == "passthrough":
+                raise ValueError(f"Unsupported passthrough columns in '{name}'")
+
+            steps = (
+                [step for _, step in transformer.steps]
+                if isinstance(transformer, Pipeline)
+                else [transformer]
+            )
+            block = _compile_steps(name, steps, columns, offset)
+            if isinstance(steps[-1], (OneHotEncoder, OrdinalEncoder)):
+                dtypes.append(steps[-1].dtype)
+            blocks.append(block)
+            offset += block.width
+
+        return cls(blocks, offset, dtype=np.result_type(*dtypes))
+
+    def transform(
+        self, records: Sequence[Mapping], out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Encode feature dicts into a (n_records, n_features) matrix.
+        An optional preallocated `out` buffer of the right shape is reused.
+        """
+        shape = (len(records), self.n_features)
+        if out is None:
+            out = np.zeros(shape, dtype=self.dtype)
+        else:
+            if out.shape != shape:
+                raise ValueError(f"Output buffer has shape {out.shape}, need {shape}")
+            out.fill(0)
+
+        for block in self.blocks:
+            block.write(records, out)
+        return out
+
+    def encode(self, records: Sequence[Mapping]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compact form of `records`, cheap to send to another process:
+        raw numeric values (float64, NaN = missing) and, for each categorical
+        column, the output column of its one-hot bit or its ordinal code
+        (int32, -1 = none).
+        transform_encoded() turns it into the same matrix as transform().
+        """
+        n = len(records)
+        numeric = [
+            b.values(records) for b in self.blocks if isinstance(b, _NumericBlock)
+        ]
+        codes = [
+            b.codes(records) for b in self.blocks if isinstance(b, _CategoricalBlock)
+        ]
+        return (
+            np.hstack(numeric) if numeric else np.empty((n, 0)),
+            np.hstack(codes) if codes else np.empty((n, 0), dtype=np.int32),
+        )
+
+    def transform_encoded(
+        self, numeric: np.ndarray, codes: np.ndarray, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Expand the output of encode() into a (n_records, n_features) matrix."""
+        shape = (len(numeric), self.n_features)
+        if out is None:
+            out = np.zeros(shape, dtype=self.dtype)
+        else:
+            if out.shape != shape:
+                raise ValueError(f"Output buffer has shape {out.shape}, need {shape}")
+            out.fill(0)
+
+        numeric_start = codes_start = 0
+        for block in self.blocks:
+            if isinstance(block, _NumericBlock):
+                stop = numeric_start + block.width
+                block.write_values(numeric[:, numeric_start:stop].copy(), out)
+                numeric_start = stop
+            else:
+                stop = codes_start + len(block.columns)
+                block.write_codes(codes[:, codes_start:stop], out)
+                codes_start = stop
+        return out
+
+
+def _compile_steps(name, steps, columns, offset):
+    """Translate the fitted steps of one ColumnTransformer branch into a block."""
+    imputer = None
+    if isinstance(steps[0], SimpleImputer):
+        imputer = steps[0]
+        if imputer.add_indicator or not _is_nan(imputer.missing_values):
+            raise ValueError(f"Unsupported imputer configuration in '{name}'")
+        steps = steps[1:]
+
+    fill = imputer.statistics_ if imputer is not None else None
+
+    if not steps or isinstance(steps[0], StandardScaler):
+        scaler = steps[0] if steps else None
+        if len(steps) > 1:
+            raise ValueError(f"Unsupported steps after scaler in '{name}'")
+        if fill is not None and np.isnan(fill.astype(np.float64)).any():
+            raise ValueError(f"Imputer in '{name}' dropped an all-missing column")
+        return _NumericBlock(
+            columns,
+            fill.astype(np.float64) if fill is not None else None,
+            scaler.mean_ if scaler is not None else None,
+            scaler.scale_ if scaler is not None else None,
+            offset,
+        )
+
+    if len(steps) == 1 and isinstance(steps[0], OneHotEncoder):
+        encoder = steps[0]
+        if encoder.drop_idx_ is not None or getattr(
+            encoder, "_infrequent_enabled", False
+        ):
+            raise ValueError(f"Unsupported OneHotEncoder options in '{name}'")
+        return _CategoricalBlock(
+            columns,
+            list(fill) if fill is not None else None,
+            encoder.categories_,
+            encoder.handle_unknown,
+            offset,
+        )
+
+    if len(steps) == 1 and isinstance(steps[0], OrdinalEncoder):
+        encoder = steps[0]
+        if getattr(encoder, "_infrequent_enabled", False):
+            raise ValueError(f"Unsupported OrdinalEncoder options in '{name}'")
+        return _OrdinalBlock(
+            columns,
+            list(fill) if fill is not None else None,
+            encoder.categories_,
+            encoder.handle_unknown,
+            encoder.unknown_value if encoder.unknown_value is not None else -1,
+            offset,
+        )
+
+    raise ValueError(f"Unsupported transformer steps in '{name}': {steps}")
+
+
+def _is_nan(value) -> bool:
+    return isinstance(value, float) and value != value
@@ -0,0 +1,115 @@
+import sys
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.prediction_cache import make_key
+
+# Model inputs, in the column order written by the frequent-combinations job
+FEATURE_COLUMNS = [
+    "month",
+    "day_of_week",
+    "crs_dep_time",
+    "crs_arr_time",
+    "crs_elapsed_time",
+    "distance",
+    "unique_carrier",
+    "origin",
+    "dest",
+    "dep_time_blk",
+]
+CATEGORICAL_COLUMNS = ["unique_carrier", "origin", "dest", "dep_time_blk"]
+
+# ───────────────────────────────────────────────────────────────
+# Precomputed Lookup Table
+# ───────────────────────────────────────────────────────────────
+
+
+def load_combinations(path: str) -> List[Dict]:
+    """Feature dicts from the CSV written by ml/scoring/frequent_combinations.py."""
+    # Codes stay strings: "NA" is an airport code, not a missing value
+    df = pd.read_csv(
+        path,
+        usecols=FEATURE_COLUMNS,
+        dtype={column: str for column in CATEGORICAL_COLUMNS},
+        keep_default_na=False,
+    )
+    return df.to_dict("records")
+
+
+def _hashes(keys: Sequence[Tuple]) -> np.ndarray:
+    return np.fromiter((hash(key) for key in keys), dtype=np.int64, count=len(keys))
+
+
+class LookupTable:
+    """
+    Predictions of one model version for a fixed set of feature combinations.
+
+    Stored as parallel arrays sorted by the 64-bit hash of the normalized
+    feature key (see make_key), plus the keys themselves. Lookups for a
+    whole batch are one np.searchsorted call; every hash match is then
+    confirmed against the full key, since different keys can share a hash
+    (hash(-1.0) == hash(-2.0)).
+    """
+
+    def __init__(
+        self,
+        hashes: np.ndarray,
+        keys: List[Tuple],
+        labels: np.ndarray,
+        probas: np.ndarray,
+    ):
+        self.hashes = hashes
+        self.keys = keys
+        self.labels = labels
+        self.probas = probas
+
+    @classmethod
+    def build(cls, loaded, records: List[Dict]) -> "LookupTable":
+        """Score `records` with a LoadedModel in one batch and index the results."""
+        if not records:
+            empty = np.empty(0)
+            return cls(empty.astype(np.int64), [], empty.astype(np.int8), empty)
+
+        # Not serving traffic: kept out of the inference metrics
+        labels, probas = loaded.score(records, record=False)
+        keys = [make_key(record) for record in records]
+        # Sorted for binary search; duplicate combinations collapse to one
+        # entry (as do the rare distinct keys sharing a hash: all but one
+        # of them are then scored live)
+        hashes, first = np.unique(_hashes(keys), return_index=True)
+        return cls(
+            hashes,
+            [keys[i] for i in first],
+            labels[first].astype(np.int8),
+            probas[first],
+        )
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    @property
+    def nbytes(self) -> int:
+        """Arrays plus the key tuples (not the values they point to)."""
+        arrays = self.hashes.nbytes + self.labels.nbytes + self.probas.nbytes
+        keys = sys.getsizeof(self.keys) + sum(map(sys.getsizeof, self.keys))
+        return arrays + keys
+
+    def lookup(
+        self, keys: Sequence[Tuple]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Match normalized keys against the table.
+        Returns (found mask, labels, probabilities); entries where found is
+        False are meaningless and must be scored live.
+        """
+        hashes = _hashes(keys)
+        if not len(self.hashes):
+            return np.zeros(len(keys), dtype=bool), hashes, hashes
+        positions = np.searchsorted(self.hashes, hashes)
+        positions[positions == len(self.hashes)] = 0
+        found = self.hashes[positions] == hashes
+        for i in np.flatnonzero(found):
+            found[i] = self.keys[positions[i]] == keys[i]
+        return found, self.labels[positions], self.probas[positions]
@@ -0,0 +1,140 @@
+import os
+import time
+from contextlib import nullcontext
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# ───────────────────────────────────────────────────────────────
+# Metric Definitions
+# ───────────────────────────────────────────────────────────────
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+BATCH_SIZE_BUCKETS = tuple(2**i for i in range(18))
+
+REQUESTS = Counter(
+    "api_requests_total",
+    "HTTP requests handled by the API.",
+    ["method", "handler", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "api_request_duration_seconds",
+    "End-to-end HTTP request latency.",
+    ["method", "handler"],
+    buckets=LATENCY_BUCKETS,
+)
+IN_FLIGHT = Gauge(
+    "api_requests_in_flight",
+    "HTTP requests currently being processed.",
+    multiprocess_mode="livesum",
+)
+INFERENCE_STAGE_LATENCY = Histogram(
+    "inference_stage_duration_seconds",
+    "Time spent in each inference stage (validation, preprocessing, scoring).",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+BATCH_SIZE = Histogram(
+    "inference_batch_size",
+    "Number of flights scored per model call.",
+    buckets=BATCH_SIZE_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    "prediction_cache_lookups_total",
+    "Prediction cache lookups by result.",
+    ["result"],
+)
+LOOKUP_TABLE_LOOKUPS = Counter(
+    "lookup_table_lookups_total",
+    "Precomputed lookup table lookups by result.",
+    ["result"],
+)
+SHADOW_PREDICTIONS = Counter(
+    "shadow_predictions_total",
+    "Flights scored by the shadow model, by agreement with the primary label.",
+    ["agreement"],
+)
+SHADOW_DROPPED = Counter(
+    "shadow_dropped_total",
+    "Flights not shadow-scored because the shadow queue was full.",
+)
+SHADOW_PROBABILITY_DIFF = Histogram(
+    "shadow_probability_abs_diff",
+    "Absolute difference between primary and shadow delay probabilities.",
+    buckets=(0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0),
+)
+MODEL_LOAD_SECONDS = Gauge(
+    "model_load_duration_seconds",
+    "Time taken by the last model load, including compilation.",
+    multiprocess_mode="max",
+)
+
+
+def stage_timer(stage: str, record: bool = True):
+    """
+    Context manager recording the duration of one inference stage (a no-op
+    when `record` is False).
+    """
+    if not record:
+        return nullcontext()
+    return INFERENCE_STAGE_LATENCY.labels(stage=stage).time()
+
+
+# ───────────────────────────────────────────────────────────────
+# HTTP Instrumentation
+# ───────────────────────────────────────────────────────────────
+
+
+async def prometheus_middleware(request, call_next):
+    """
+    Count requests and time them per route template (e.g. /predict),
+    so arbitrary URLs cannot explode label cardinality.
+    """
+    start = time.perf_counter()
+    status = 500
+    IN_FLIGHT.inc()
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        IN_FLIGHT.dec()
+        route = request.scope.get("route")
+        handler = getattr(route, "path", "unmatched")
+        REQUEST_LATENCY.labels(request.method, handler).observe(
+            time.perf_counter() - start
+        )
+        REQUESTS.labels(request.method, handler, str(status)).inc()
+
+
+def render_latest():
+    """
+    Serialize all metrics; aggregates across uvicorn workers when
+    PROMETHEUS_MULTIPROC_DIR is set.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,142 @@
+import asyncio
+from typing import Any, Callable, List, Optional, Sequence
+
+# ───────────────────────────────────────────────────────────────
+# Errors
+# ───────────────────────────────────────────────────────────────
+
+
+class BatcherOverloaded(Exception):
+    """Raised when the pending-request queue is full (backpressure)."""
+
+
+# ───────────────────────────────────────────────────────────────
+# Micro-batching Dispatcher
+# ───────────────────────────────────────────────────────────────
+
+
+class MicroBatcher:
+    """
+    Gather concurrent single-item requests into one vectorized call.
+
+    A batch is flushed when `max_batch_size` items are waiting or when
+    `max_wait_ms` has elapsed since its first item arrived. `score_fn`
+    receives a list of items and must return one result per item, in order;
+    it runs in the default executor so the event loop keeps accepting requests.
+    """
+
+    def __init__(
+        self,
+        score_fn: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+        max_queue_size: int = 1024,
+        timeout: float = 1.0,
+    ):
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue_size = max_queue_size
+        self.timeout = timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        # Fail whatever was still waiting instead of leaving callers hanging
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(BatcherOverloaded("Batcher stopped"))
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Queue one item and wait for its result.
+        Raises BatcherOverloaded when the queue is full and
+        asyncio.TimeoutError when no result arrives within `timeout` seconds.
+        """
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((item, future))
+        except asyncio.QueueFull:
+            raise BatcherOverloaded(
+                f"{self.max_queue_size} requests already waiting"
+            ) from None
+        return await asyncio.wait_for(future, self.timeout)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        # A pending get() is carried over rather than cancelled on timeout,
+        # so an item can never be dropped between the queue and a batch
+        getter: Optional[asyncio.Future] = None
+        try:
+            while True:
+                if getter is None:
+                    getter = asyncio.ensure_future(self._queue.get())
+                batch = [await getter]
+                getter = None
+                deadline = loop.time() + self.max_wait
+
+                while len(batch) < self.max_batch_size:
+                    # Take what is already queued before waiting for more
+                    if not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    getter = asyncio.ensure_future(self._queue.get())
+                    done, _ = await asyncio.wait({getter}, timeout=remaining)
+                    if not done:
+                        break
+                    batch.append(getter.result())
+                    getter = None
+
+                await self._dispatch(loop, batch)
+        finally:
+            if getter is not None:
+                getter.cancel()
+
+    async def _dispatch(self, loop, batch) -> None:
+        # Callers that already timed out have cancelled their future
+        live = [(item, future) for item, future in batch if not future.done()]
+        if not live:
+            return
+
+        try:
+            results = await loop.run_in_executor(
+                None, self.score_fn, [item for item, _ in live]
+            )
+        except (Exception, asyncio.CancelledError) as e:
+            for _, future in live:
+                if not future.done():
+                    future.set_exception(
+                        e
+                        if isinstance(e, Exception)
+                        else BatcherOverloaded("Batcher stopped")
+                    )
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            return
+
+        for (_, future), result in zip(live, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,262 @@
+import argparse
+import json
+import os
+import shutil
+from typing import Dict, Optional, Tuple
+
+import joblib
+import numpy as np
+
+from services.feature_encoder import (
+    CompiledEncoder,
+    _CategoricalBlock,
+    _NumericBlock,
+    _OrdinalBlock,
+)
+from services.tree_compiler import (
+    ARRAY_FIELDS,
+    WALKER_FIELDS,
+    CompiledForest,
+    compile_model,
+)
+
+# ───────────────────────────────────────────────────────────────
+# Memory-mapped Model Artifacts
+# ───────────────────────────────────────────────────────────────
+#
+# Layout of an artifact directory (e.g. ml/models_artifact/lightgbm_mmap/):
+#
+#   manifest.json          active version, scalar settings, encoder tables
+#   <version>/<field>.npy  tree node arrays and numeric encoder arrays
+#
+# Arrays are opened with np.load(mmap_mode="r"), so every worker on a host
+# maps the same pages from the OS page cache instead of holding its own copy.
+# Each export writes a new <version>/ directory and then replaces the
+# manifest atomically; workers still mapping an older version keep reading it.
+
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+_NUMERIC_ARRAYS = ("fill", "mean", "scale")
+
+
+def artifact_dir(models_dir: str, name: str) -> str:
+    return os.path.join(models_dir, f"{name}_mmap")
+
+
+def _json_value(value):
+    """Plain Python scalar for numpy values stored in the manifest."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def export_artifact(
+    directory: str,
+    name: str,
+    version: str,
+    encoder: CompiledEncoder,
+    forest: CompiledForest,
+    model_type: str,
+) -> str:
+    """
+    Write a compiled encoder + forest as .npy arrays plus a JSON manifest.
+    Returns the path of the new version directory.
+    """
+    version_dir = os.path.join(directory, version)
+    os.makedirs(version_dir, exist_ok=True)
+
+    def save(field: str, array: np.ndarray) -> str:
+        filename = f"{field}.npy"
+        np.save(os.path.join(version_dir, filename), np.ascontiguousarray(array))
+        return os.path.join(version, filename)
+
+    blocks = []
+    for i, block in enumerate(encoder.blocks):
+        if isinstance(block, _NumericBlock):
+            blocks.append(
+                {
+                    "kind": "numeric",
+                    "columns": block.columns,
+                    "offset": block.offset,
+                    "arrays": {
+                        field: save(f"encoder_{i}_{field}", getattr(block, field))
+                        for field in _NUMERIC_ARRAYS
+                        if getattr(block, field) is not None
+                    },
+                }
+            )
+        else:
+            spec = {
+                "kind": "categorical",
+                "columns": block.columns,
+                "offset": block.offset,
+                "fill": (
+                    [_json_value(v) for v in block.fill]
+                    if block.fill is not None
+                    else None
+                ),
+                "categories": [
+                    [_json_value(cat) for cat in index] for index in block.index
+                ],
+                "handle_unknown": block.handle_unknown,
+            }
+            if isinstance(block, _OrdinalBlock):
+                spec.update(kind="ordinal", unknown_value=block.unknown_value)
+            blocks.append(spec)
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "name": name,
+        "version": version,
+        "model_type": model_type,
+        "encoder": {
+            "n_features": encoder.n_features,
+            "dtype": encoder.dtype.name,
+            "blocks": blocks,
+        },
+        "forest": {
+            **forest.metadata(),
+            "arrays": {
+                field: save(f"forest_{field}", array)
+                for field, array in forest.arrays().items()
+            },
+        },
+    }
+
+    tmp_path = os.path.join(directory, f".{MANIFEST}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(directory, MANIFEST))
+
+    # Older versions can go: open mappings keep their files alive on POSIX
+    for entry in os.listdir(directory):
+        path = os.path.join(directory, entry)
+        if entry != version and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+    return version_dir
+
+
+def read_manifest(directory: str) -> Optional[Dict]:
+    """The artifact manifest, or None when the directory holds no artifact."""
+    try:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported artifact format {manifest.get('format_version')!r}"
+        )
+    return manifest
+
+
+def load_artifact(
+    directory: str, mmap: bool = True
+) -> Tuple[CompiledEncoder, CompiledForest, Dict]:
+    """
+    Rebuild the compiled encoder and forest from an artifact directory.
+    With mmap=True the arrays are read-only views on the files.
+    """
+    manifest = read_manifest(directory)
+    if manifest is None:
+        raise FileNotFoundError(f"No {MANIFEST} in {directory}")
+    mmap_mode = "r" if mmap else None
+
+    def load(relative_path: str) -> np.ndarray:
+        return np.load(os.path.join(directory, relative_path), mmap_mode=mmap_mode)
+
+    blocks = []
+    for spec in manifest["encoder"]["blocks"]:
+        if spec["kind"] == "numeric":
+            arrays = {field: load(path) for field, path in spec["arrays"].items()}
+            blocks.append(
+                _NumericBlock(
+                    spec["columns"],
+                    arrays.get("fill"),
+                    arrays.get("mean"),
+                    arrays.get("scale"),
+                    spec["offset"],
+                )
+            )
+        elif spec["kind"] == "ordinal":
+            blocks.append(
+                _OrdinalBlock(
+                    spec["columns"],
+                    spec["fill"],
+                    spec["categories"],
+                    spec["handle_unknown"],
+                    spec["unknown_value"],
+                    spec["offset"],
+                )
+            )
+        elif spec["kind"] == "categorical":
+            blocks.append(
+                _CategoricalBlock(
+                    spec["columns"],
+                    spec["fill"],
+                    spec["categories"],
+                    spec["handle_unknown"],
+                    spec["offset"],
+                )
+            )
+        else:
+            raise ValueError(f"Unsupported encoder block kind: {spec['kind']}")
+    encoder = CompiledEncoder(
+        blocks, manifest["encoder"]["n_features"], dtype=manifest["encoder"]["dtype"]
+    )
+
+    forest_spec = manifest["forest"]
+    arrays = {field: load(path) for field, path in forest_spec["arrays"].items()}
+    forest = CompiledForest(
+        *(arrays[field] for field in ARRAY_FIELDS),
+        aggregation=forest_spec["aggregation"],
+        sigmoid=forest_spec["sigmoid"],
+        input_dtype=forest_spec["input_dtype"],
+        **{field: arrays.get(field) for field in WALKER_FIELDS},
+    )
+    return encoder, forest, manifest
+
+
+# ───────────────────────────────────────────────────────────────
+# CLI: export the pickled artifacts
+# ───────────────────────────────────────────────────────────────
+
+
+def export_from_pickles(models_dir: str, name: str) -> Optional[str]:
+    """Compile <name>_model.pkl + <name>_preprocessor.pkl into <name>_mmap/."""
+    # Imported here: the registry itself loads artifacts through this module
+    from services.model_registry import file_version
+
+    model_path = os.path.join(models_dir, f"{name}_model.pkl")
+    preprocessor_path = os.path.join(models_dir, f"{name}_preprocessor.pkl")
+    model = joblib.load(model_path)
+    try:
+        forest = compile_model(model)
+        encoder = CompiledEncoder.from_preprocessor(joblib.load(preprocessor_path))
+    except ValueError as e:
+        print(f"⚠️ {name}: no memory-mapped artifact, keeping the pickles ({e})")
+        return None
+
+    version = file_version(model_path, preprocessor_path)
+    export_artifact(
+        artifact_dir(models_dir, name),
+        name,
+        version,
+        encoder,
+        forest,
+        type(model).__name__,
+    )
+    print(f"✅ {name} {version} exported to {artifact_dir(models_dir, name)}")
+    return version
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export pickled models as memory-mapped artifacts"
+    )
+    parser.add_argument("--models-dir", default="ml/models_artifact")
+    parser.add_argument("--names", nargs="+", default=["lightgbm", "random_forest"])
+    args = parser.parse_args()
+    for model_name in args.names:
+        try:
+            export_from_pickles(args.models_dir, model_name)
+        except Exception as e:
+            print(f"❌ {model_name}: export failed: {e}")
@@ -0,0 +1,349 @@
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from services import metrics
+from services.feature_encoder import CompiledEncoder
+from services.lookup_table import LookupTable, load_combinations
+from services.model_artifact import load_artifact, read_manifest
+from services.tree_compiler import CompiledForest, compile_model
+
+# Largest batch scored by the flattened trees; bigger batches use the native
+# (multi-threaded) model, which wins beyond ~100 rows in benchmarks/
+COMPILED_MAX_BATCH = int(os.getenv("COMPILED_MAX_BATCH", "128"))
+
+# Scored once before a new version goes live, so the first real request
+# does not pay for lazy initialisation
+WARMUP_RECORD = {
+    "month": 1,
+    "day_of_week": 1,
+    "crs_dep_time": 900,
+    "crs_arr_time": 1100,
+    "crs_elapsed_time": 120,
+    "distance": 500.0,
+    "unique_carrier": "AA",
+    "origin": "JFK",
+    "dest": "LAX",
+    "dep_time_blk": "0900-0959",
+}
+
+
+# ───────────────────────────────────────────────────────────────
+# Loaded Model Version
+# ───────────────────────────────────────────────────────────────
+
+
+class LoadedModel:
+    """
+    Immutable model + preprocessor pair with its compiled fast paths.
+    Requests keep a reference to the instance they started with, so a swap
+    never changes the model under an in-flight request.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        version: str,
+        model,
+        preprocessor,
+        model_path: Optional[str] = None,
+        preprocessor_path: Optional[str] = None,
+        encoder: Optional[CompiledEncoder] = None,
+        compiled: Optional[CompiledForest] = None,
+        model_type: Optional[str] = None,
+        source: str = "joblib",
+    ):
+        self.name = name
+        self.version = version
+        self.model = model
+        self.preprocessor = preprocessor
+        self.model_path = model_path
+        self.preprocessor_path = preprocessor_path
+        self.model_type = model_type or type(model).__name__
+        self.source = source
+        self.loaded_at = datetime.now(timezone.utc)
+        # Precomputed predictions for frequent inputs, built before activation
+        self.lookup: Optional[LookupTable] = None
+
+        self.encoder = encoder
+        if self.encoder is None:
+            try:
+                self.encoder = CompiledEncoder.from_preprocessor(preprocessor)
+            except ValueError as e:
+                print(f"⚠️ Preprocessor compilation skipped, using sklearn: {e}")
+
+        self.compiled = compiled
+        if self.compiled is None:
+            try:
+                self.compiled = compile_model(model)
+            except ValueError as e:
+                print(f"⚠️ Model compilation skipped, using {type(model).__name__}: {e}")
+
+    @classmethod
+    def from_artifact(cls, name: str, directory: str) -> "LoadedModel":
+        """
+        Memory-map a compiled artifact (see services/model_artifact.py).
+        No pickle is loaded, so every batch size uses the flattened trees.
+        """
+        encoder, compiled, manifest = load_artifact(directory)
+        return cls(
+            name,
+            manifest["version"],
+            None,
+            None,
+            model_path=directory,
+            encoder=encoder,
+            compiled=compiled,
+            model_type=manifest["model_type"],
+            source="mmap",
+        )
+
+    def info(self) -> Dict:
+        return {
+            "name": self.name,
+            "version": self.version,
+            "model_type": self.model_type,
+            "source": self.source,
+            "compiled_encoder": self.encoder is not None,
+            "compiled_trees": self.compiled.n_trees if self.compiled else None,
+            "lookup_entries": len(self.lookup) if self.lookup is not None else None,
+            "model_path": self.model_path,
+            "loaded_at": self.loaded_at.isoformat(),
+        }
+
+    def transform(self, records: List[Dict]) -> np.ndarray:
+        """
+        Encode feature dicts with the compiled encoder when available,
+        falling back to the sklearn preprocessor.
+        """
+        if self.encoder is not None:
+            return self.encoder.transform(records)
+        return self.preprocessor.transform(pd.DataFrame(records))
+
+    def score(
+        self, records: List[Dict], stage_prefix: str = "", record: bool = True
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score a list of validated feature dicts in a single vectorized pass.
+        Returns (labels, delay probabilities), both in input order.
+        Stage timings are recorded under `stage_prefix` + stage name, unless
+        `record` is False (scoring that is not serving traffic).
+        """
+        if record and not stage_prefix:
+            metrics.BATCH_SIZE.observe(len(records))
+        with metrics.stage_timer(f"{stage_prefix}preprocessing", record):
+            X = self.transform(records)
+        return self.score_matrix(X, stage_prefix, record)
+
+    def score_matrix(
+        self, X: np.ndarray, stage_prefix: str = "", record: bool = True
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Score an already preprocessed matrix; same outputs as score()."""
+        scorer = self.model
+        if self.compiled is not None and (
+            self.model is None or X.shape[0] <= COMPILED_MAX_BATCH
+        ):
+            scorer = self.compiled
+            if sparse.issparse(X):
+                X = X.toarray()
+        with metrics.stage_timer(f"{stage_prefix}scoring", record):
+            proba = scorer.predict_proba(X)
+
+        # Same decision rule as model.predict, without a second pass over X
+        labels = scorer.classes_[np.argmax(proba, axis=1)]
+        return labels, proba[:, 1]
+
+    def warm_up(self) -> None:
+        """
+        Exercise both the compiled and the native scoring paths once, without
+        recording inference metrics.
+        """
+        self.score([WARMUP_RECORD], record=False)
+        self.score([WARMUP_RECORD] * (COMPILED_MAX_BATCH + 1), record=False)
+
+
+# ───────────────────────────────────────────────────────────────
+# Model Registry
+# ───────────────────────────────────────────────────────────────
+
+
+def file_version(*paths: str) -> str:
+    """Short content hash identifying a model + preprocessor pair on disk."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def _signature(*paths: str) -> Tuple:
+    return tuple((os.path.getmtime(p), os.path.getsize(p)) for p in paths)
+
+
+class ModelRegistry:
+    """
+    Holds the active model version and swaps in new ones atomically.
+
+    New versions are loaded, compiled and warmed up before the swap, either
+    on demand (reload) or by a background thread polling the artifact files.
+    When `artifact_dir` holds an up-to-date memory-mapped export of the
+    pickles, it is loaded instead of unpickling them. When `lookup_path`
+    lists frequent feature combinations, each version scores them into a
+    LookupTable before it goes live.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model_path: str,
+        preprocessor_path: str,
+        artifact_dir: Optional[str] = None,
+        lookup_path: Optional[str] = None,
+    ):
+        self.name = name
+        self.model_path = model_path
+        self.preprocessor_path = preprocessor_path
+        self.artifact_dir = artifact_dir
+        self.lookup_path = lookup_path
+        self._active: Optional[LoadedModel] = None
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[LoadedModel], None]] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+
+    def current(self) -> Optional[LoadedModel]:
+        return self._active
+
+    def on_swap(self, listener: Callable[[LoadedModel], None]) -> None:
+        """Register a callback run after each swap (e.g. clearing caches)."""
+        self._listeners.append(listener)
+
+    def activate(self, loaded: LoadedModel) -> LoadedModel:
+        """Warm up a loaded version and build its lookup table, then make it active."""
+        loaded.warm_up()
+        self._build_lookup(loaded)
+        with self._lock:
+            previous, self._active = self._active, loaded
+        for listener in self._listeners:
+            listener(loaded)
+        old = previous.version if previous else "none"
+        print(f"✅ Model {loaded.name} {old} -> {loaded.version} activated")
+        return loaded
+
+    def _build_lookup(self, loaded: LoadedModel) -> None:
+        if self.lookup_path is None or not os.path.exists(self.lookup_path):
+            return
+        try:
+            loaded.lookup = LookupTable.build(
+                loaded, load_combinations(self.lookup_path)
+            )
+        except Exception as e:
+            print(f"⚠️ Lookup table skipped for {loaded.name}, scoring live: {e}")
+            return
+        print(
+            f"✅ Lookup table for {loaded.name} {loaded.version}: "
+            f"{len(loaded.lookup)} entries, {loaded.lookup.nbytes / 1024:.0f} KiB"
+        )
+
+    def load(
+        self, model_path: Optional[str] = None, preprocessor_path: Optional[str] = None
+    ) -> LoadedModel:
+        """
+        Load a model/preprocessor pair from disk and activate it. Without
+        explicit paths, a matching memory-mapped artifact is preferred.
+        """
+        start = time.perf_counter()
+        if (
+            model_path is None
+            and preprocessor_path is None
+            and self._artifact_is_current()
+        ):
+            loaded = LoadedModel.from_artifact(self.name, self.artifact_dir)
+        else:
+            model_path = model_path or self.model_path
+            preprocessor_path = preprocessor_path or self.preprocessor_path
+            loaded = LoadedModel(
+                self.name,
+                file_version(model_path, preprocessor_path),
+                joblib.load(model_path),
+                joblib.load(preprocessor_path),
+                model_path=model_path,
+                preprocessor_path=preprocessor_path,
+            )
+        self.activate(loaded)
+        metrics.MODEL_LOAD_SECONDS.set(time.perf_counter() - start)
+        return loaded
+
+    def _artifact_is_current(self) -> bool:
+        """True when artifact_dir was exported from the pickles now on disk."""
+        if self.artifact_dir is None:
+            return False
+        manifest = read_manifest(self.artifact_dir)
+        if manifest is None:
+            return False
+        try:
+            version = file_version(self.model_path, self.preprocessor_path)
+        except FileNotFoundError:
+            return True  # artifact-only deployment
+        if manifest["version"] != version:
+            print(
+                f"⚠️ {self.artifact_dir} is stale ({manifest['version']}), using pickles"
+            )
+            return False
+        return True
+
+    # ───────────────────────────────────────────────────────────────
+    # File Watcher
+    # ───────────────────────────────────────────────────────────────
+
+    def start_watching(self, interval: float) -> None:
+        """Poll the artifact files and hot-reload them once they stop changing."""
+        if interval <= 0 or self._watcher is not None:
+            return
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, args=(interval,), name="model-watcher", daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        if self._watcher is None:
+            return
+        self._stop_watching.set()
+        self._watcher.join()
+        self._watcher = None
+
+    def _watch(self, interval: float) -> None:
+        paths = (self.model_path, self.preprocessor_path)
+        try:
+            seen = _signature(*paths)
+        except OSError:
+            seen = None
+        pending = None
+
+        while not self._stop_watching.wait(interval):
+            try:
+                signature = _signature(*paths)
+            except OSError:
+                continue  # artifacts being replaced
+            if signature == seen:
+                pending = None
+                continue
+            if signature != pending:
+                # Changed since last poll: wait one more interval for writes to settle
+                pending = signature
+                continue
+            try:
+                self.load()
+            except Exception as e:
+                print(f"❌ Model reload failed, keeping current version: {e}")
+            seen, pending = signature, None
@@ -0,0 +1,69 @@
+import json
+from typing import AsyncIterable, AsyncIterator, List, Optional, Tuple
+
+# ───────────────────────────────────────────────────────────────
+# NDJSON Streaming
+# ───────────────────────────────────────────────────────────────
+
+# A line longer than this is reported as an error instead of being buffered
+MAX_LINE_BYTES = 64 * 1024
+
+
+class LineTooLong(Exception):
+    """Placeholder yielded instead of the content of an oversized line."""
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes], max_line_bytes: int = MAX_LINE_BYTES
+) -> AsyncIterator[Tuple[int, object]]:
+    """
+    Split a chunked byte stream into (line number, bytes) pairs, 1-based.
+    Blank lines are skipped. An oversized line yields a LineTooLong instance
+    and is discarded up to its newline, so memory never exceeds one line.
+    """
+    buffer = bytearray()
+    line_no = 0
+    skipping = False
+
+    async for chunk in chunks:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end < 0:
+                break
+            if not skipping:
+                buffer += chunk[start:end]
+            line_no += 1
+            if skipping:
+                skipping = False
+            elif len(buffer) > max_line_bytes:
+                yield line_no, LineTooLong(f"Line exceeds {max_line_bytes} bytes")
+            elif buffer.strip():
+                yield line_no, bytes(buffer)
+            buffer.clear()
+            start = end + 1
+
+        if not skipping:
+            buffer += chunk[start:]
+            if len(buffer) > max_line_bytes:
+                yield line_no + 1, LineTooLong(f"Line exceeds {max_line_bytes} bytes")
+                buffer.clear()
+                skipping = True
+
+    if buffer.strip() and not skipping:
+        yield line_no + 1, bytes(buffer)
+
+
+def parse_line(line: bytes) -> Tuple[Optional[object], Optional[str]]:
+    """Decode one JSON line; returns (value, None) or (None, error message)."""
+    try:
+        return json.loads(line), None
+    except (UnicodeDecodeError, ValueError) as e:
+        return None, f"Invalid JSON: {e}"
+
+
+def dump_lines(records: List[dict]) -> bytes:
+    """Serialize records as NDJSON, one object per line."""
+    return b"".join(
+        json.dumps(record, separators=(",", ":")).encode() + b"\n" for record in records
+    )
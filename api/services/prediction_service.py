@@ -1,16 +1,236 @@
-import joblib
-
-model_path = "/ml/models_artifact/lightgbm_model.pkl"
-preprocessor_path = "/ml/models_artifact/lightgbm_preprocessor.pkl"
-
-model = None
-preprocessor = None
-model_loaded = False
-
-try:
-    model = joblib.load(model_path)
-    preprocessor = joblib.load(preprocessor_path)
-    model_loaded = True
-    print("✅ Model loaded successfully")
-except Exception as e:
-    print(f"❌ Model loading failed: {e}")
+import os
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services import metrics
+from services.micro_batcher import MicroBatcher
+from services.model_registry import LoadedModel, ModelRegistry
+from services.prediction_cache import PredictionCache, make_key
+from services.process_backend import ProcessBackend
+from services.shadow import ShadowScorer, make_logger
+
+MODELS_DIR = os.getenv("MODELS_DIR", "/ml/models_artifact")
+# Served when a request does not name a model
+DEFAULT_MODEL = os.getenv("DEFAULT_MODEL", "lightgbm")
+# Memory-mapped exports shared by all workers (make export-artifacts); MODEL_MMAP=0 disables them
+MODEL_MMAP = os.getenv("MODEL_MMAP", "1") == "1"
+
+# Frequent feature combinations (make lookup-combinations); each model version
+# scores them into an in-memory table checked before the model
+LOOKUP_PATH = os.getenv(
+    "LOOKUP_PATH", os.path.join(MODELS_DIR, "frequent_combinations.csv")
+)
+
+model_path = os.path.join(MODELS_DIR, f"{DEFAULT_MODEL}_model.pkl")
+preprocessor_path = os.path.join(MODELS_DIR, f"{DEFAULT_MODEL}_preprocessor.pkl")
+
+cache = PredictionCache(
+    maxsize=int(os.getenv("PREDICTION_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("PREDICTION_CACHE_TTL", "300")),
+)
+
+
+def discover_models(models_dir: str = MODELS_DIR) -> List[str]:
+    """Names of every <name>_model.pkl with a matching preprocessor."""
+    try:
+        files = set(os.listdir(models_dir))
+    except FileNotFoundError:
+        return []
+    return sorted(
+        name[: -len("_model.pkl")]
+        for name in files
+        if name.endswith("_model.pkl")
+        and name.replace("_model.pkl", "_preprocessor.pkl") in files
+    )
+
+
+def _make_registry(name: str) -> ModelRegistry:
+    registry = ModelRegistry(
+        name,
+        os.path.join(MODELS_DIR, f"{name}_model.pkl"),
+        os.path.join(MODELS_DIR, f"{name}_preprocessor.pkl"),
+        os.path.join(MODELS_DIR, f"{name}_mmap") if MODEL_MMAP else None,
+        LOOKUP_PATH or None,
+    )
+    # Cache keys also carry the version, so late writes from old-version
+    # requests can never be served after a swap
+    registry.on_swap(lambda _: cache.clear())
+    return registry
+
+
+registries: Dict[str, ModelRegistry] = {
+    name: _make_registry(name)
+    for name in sorted(set(discover_models()) | {DEFAULT_MODEL})
+}
+registry = registries[DEFAULT_MODEL]
+
+
+def get_registry(name: Optional[str] = None) -> ModelRegistry:
+    """Registry serving `name` (default model if None); KeyError if unknown."""
+    return registries[name or DEFAULT_MODEL]
+
+
+def is_model_loaded(name: Optional[str] = None) -> bool:
+    registry = registries.get(name or DEFAULT_MODEL)
+    return registry is not None and registry.current() is not None
+
+
+def set_model(
+    new_model, new_preprocessor, version: str = "in-memory", name: Optional[str] = None
+) -> None:
+    """Install an in-memory model/preprocessor pair (tests, benchmarks)."""
+    name = name or DEFAULT_MODEL
+    if name not in registries:
+        registries[name] = _make_registry(name)
+    registries[name].activate(LoadedModel(name, version, new_model, new_preprocessor))
+
+
+def load_model(
+    path: Optional[str] = None,
+    preproc_path: Optional[str] = None,
+    name: Optional[str] = None,
+) -> bool:
+    """Load a model and its preprocessor from disk (defaults: configured artifacts)."""
+    registry = get_registry(name)
+    try:
+        registry.load(path, preproc_path)
+        print(f"✅ Model {registry.name} loaded successfully")
+        return True
+    except Exception as e:
+        print(f"❌ Model {registry.name} loading failed: {e}")
+        return False
+
+
+for _name in registries:
+    load_model(name=_name)
+
+
+def predict_batch(
+    records: List[Dict], model: Optional[str] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, str]:
+    """
+    Serve what the lookup table and the prediction cache already know and
+    score the rest in one pass. Returns (labels, delay probabilities,
+    served-without-scoring flags, model version); the whole batch is scored
+    by the version of `model` (default model if None) active when the call
+    started.
+    """
+    loaded = get_registry(model).current()
+    n = len(records)
+    labels = np.empty(n, dtype=np.int64)
+    probas = np.empty(n, dtype=np.float64)
+    hits = np.zeros(n, dtype=bool)
+
+    table = loaded.lookup
+    keys = None
+    if table is not None or cache.enabled:
+        keys = [make_key(record) for record in records]
+
+    missing = list(range(n))
+    if table is not None:
+        found, table_labels, table_probas = table.lookup(keys)
+        labels[found] = table_labels[found]
+        probas[found] = table_probas[found]
+        hits |= found
+        missing = np.flatnonzero(~found).tolist()
+        metrics.LOOKUP_TABLE_LOOKUPS.labels("hit").inc(int(found.sum()))
+        metrics.LOOKUP_TABLE_LOOKUPS.labels("miss").inc(len(missing))
+
+    if cache.enabled and missing:
+        prefix = (loaded.name, loaded.version)
+        still_missing = []
+        for i in missing:
+            cached = cache.get(prefix + keys[i])
+            if cached is None:
+                still_missing.append(i)
+            else:
+                labels[i], probas[i] = cached
+                hits[i] = True
+        metrics.CACHE_LOOKUPS.labels("hit").inc(len(missing) - len(still_missing))
+        metrics.CACHE_LOOKUPS.labels("miss").inc(len(still_missing))
+        missing = still_missing
+
+    if missing:
+        to_score = [records[i] for i in missing]
+        if backend is not None and backend.running:
+            new_labels, new_probas = backend.score(loaded, to_score)
+        else:
+            new_labels, new_probas = loaded.score(to_score)
+        labels[missing] = new_labels
+        probas[missing] = new_probas
+        if cache.enabled:
+            prefix = (loaded.name, loaded.version)
+            for i, label, proba in zip(missing, new_labels, new_probas):
+                cache.put(prefix + keys[i], (int(label), float(proba)))
+
+    if shadow is not None:
+        shadow.submit(loaded, records, labels, probas)
+    return labels, probas, hits, loaded.version
+
+
+def predict_many(
+    records: List[Dict], model: Optional[str] = None
+) -> List[Tuple[int, float, bool, str]]:
+    """Per-record (label, probability, cache hit, version) for one model."""
+    labels, probas, hits, version = predict_batch(records, model)
+    return [
+        (int(label), float(proba), bool(hit), version)
+        for label, proba, hit in zip(labels, probas, hits)
+    ]
+
+
+def predict_items(items: List[Tuple[str, Dict]]) -> List[Tuple[int, float, bool, str]]:
+    """
+    Batcher entry point: (model name, record) items, one model call per
+    distinct model, results in input order.
+    """
+    positions = defaultdict(list)
+    for i, (model, _) in enumerate(items):
+        positions[model].append(i)
+
+    results: List = [None] * len(items)
+    for model, indices in positions.items():
+        scored = predict_many([items[i][1] for i in indices], model)
+        for i, result in zip(indices, scored):
+            results[i] = result
+    return results
+
+
+# INFERENCE_BACKEND=process scores in INFERENCE_WORKERS processes instead of
+# the request threads, so inference is not serialized by the GIL
+backend = None
+if os.getenv("INFERENCE_BACKEND", "thread") == "process":
+    backend = ProcessBackend(
+        {
+            name: (r.model_path, r.preprocessor_path, r.artifact_dir)
+            for name, r in registries.items()
+        },
+        workers=int(os.getenv("INFERENCE_WORKERS", str(os.cpu_count() or 1))),
+    )
+
+# Concurrent /predict calls are merged into one model call when enabled
+batcher = None
+if os.getenv("PREDICT_BATCHING", "0") == "1":
+    batcher = MicroBatcher(
+        predict_items,
+        max_batch_size=int(os.getenv("PREDICT_BATCH_MAX_SIZE", "64")),
+        max_wait_ms=float(os.getenv("PREDICT_BATCH_WAIT_MS", "2")),
+        max_queue_size=int(os.getenv("PREDICT_BATCH_QUEUE_SIZE", "1024")),
+        timeout=float(os.getenv("PREDICT_TIMEOUT_SECONDS", "1.0")),
+    )
+
+# Score a second model on live traffic, off the response path, and log both
+# outputs (SHADOW_MODEL=<name> enables it)
+shadow = None
+if os.getenv("SHADOW_MODEL") in registries:
+    shadow = ShadowScorer(
+        registries[os.environ["SHADOW_MODEL"]],
+        sample_rate=float(os.getenv("SHADOW_SAMPLE_RATE", "1.0")),
+        max_queue_size=int(os.getenv("SHADOW_QUEUE_SIZE", "1024")),
+        logger=make_logger(os.getenv("SHADOW_LOG_PATH")),
+    )
+
+# Hot reload when the artifact files change (seconds between polls, 0 = off)
+MODEL_WATCH_INTERVAL = float(os.getenv("MODEL_WATCH_INTERVAL", "0"))
@@ -0,0 +1,151 @@
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from threadpoolctl import threadpool_limits
+
+from services import metrics
+from services.model_registry import LoadedModel, ModelRegistry
+
+# ───────────────────────────────────────────────────────────────
+# Errors
+# ───────────────────────────────────────────────────────────────
+
+
+class VersionMismatch(Exception):
+    """The worker could not load the model version the request was encoded for."""
+
+
+# ───────────────────────────────────────────────────────────────
+# Worker Process
+# ───────────────────────────────────────────────────────────────
+
+_registries: Dict[str, ModelRegistry] = {}
+
+
+def _init_worker(specs: Dict[str, Tuple], threads: int) -> None:
+    # One model call per process at a time: extra OpenMP threads only contend
+    threadpool_limits(threads)
+    for name, spec in specs.items():
+        registry = ModelRegistry(name, *spec)
+        try:
+            registry.load()
+        except Exception as e:
+            print(f"❌ Worker {os.getpid()} could not load {name}: {e}")
+        _registries[name] = registry
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _score_encoded(
+    name: str, version: str, numeric: np.ndarray, codes: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    registry = _registries[name]
+    loaded = registry.current()
+    if loaded is None or loaded.version != version:
+        # The parent hot-reloaded: follow it from the same artifact files
+        try:
+            loaded = registry.load()
+        except Exception as e:
+            raise VersionMismatch(f"{name} {version}: {e}") from None
+        if loaded.version != version:
+            raise VersionMismatch(f"{name}: wanted {version}, found {loaded.version}")
+
+    X = loaded.encoder.transform_encoded(numeric, codes)
+    return loaded.score_matrix(X)
+
+
+# ───────────────────────────────────────────────────────────────
+# Process-pool Inference Backend
+# ───────────────────────────────────────────────────────────────
+
+
+class ProcessBackend:
+    """
+    Score in a pool of worker processes, each holding its own copy of every
+    model, so CPU-bound inference is not serialized by the parent's GIL.
+
+    The parent only reduces records to compact arrays (raw numeric values and
+    one-hot column indices, see CompiledEncoder.encode); workers expand and
+    score them. Batches larger than `split_size` are spread over several
+    workers. Workers load artifacts from the same files as the parent's
+    registries and follow its hot reloads; if a worker cannot produce the
+    requested version, or the model has no compiled encoder, the batch is
+    scored in the parent instead.
+    """
+
+    def __init__(
+        self,
+        specs: Dict[str, Tuple[str, str, Optional[str]]],
+        workers: int = os.cpu_count() or 1,
+        split_size: int = 1024,
+        threads_per_worker: int = 1,
+    ):
+        self.specs = specs
+        self.workers = workers
+        self.split_size = split_size
+        self.threads_per_worker = threads_per_worker
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def running(self) -> bool:
+        return self._pool is not None
+
+    def start(self) -> None:
+        """Spawn the workers and wait until each has loaded its models."""
+        if self.running:
+            return
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.specs, self.threads_per_worker),
+        )
+        for future in [self._pool.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+
+    def stop(self) -> None:
+        if self._pool is None:
+            return
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self._pool = None
+
+    def score(
+        self, loaded: LoadedModel, records: List[Dict]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Same contract as LoadedModel.score, computed in the worker processes."""
+        pool = self._pool
+        if pool is None or loaded.encoder is None or loaded.name not in self.specs:
+            return loaded.score(records)
+
+        metrics.BATCH_SIZE.observe(len(records))
+        with metrics.stage_timer("encoding"):
+            numeric, codes = loaded.encoder.encode(records)
+
+        n_parts = min(self.workers, -(-len(records) // self.split_size))
+        bounds = np.linspace(0, len(records), n_parts + 1).astype(int)
+        try:
+            with metrics.stage_timer("scoring"):
+                futures = [
+                    pool.submit(
+                        _score_encoded,
+                        loaded.name,
+                        loaded.version,
+                        numeric[start:stop],
+                        codes[start:stop],
+                    )
+                    for start, stop in zip(bounds[:-1], bounds[1:])
+                ]
+                parts = [future.result() for future in futures]
+        except VersionMismatch as e:
+            print(f"⚠️ Process backend skipped, scoring in-process: {e}")
+            return loaded.score(records)
+
+        return (
+            np.concatenate([labels for labels, _ in parts]),
+            np.concatenate([probas for _, probas in parts]),
+        )
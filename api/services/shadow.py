@@ -0,0 +1,190 @@
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from services import metrics
+from services.model_registry import LoadedModel, ModelRegistry
+
+# ───────────────────────────────────────────────────────────────
+# Shadow Scoring
+# ───────────────────────────────────────────────────────────────
+
+# Scheduling priority of the shadow thread (19 = lowest)
+SHADOW_NICENESS = 19
+
+
+def make_logger(path: Optional[str] = None) -> logging.Logger:
+    """JSON-lines comparison log, written to `path` or to stdout."""
+    logger = logging.getLogger("shadow")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if not logger.handlers:
+        handler = (
+            logging.FileHandler(path) if path else logging.StreamHandler(sys.stdout)
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+    return logger
+
+
+def _lower_thread_priority() -> None:
+    """
+    Make the calling thread the first to yield the CPU to request handlers
+    (Linux applies setpriority to a single thread id; elsewhere a no-op).
+    """
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), SHADOW_NICENESS)
+    except (AttributeError, OSError):
+        pass
+
+
+class ShadowScorer:
+    """
+    Score a second model on traffic the primary model already answered.
+
+    submit() only enqueues the primary results; a background thread drains
+    the queue in batches, scores them with the shadow registry's active
+    version and logs both outputs. When the queue is full, work is dropped
+    (and counted) rather than slowing down the response path.
+    """
+
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        sample_rate: float = 1.0,
+        max_queue_size: int = 1024,
+        max_batch_size: int = 256,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.registry = registry
+        self.sample_rate = sample_rate
+        self.max_batch_size = max_batch_size
+        self.logger = logger or make_logger()
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._worker: Optional[threading.Thread] = None
+        self.scored = 0
+        self.dropped = 0
+
+    @property
+    def name(self) -> str:
+        return self.registry.name
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and self._worker.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._worker = threading.Thread(
+            target=self._run, name="shadow-scorer", daemon=True
+        )
+        self._worker.start()
+
+    def stop(self) -> None:
+        """Finish what is already queued, then stop the worker."""
+        if not self.running:
+            return
+        self._queue.put(None)
+        self._worker.join()
+        self._worker = None
+
+    def submit(
+        self,
+        primary: LoadedModel,
+        records: List[Dict],
+        labels: np.ndarray,
+        probas: np.ndarray,
+    ) -> bool:
+        """Queue primary results for comparison; never blocks."""
+        if not self.running or primary.name == self.name:
+            return False
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return False
+        try:
+            self._queue.put_nowait((primary, records, labels, probas))
+        except queue.Full:
+            self.dropped += len(records)
+            metrics.SHADOW_DROPPED.inc(len(records))
+            return False
+        return True
+
+    def _run(self) -> None:
+        _lower_thread_priority()
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch, size, stopping = [item], len(item[1]), False
+            # Merge whatever else is waiting into one shadow model call
+            while size < self.max_batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+                size += len(item[1])
+
+            try:
+                self._compare(batch)
+            except Exception as e:
+                print(f"⚠️ Shadow scoring failed: {e}")
+            if stopping:
+                return
+
+    def _compare(self, batch) -> None:
+        shadow = self.registry.current()
+        if shadow is None:
+            return
+        records = [
+            record for _, batch_records, _, _ in batch for record in batch_records
+        ]
+        labels, probas = shadow.score(records, stage_prefix="shadow_")
+        self.scored += len(records)
+
+        timestamp = datetime.now(timezone.utc).isoformat()
+        position = 0
+        for primary, batch_records, primary_labels, primary_probas in batch:
+            for record, label, proba in zip(
+                batch_records, primary_labels, primary_probas
+            ):
+                shadow_label = int(labels[position])
+                shadow_proba = float(probas[position])
+                position += 1
+
+                agreement = "agree" if shadow_label == int(label) else "disagree"
+                metrics.SHADOW_PREDICTIONS.labels(agreement).inc()
+                metrics.SHADOW_PROBABILITY_DIFF.observe(
+                    abs(shadow_proba - float(proba))
+                )
+                self.logger.info(
+                    json.dumps(
+                        {
+                            "timestamp": timestamp,
+                            "features": record,
+                            "primary": {
+                                "model": primary.name,
+                                "version": primary.version,
+                                "prediction": int(label),
+                                "delay_probability": round(float(proba), 4),
+                            },
+                            "shadow": {
+                                "model": shadow.name,
+                                "version": shadow.version,
+                                "prediction": shadow_label,
+                                "delay_probability": round(shadow_proba, 4),
+                            },
+                        }
+                    )
+                )
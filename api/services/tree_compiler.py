@@ -0,0 +1,384 @@
+from typing import Dict, List
+
+import numpy as np
+
+# ───────────────────────────────────────────────────────────────
+# Constants
+# ───────────────────────────────────────────────────────────────
+MISSING_NONE, MISSING_ZERO, MISSING_NAN = 0, 1, 2
+_LGBM_MISSING_TYPES = {"None": MISSING_NONE, "Zero": MISSING_ZERO, "NaN": MISSING_NAN}
+_LGBM_ZERO_THRESHOLD = 1e-35
+
+ARRAY_FIELDS = (
+    "feature",
+    "threshold",
+    "left",
+    "right",
+    "value",
+    "default_left",
+    "missing_type",
+    "cat_index",
+    "cat_bitsets",
+    "roots",
+    "tree_depth",
+    "classes",
+)
+
+# Derived arrays the walker reads; exported so memory-mapped loads share them too
+WALKER_FIELDS = ("walk_feature", "children")
+
+
+# ───────────────────────────────────────────────────────────────
+# Compiled Forest
+# ───────────────────────────────────────────────────────────────
+
+
+class CompiledForest:
+    """
+    Tree ensemble flattened into contiguous node arrays.
+
+    All trees share the same arrays; `roots` holds the index of each tree's
+    root node. Leaves point to themselves so every (row, tree) walker can
+    advance in lockstep until it reaches a leaf.
+    """
+
+    def __init__(
+        self,
+        feature,
+        threshold,
+        left,
+        right,
+        value,
+        default_left,
+        missing_type,
+        cat_index,
+        cat_bitsets,
+        roots,
+        tree_depth,
+        classes,
+        aggregation: str,
+        sigmoid: float = 1.0,
+        input_dtype: str = "float64",
+        walk_feature=None,
+        children=None,
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.default_left = default_left
+        self.missing_type = missing_type
+        self.cat_index = cat_index
+        self.cat_bitsets = cat_bitsets
+        self.roots = roots
+        self.tree_depth = tree_depth
+        self.classes = classes
+        self.aggregation = aggregation
+        self.sigmoid = float(sigmoid)
+        self.input_dtype = np.dtype(input_dtype)
+        self.has_categorical = bool((cat_index >= 0).any())
+        self.has_zero_missing = bool((missing_type == MISSING_ZERO).any())
+
+        # Walker views: leaves read feature 0 and point to themselves
+        self._walk_feature = (
+            np.maximum(feature, 0) if walk_feature is None else walk_feature
+        )
+        self._children = (
+            np.column_stack([left, right]).ravel() if children is None else children
+        )
+
+        # Deepest trees first, so step k only touches the trees deeper than k
+        self._order = np.argsort(-tree_depth, kind="stable")
+        self._inverse_order = np.argsort(self._order)
+        sorted_depth = tree_depth[self._order]
+        self.max_depth = int(sorted_depth[0]) if len(sorted_depth) else 0
+        self._active_trees = [
+            int((sorted_depth > step).sum()) for step in range(self.max_depth)
+        ]
+
+    @property
+    def classes_(self) -> np.ndarray:
+        return self.classes
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def metadata(self) -> Dict:
+        """Scalar settings needed, alongside ARRAY_FIELDS, to rebuild the forest."""
+        return {
+            "aggregation": self.aggregation,
+            "sigmoid": self.sigmoid,
+            "input_dtype": self.input_dtype.name,
+        }
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Every array of ARRAY_FIELDS and WALKER_FIELDS, by field name."""
+        arrays = {name: getattr(self, name) for name in ARRAY_FIELDS}
+        arrays.update(walk_feature=self._walk_feature, children=self._children)
+        return arrays
+
+    def leaf_values(self, X) -> np.ndarray:
+        """Walk every tree for every row at once; returns (n_rows, n_trees)."""
+        X = np.ascontiguousarray(X, dtype=self.input_dtype)
+        n_rows, n_features = X.shape
+        flat = X.ravel()
+        exact = not self.has_categorical and (
+            not self.has_zero_missing and not np.isnan(flat).any()
+        )
+
+        # One walker per (tree, row); each step is a gather plus a compare
+        node = np.repeat(self.roots[self._order][:, None], n_rows, axis=1)
+        offset = np.arange(n_rows) * n_features
+
+        for n_active in self._active_trees:
+            current = node[:n_active]
+            x = flat[self._walk_feature[current] + offset]
+            if exact:
+                go_right = x > self.threshold[current]
+            else:
+                go_right = ~self._decision(current, x.astype(np.float64))
+            node[:n_active] = self._children[2 * current + go_right]
+
+        return self.value[node[self._inverse_order]].T
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Class probabilities in the same (n_rows, 2) layout as sklearn."""
+        leaves = self.leaf_values(X)
+        if self.aggregation == "mean":
+            positive = leaves.mean(axis=1)
+        else:
+            raw = (
+                leaves.mean(axis=1)
+                if self.aggregation == "average"
+                else leaves.sum(axis=1)
+            )
+            positive = 1.0 / (1.0 + np.exp(-self.sigmoid * raw))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes[np.argmax(self.predict_proba(X), axis=1)]
+
+    def _decision(self, node, x) -> np.ndarray:
+        """Full LightGBM/sklearn split semantics, used when missing values matter."""
+        go_left = self._numerical_decision(node, x)
+        if self.has_categorical:
+            is_cat = self.cat_index[node] >= 0
+            if is_cat.any():
+                go_left[is_cat] = self._categorical_decision(node[is_cat], x[is_cat])
+        # Leaves loop back onto themselves whichever branch is taken
+        return go_left
+
+    def _numerical_decision(self, node, x) -> np.ndarray:
+        missing_type = self.missing_type[node]
+        is_nan = np.isnan(x)
+        x = np.where(is_nan & (missing_type != MISSING_NAN), 0.0, x)
+        use_default = (
+            (missing_type == MISSING_ZERO) & (np.abs(x) <= _LGBM_ZERO_THRESHOLD)
+        ) | ((missing_type == MISSING_NAN) & is_nan)
+        return np.where(use_default, self.default_left[node], x <= self.threshold[node])
+
+    def _categorical_decision(self, node, x) -> np.ndarray:
+        # Mirrors LightGBM: NaN and negative categories always go right
+        category = np.where(np.isnan(x), -1, x).astype(np.int64)
+        n_bits = self.cat_bitsets.shape[1] * 32
+        valid = (category >= 0) & (category < n_bits)
+
+        category = np.where(valid, category, 0)
+        words = self.cat_bitsets[self.cat_index[node], category >> 5]
+        return valid & (((words >> (category & 31)) & 1) == 1)
+
+
+# ───────────────────────────────────────────────────────────────
+# Exporters
+# ───────────────────────────────────────────────────────────────
+
+
+def compile_model(model) -> CompiledForest:
+    """
+    Flatten a fitted binary LGBMClassifier or RandomForestClassifier.
+    Raises ValueError for any other estimator.
+    """
+    classes = getattr(model, "classes_", None)
+    if classes is None or len(classes) != 2:
+        raise ValueError("Only fitted binary classifiers can be compiled")
+
+    if hasattr(model, "booster_"):
+        return _compile_lightgbm(model)
+    if hasattr(model, "estimators_") and all(
+        hasattr(est, "tree_") for est in model.estimators_
+    ):
+        return _compile_sklearn_forest(model)
+    raise ValueError(f"Unsupported model type: {type(model).__name__}")
+
+
+def _compile_lightgbm(model) -> CompiledForest:
+    dump = model.booster_.dump_model()
+    objective = dump.get("objective", "")
+    if not objective.startswith("binary"):
+        raise ValueError(f"Unsupported LightGBM objective: {objective}")
+    sigmoid = 1.0
+    for token in objective.split()[1:]:
+        if token.startswith("sigmoid:"):
+            sigmoid = float(token.split(":", 1)[1])
+
+    builder = _ArrayBuilder()
+    for tree in dump["tree_info"]:
+        if tree.get("is_linear"):
+            raise ValueError("Linear trees are not supported")
+        builder.add_tree(_flatten_lightgbm_tree(tree["tree_structure"], builder))
+
+    aggregation = "average" if dump.get("average_output") else "sum"
+    return builder.build(model.classes_, aggregation, sigmoid, "float64")
+
+
+def _flatten_lightgbm_tree(root: Dict, builder: "_ArrayBuilder") -> Dict:
+    """Depth-first flattening of a LightGBM dump tree into local node arrays."""
+    nodes: Dict[str, List] = {name: [] for name in _NODE_FIELDS}
+    depth = 0
+    stack = [(root, 0, None, None)]  # (node, depth, parent index, side)
+
+    while stack:
+        node, level, parent, side = stack.pop()
+        index = len(nodes["feature"])
+        if parent is not None:
+            nodes[side][parent] = index
+
+        if "leaf_value" in node:
+            depth = max(depth, level)
+            row = (-1, 0.0, index, index, node["leaf_value"], False, MISSING_NONE, -1)
+        else:
+            cat_index, threshold = -1, 0.0
+            if node["decision_type"] == "==":
+                cat_index = builder.add_categories(
+                    [int(c) for c in str(node["threshold"]).split("||")]
+                )
+            elif node["decision_type"] == "<=":
+                threshold = float(node["threshold"])
+            else:
+                raise ValueError(f"Unsupported decision type: {node['decision_type']}")
+            row = (
+                node["split_feature"],
+                threshold,
+                -1,
+                -1,
+                0.0,
+                node.get("default_left", False),
+                _LGBM_MISSING_TYPES[node.get("missing_type", "None")],
+                cat_index,
+            )
+            stack.append((node["right_child"], level + 1, index, "right"))
+            stack.append((node["left_child"], level + 1, index, "left"))
+
+        for name, val in zip(_NODE_FIELDS, row):
+            nodes[name].append(val)
+
+    nodes["depth"] = depth
+    return nodes
+
+
+def _compile_sklearn_forest(model) -> CompiledForest:
+    builder = _ArrayBuilder()
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        n_nodes = tree.node_count
+        is_leaf = tree.children_left == -1
+        own_index = np.arange(n_nodes)
+
+        counts = tree.value[:, 0, :]
+        totals = counts.sum(axis=1)
+        totals[totals == 0.0] = 1.0
+        missing_left = getattr(tree, "missing_go_to_left", None)
+
+        builder.add_tree(
+            {
+                "feature": np.where(is_leaf, -1, tree.feature),
+                "threshold": np.where(is_leaf, 0.0, tree.threshold),
+                "left": np.where(is_leaf, own_index, tree.children_left),
+                "right": np.where(is_leaf, own_index, tree.children_right),
+                "value": np.where(is_leaf, counts[:, 1] / totals, 0.0),
+                "default_left": (
+                    np.asarray(missing_left, dtype=bool) & ~is_leaf
+                    if missing_left is not None
+                    else np.zeros(n_nodes, dtype=bool)
+                ),
+                "missing_type": np.where(is_leaf, MISSING_NONE, MISSING_NAN),
+                "cat_index": np.full(n_nodes, -1),
+                "depth": tree.max_depth,
+            }
+        )
+
+    # sklearn trees compare float32 features against float64 thresholds
+    return builder.build(model.classes_, "mean", 1.0, "float32")
+
+
+_NODE_FIELDS = (
+    "feature",
+    "threshold",
+    "left",
+    "right",
+    "value",
+    "default_left",
+    "missing_type",
+    "cat_index",
+)
+_NODE_DTYPES = {
+    "feature": np.int32,
+    "threshold": np.float64,
+    "left": np.int32,
+    "right": np.int32,
+    "value": np.float64,
+    "default_left": bool,
+    "missing_type": np.int8,
+    "cat_index": np.int32,
+}
+
+
+class _ArrayBuilder:
+    """Concatenate per-tree node arrays into flat, contiguous forest arrays."""
+
+    def __init__(self):
+        self.trees: List[Dict] = []
+        self.categories: List[List[int]] = []
+
+    def add_categories(self, categories: List[int]) -> int:
+        self.categories.append(categories)
+        return len(self.categories) - 1
+
+    def add_tree(self, nodes: Dict) -> None:
+        self.trees.append(nodes)
+
+    def build(self, classes, aggregation, sigmoid, input_dtype) -> CompiledForest:
+        columns = {name: [] for name in _NODE_FIELDS}
+        roots, depths, offset = [], [], 0
+        for tree in self.trees:
+            for name in _NODE_FIELDS:
+                values = np.asarray(tree[name], dtype=_NODE_DTYPES[name])
+                if name in ("left", "right"):
+                    values = values + offset  # local -> global node index
+                columns[name].append(values)
+            roots.append(offset)
+            depths.append(tree["depth"])
+            offset += len(tree["feature"])
+
+        n_words = max((max(c) // 32 + 1 for c in self.categories), default=1)
+        bitsets = np.zeros((max(len(self.categories), 1), n_words), dtype=np.uint32)
+        for i, categories in enumerate(self.categories):
+            for category in categories:
+                bitsets[i, category >> 5] |= np.uint32(1 << (category & 31))
+
+        arrays = {
+            name: np.concatenate(parts).astype(_NODE_DTYPES[name], copy=False)
+            for name, parts in columns.items()
+        }
+        return CompiledForest(
+            **arrays,
+            cat_bitsets=bitsets,
+            roots=np.asarray(roots, dtype=np.int32),
+            tree_depth=np.asarray(depths, dtype=np.int32),
+            classes=np.asarray(classes),
+            aggregation=aggregation,
+            sigmoid=sigmoid,
+            input_dtype=input_dtype,
+        )
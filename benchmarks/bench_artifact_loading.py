@@ -0,0 +1,136 @@
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+
+import joblib
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import FEATURE_COLS, fit_model, make_flights  # noqa: E402
+from services.model_artifact import artifact_dir, export_from_pickles  # noqa: E402
+from services.model_registry import ModelRegistry  # noqa: E402
+
+# ───────────────────────────────────────────────────────────────
+# Benchmark: startup time and per-worker memory, joblib vs mmap artifacts
+# ───────────────────────────────────────────────────────────────
+#
+# Each worker is a spawned process, like a uvicorn worker: it loads the model
+# through ModelRegistry, scores a batch so the arrays it needs are resident,
+# then waits while the parent reads its RSS and PSS from /proc (Linux only).
+# PSS splits shared pages between the processes mapping them, so it shows the
+# page-cache sharing that RSS hides.
+
+
+def _memory_kb(pid: int) -> dict:
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in ("Rss", "Pss"):
+                    fields[key.lower()] = int(value.split()[0])
+    except FileNotFoundError:
+        pass
+    return fields
+
+
+def _worker(mode, name, models_dir, n_score, conn):
+    start = time.perf_counter()
+    if mode != "baseline":
+        registry = ModelRegistry(
+            name,
+            os.path.join(models_dir, f"{name}_model.pkl"),
+            os.path.join(models_dir, f"{name}_preprocessor.pkl"),
+            artifact_dir(models_dir, name) if mode == "mmap" else None,
+        )
+        loaded = registry.load()
+        load_seconds = time.perf_counter() - start
+        records = make_flights(n_score, seed=1)[FEATURE_COLS].to_dict("records")
+        for i in range(0, n_score, 100):
+            loaded.score(records[i : i + 100])
+    else:
+        load_seconds = 0.0
+    conn.send(load_seconds)
+    conn.recv()  # stay alive until the parent has measured memory
+
+
+def measure(mode, name, models_dir, n_workers, n_score) -> dict:
+    ctx = mp.get_context("spawn")
+    workers = []
+    for _ in range(n_workers):
+        parent_conn, child_conn = ctx.Pipe()
+        process = ctx.Process(
+            target=_worker, args=(mode, name, models_dir, n_score, child_conn)
+        )
+        process.start()
+        workers.append((process, parent_conn))
+
+    load_seconds = [conn.recv() for _, conn in workers]
+    memory = [_memory_kb(process.pid) for process, _ in workers]
+    for process, conn in workers:
+        conn.send("exit")
+        process.join()
+
+    def mean_mb(key):
+        values = [m[key] for m in memory if key in m]
+        return sum(values) / len(values) / 1024 if values else None
+
+    return {
+        "mode": mode,
+        "workers": n_workers,
+        "load_seconds": max(load_seconds),
+        "rss_mb_per_worker": mean_mb("rss"),
+        "pss_mb_per_worker": mean_mb("pss"),
+    }
+
+
+def run(name, params, n_train, worker_counts, n_score) -> list:
+    results = []
+    with tempfile.TemporaryDirectory() as models_dir:
+        model, preprocessor = fit_model(name, n=n_train, **params)
+        joblib.dump(model, os.path.join(models_dir, f"{name}_model.pkl"))
+        joblib.dump(preprocessor, os.path.join(models_dir, f"{name}_preprocessor.pkl"))
+        export_from_pickles(models_dir, name)
+
+        for n_workers in worker_counts:
+            baseline = measure("baseline", name, models_dir, n_workers, n_score)
+            for mode in ("joblib", "mmap"):
+                result = measure(mode, name, models_dir, n_workers, n_score)
+                # Memory attributable to the model, net of interpreter + imports
+                for key in ("rss_mb_per_worker", "pss_mb_per_worker"):
+                    if result[key] is not None and baseline[key] is not None:
+                        result[f"model_{key}"] = result[key] - baseline[key]
+                results.append({"model": name, **result})
+                print(
+                    f"{name:<14} workers={n_workers:<3} {mode:<7} "
+                    f"load={result['load_seconds'] * 1e3:8.1f} ms  "
+                    f"model RSS={result.get('model_rss_mb_per_worker', 0):7.1f} MB  "
+                    f"model PSS={result.get('model_pss_mb_per_worker', 0):7.1f} MB"
+                )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default="random_forest")
+    parser.add_argument("--n-train", type=int, default=50000)
+    parser.add_argument("--n-estimators", type=int, default=100)
+    parser.add_argument("--max-depth", type=int, default=20)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--n-score", type=int, default=2000)
+    parser.add_argument("--output", help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    params = (
+        {"lgbm_n_estimators": args.n_estimators, "lgbm_max_depth": args.max_depth}
+        if args.model == "lightgbm"
+        else {"n_estimators": args.n_estimators, "max_depth": args.max_depth}
+    )
+    results = run(args.model, params, args.n_train, args.workers, args.n_score)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
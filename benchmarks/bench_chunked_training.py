@@ -0,0 +1,112 @@
+import argparse
+import json
+import multiprocessing as mp
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import make_flights_db  # noqa: E402
+
+# ───────────────────────────────────────────────────────────────
+# Benchmark: 10% sample in memory vs chunked training on the full table
+# ───────────────────────────────────────────────────────────────
+#
+# For each table size, a synthetic SQLite database is built and every run
+# happens in a fresh spawned process pointed at it, so max RSS is the run's
+# own peak. "sampled" is today's pipeline (load_training_data, dense one-hot,
+# class_weight="balanced"); "chunked" is ml/training/train_chunked.py.
+# Each run reports F1 on its own held-out rows.
+
+
+def _run(kind: str, model_type: str, db_path: str, chunksize: int, conn) -> None:
+    from sklearn.metrics import f1_score
+    from sqlalchemy import create_engine
+
+    import database.services.flight_service as flight_service
+
+    flight_service.engine = create_engine("sqlite:///" + db_path)
+    start = time.perf_counter()
+
+    if kind == "sampled":
+        from ml.training.models import get_model
+        from ml.training.preprocessing import preprocessing, split
+        from ml.training.train_chunked import CATEGORICAL_COLS, NUMERICAL_COLS
+
+        df = flight_service.load_training_data()
+        X, y, _ = preprocessing(df, NUMERICAL_COLS, CATEGORICAL_COLS, df["arr_del15"])
+        X_train, X_test, y_train, y_test = split(X, y)
+        params = {"model_type": model_type, "class_weight": "balanced"}
+        if model_type == "lightgbm":
+            params["lgbm_n_estimators"] = 100
+        model = get_model(params)
+        model.fit(X_train, y_train)
+        stats = {
+            "train_rows": len(y_train),
+            "f1_score": f1_score(y_test, model.predict(X_test)),
+        }
+    else:
+        from ml.training.train_chunked import train_model_chunked
+
+        _, _, metrics, _ = train_model_chunked(
+            {"model_type": model_type}, chunksize, models_dir=tempfile.mkdtemp()
+        )
+        stats = {key: metrics[key] for key in ("train_rows", "f1_score")}
+
+    stats.update(
+        {
+            "seconds": time.perf_counter() - start,
+            "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        }
+    )
+    conn.send(stats)
+
+
+def run(args) -> list:
+    context = mp.get_context("spawn")
+    airports = [f"A{i:03d}" for i in range(args.airports)]
+    results = []
+    for n_rows in args.rows:
+        db_path = os.path.join(tempfile.mkdtemp(prefix="bench-chunked-"), "flights.db")
+        make_flights_db(db_path, n_rows, airports=airports)
+        for model_type in args.models:
+            for kind in ("sampled", "chunked"):
+                parent, child = context.Pipe()
+                process = context.Process(
+                    target=_run,
+                    args=(kind, model_type, db_path, args.chunksize, child),
+                )
+                process.start()
+                stats = parent.recv()
+                process.join()
+                stats.update(table_rows=n_rows, model=model_type, kind=kind)
+                results.append(stats)
+                print(
+                    f"table={n_rows:<9} {model_type:<20} {kind:<8} "
+                    f"train_rows={stats['train_rows']:<9} "
+                    f"time={stats['seconds']:7.1f} s  "
+                    f"max_rss={stats['max_rss_mb']:7.0f} MB  "
+                    f"f1={stats['f1_score']:.4f}"
+                )
+        os.remove(db_path)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[250_000, 1_000_000])
+    parser.add_argument("--airports", type=int, default=350)
+    parser.add_argument(
+        "--models", nargs="+", default=["logistic_regression", "lightgbm"]
+    )
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--output", help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
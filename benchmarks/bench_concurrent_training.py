@@ -0,0 +1,98 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import make_flights_db  # noqa: E402
+
+# ───────────────────────────────────────────────────────────────
+# Benchmark: sequential vs concurrent training of every model type
+# ───────────────────────────────────────────────────────────────
+#
+# train_all() from ml/training/train_model.py on a synthetic SQLite
+# database, with main()'s default hyperparameters (LightGBM without the
+# Optuna search). The feature cache is built before timing, so both modes
+# only pay for training; MLflow is not involved.
+
+PARAMS = [
+    {
+        "model_type": "random_forest",
+        "n_estimators": 100,
+        "max_depth": 10,
+        "preprocessing": "sparse",
+    },
+    {"model_type": "logistic_regression", "logreg_C": 1.0, "preprocessing": "sparse"},
+    {"model_type": "lightgbm", "lgbm_n_estimators": 200, "preprocessing": "native"},
+]
+
+
+def main(args) -> dict:
+    workdir = tempfile.mkdtemp(prefix="bench-training-")
+    db_path = os.path.join(workdir, "flights.db")
+    # Read by database.base and feature_cache on import, inherited by workers
+    os.environ["DATABASE_URL"] = "sqlite:///" + db_path
+    os.environ["FEATURE_CACHE_DIR"] = os.path.join(workdir, "feature_cache")
+    make_flights_db(db_path, args.rows, seed=0)
+    # Models are saved under ./ml/models_artifact: keep the real ones intact
+    os.chdir(workdir)
+
+    from ml.training.feature_cache import load_features
+    from ml.training.train_model import (
+        CATEGORICAL_COLS,
+        NUMERICAL_COLS,
+        TARGET_COL,
+        thread_limits,
+        train_all,
+    )
+
+    for mode in ("sparse", "native"):
+        load_features(NUMERICAL_COLS, CATEGORICAL_COLS, TARGET_COL, mode=mode)
+
+    report = {
+        "cpu_count": os.cpu_count(),
+        "rows": args.rows,
+        "threads": thread_limits([p["model_type"] for p in PARAMS]),
+    }
+    for label, concurrent in (("sequential", False), ("concurrent", True)):
+        start = time.perf_counter()
+        results = train_all([dict(p) for p in PARAMS], concurrent=concurrent)
+        elapsed = time.perf_counter() - start
+        report[label] = {
+            "seconds": elapsed,
+            "models": {
+                params["model_type"]: {
+                    "seconds": metrics["training_seconds"],
+                    "f1_score": metrics["f1_score"],
+                }
+                for params, _, _, metrics, _, _ in results
+            },
+        }
+        models = "  ".join(
+            f"{name}={stats['seconds']:.1f}s"
+            for name, stats in report[label]["models"].items()
+        )
+        print(f"{label:<11} total={elapsed:6.1f} s  ({models})")
+
+    speedup = report["sequential"]["seconds"] / report["concurrent"]["seconds"]
+    print(f"concurrent speed-up x{speedup:.2f} on {os.cpu_count()} core(s)")
+    return report
+
+
+# ───────────────────────────────────────────────────────────────
+# Entry Point
+# ───────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent model training")
+    parser.add_argument("--rows", type=int, default=200_000, help="Table size")
+    parser.add_argument("--output", help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    report = main(args)
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,109 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import joblib
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import fit_model, make_flights_db  # noqa: E402
+
+# ───────────────────────────────────────────────────────────────
+# Benchmark: comparing every model artifact
+# ───────────────────────────────────────────────────────────────
+#
+# Three artifacts like ml/models_artifact/ (random forest and logistic
+# regression on sparse one-hot, LightGBM on native categoricals) are
+# evaluated on a synthetic SQLite database:
+#   per-model runs   what editing MODEL_TYPE and running evaluate.py three
+#                    times costs: load, split, preprocess and score per model
+#   evaluate_all     data loaded once, one matrix per distinct preprocessor,
+#                    scored sequentially (1 worker) or in parallel
+# Plots and report files are written to a temporary directory.
+
+ARTIFACTS = [
+    ("random_forest", "sparse", {"n_estimators": 100, "max_depth": 10}),
+    ("logistic_regression", "sparse", {}),
+    ("lightgbm", "native", {"lgbm_n_estimators": 200}),
+]
+AIRPORTS = [f"A{i:03}" for i in range(350)]
+
+
+def per_model_runs(models_dir: str) -> float:
+    from database.services.flight_service import load_training_data
+    from ml.evaluation.evaluate import (
+        CATEGORICAL_COLS,
+        NUMERICAL_COLS,
+        TARGET_COL,
+        load_artifacts,
+    )
+    from ml.evaluation.metrics import StreamingMetrics
+    from ml.training.preprocessing import split
+
+    start = time.perf_counter()
+    for model_type, _, _ in ARTIFACTS:
+        df = load_training_data()
+        model, preprocessor = load_artifacts(model_type, models_dir)
+        X = preprocessor.transform(df[NUMERICAL_COLS + CATEGORICAL_COLS])
+        _, X_test, _, y_test = split(X, df[TARGET_COL])
+        StreamingMetrics().update(y_test, model.predict_proba(X_test)[:, 1])
+    return time.perf_counter() - start
+
+
+def main(args) -> dict:
+    workdir = tempfile.mkdtemp(prefix="bench-evaluate-")
+    db_path = os.path.join(workdir, "flights.db")
+    # Read by database.base on import; assets/ is created in the working dir
+    os.environ["DATABASE_URL"] = "sqlite:///" + db_path
+    make_flights_db(db_path, args.rows, seed=0, airports=AIRPORTS)
+    os.chdir(workdir)
+
+    models_dir = os.path.join(workdir, "models")
+    os.makedirs(models_dir)
+    for model_type, mode, params in ARTIFACTS:
+        model, preprocessor = fit_model(
+            model_type, n=20_000, mode=mode, airports=AIRPORTS, **params
+        )
+        joblib.dump(model, os.path.join(models_dir, f"{model_type}_model.pkl"))
+        joblib.dump(
+            preprocessor, os.path.join(models_dir, f"{model_type}_preprocessor.pkl")
+        )
+
+    from ml.evaluation.evaluate import evaluate_all
+
+    results = {"rows": args.rows, "cpu_count": os.cpu_count()}
+    results["per_model_runs_seconds"] = per_model_runs(models_dir)
+    for label, workers in (("sequential", 1), ("parallel", args.workers)):
+        start = time.perf_counter()
+        timing = evaluate_all(models_dir=models_dir, workers=workers)["timing"]
+        results[label] = {**timing, "seconds": time.perf_counter() - start}
+
+    print(f"\nper-model runs          {results['per_model_runs_seconds']:7.2f} s")
+    for label in ("sequential", "parallel"):
+        timing = results[label]
+        print(
+            f"evaluate_all {label:<10} {timing['seconds']:7.2f} s  "
+            f"(scoring {timing['scoring_wall_seconds']:.2f} s wall-clock, "
+            f"{timing['workers']} worker(s), {timing['feature_matrices']} matrices)"
+        )
+    return results
+
+
+# ───────────────────────────────────────────────────────────────
+# Entry Point
+# ───────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluation of every artifact")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Table size")
+    parser.add_argument("--workers", type=int, default=max(2, os.cpu_count() or 1))
+    parser.add_argument("--output", help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    results = main(args)
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,102 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import httpx
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import FEATURE_COLS, fit_model, make_flights  # noqa: E402
+from services import prediction_service  # noqa: E402
+from services.micro_batcher import MicroBatcher  # noqa: E402
+
+# ───────────────────────────────────────────────────────────────
+# Benchmark: /predict throughput and p99 with micro-batching on/off
+# ───────────────────────────────────────────────────────────────
+
+
+async def drive(app, records, concurrency: int) -> dict:
+    """Fire `records` at /predict from `concurrency` concurrent clients."""
+    latencies = []
+    queue = list(records)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def worker():
+            while queue:
+                payload = queue.pop()
+                start = time.perf_counter()
+                response = await client.post("/predict", json=payload)
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies = np.array(latencies) * 1e3
+    return {
+        "requests": len(latencies),
+        "throughput_rps": len(latencies) / elapsed,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+    }
+
+
+async def run(args) -> list:
+    from main import app
+
+    model, preprocessor = fit_model("lightgbm", n=20000, lgbm_n_estimators=100)
+    prediction_service.set_model(model, preprocessor)
+    prediction_service.cache.maxsize = 0  # measure the model, not the cache
+
+    records = make_flights(args.requests, seed=1)[FEATURE_COLS].to_dict("records")
+    results = []
+    for concurrency in args.concurrency:
+        for batching in (False, True):
+            prediction_service.batcher = None
+            if batching:
+                prediction_service.batcher = MicroBatcher(
+                    prediction_service.predict_items,
+                    max_batch_size=args.max_batch_size,
+                    max_wait_ms=args.wait_ms,
+                    max_queue_size=max(1024, concurrency * 2),
+                    timeout=30.0,
+                )
+                await prediction_service.batcher.start()
+
+            stats = await drive(app, records, concurrency)
+            stats.update({"concurrency": concurrency, "batching": batching})
+            results.append(stats)
+            print(
+                f"concurrency={concurrency:<4} batching={'on ' if batching else 'off'} "
+                f"throughput={stats['throughput_rps']:8.1f} req/s  "
+                f"p50={stats['p50_ms']:7.2f} ms  p99={stats['p99_ms']:7.2f} ms"
+            )
+
+            if batching:
+                await prediction_service.batcher.stop()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--wait-ms", type=float, default=2.0)
+    parser.add_argument("--output", help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
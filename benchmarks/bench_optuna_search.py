@@ -0,0 +1,108 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from functools import partial
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import make_flights_db  # noqa: E402
+
+# ───────────────────────────────────────────────────────────────
+# Benchmark: sequential Optuna search vs parallel workers + pruning
+# ───────────────────────────────────────────────────────────────
+#
+# The same LightGBM objective as ml/training/train_model.py (with
+# --compact-preprocessing, i.e. native categoricals), on a synthetic SQLite
+# database, with a fixed budget of finished trials per strategy:
+#   sequential         one process, no pruning (the previous search)
+#   sequential+pruning one process, MedianPruner on validation F1
+#   parallel+pruning   `--workers` processes sharing a SQLite study
+# Every strategy starts from a fresh study with the same sampler seed, and
+# the feature cache is built once beforehand, so only the search is timed.
+
+
+def main(args) -> list:
+    workdir = tempfile.mkdtemp(prefix="bench-optuna-")
+    db_path = os.path.join(workdir, "flights.db")
+    # Read by database.base and feature_cache on import, inherited by workers
+    os.environ["DATABASE_URL"] = "sqlite:///" + db_path
+    os.environ["FEATURE_CACHE_DIR"] = os.path.join(workdir, "feature_cache")
+    make_flights_db(db_path, args.rows, seed=0)
+
+    from ml.training.feature_cache import load_features
+    from ml.training.train_model import (
+        CATEGORICAL_COLS,
+        NUMERICAL_COLS,
+        TARGET_COL,
+        objective,
+    )
+    from ml.training.tuning import run_study
+
+    load_features(NUMERICAL_COLS, CATEGORICAL_COLS, TARGET_COL, mode="native")
+    native_objective = partial(objective, preprocessing="native")
+    storage = "sqlite:///" + os.path.join(workdir, "optuna.db")
+
+    strategies = [
+        ("sequential", 1, False),
+        ("sequential+pruning", 1, True),
+        ("parallel+pruning", args.workers, True),
+    ]
+    results = []
+    for name, workers, pruning in strategies:
+        start = time.perf_counter()
+        study = run_study(
+            native_objective,
+            args.trials,
+            workers=workers,
+            storage=storage,
+            study_name=name,
+            pruning=pruning,
+            seed=args.seed,
+        )
+        elapsed = time.perf_counter() - start
+        states = [trial.state.name for trial in study.trials]
+        results.append(
+            {
+                "strategy": name,
+                "workers": workers,
+                "trials": len(states),
+                "pruned": states.count("PRUNED"),
+                "seconds": elapsed,
+                "best_f1": study.best_value,
+            }
+        )
+        print(
+            f"{name:<20} workers={workers:<3} trials={len(states):<4} "
+            f"pruned={states.count('PRUNED'):<4} time={elapsed:7.1f} s  "
+            f"best_f1={study.best_value:.4f}"
+        )
+
+    baseline = results[0]["seconds"]
+    for result in results[1:]:
+        print(f"{result['strategy']:<20} speed-up x{baseline / result['seconds']:.2f}")
+    return results
+
+
+# ───────────────────────────────────────────────────────────────
+# Entry Point
+# ───────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Optuna search wall-clock")
+    parser.add_argument("--rows", type=int, default=200_000, help="Table size")
+    parser.add_argument("--trials", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=max(2, os.cpu_count() or 1))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    results = main(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {"cpu_count": os.cpu_count(), "rows": args.rows, "results": results},
+                f,
+                indent=2,
+            )
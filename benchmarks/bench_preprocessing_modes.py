@@ -0,0 +1,136 @@
+import argparse
+import json
+import multiprocessing as mp
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+from scipy import sparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import (  # noqa: E402
+    CATEGORICAL_COLS,
+    NUMERICAL_COLS,
+    TARGET_COL,
+    make_flights,
+)
+
+# ───────────────────────────────────────────────────────────────
+# Benchmark: training memory and fit time per preprocessing mode
+# ───────────────────────────────────────────────────────────────
+#
+# Each (model, mode) pair runs in a fresh spawned process so peaks do not
+# leak between runs. `tracemalloc_peak_mb` covers Python and NumPy/SciPy
+# allocations; `max_rss_mb` is the whole process, including LightGBM's and
+# sklearn's native buffers. Flights use a few hundred airports, like the
+# real data, which is what makes dense one-hot columns explode.
+
+RUNS = [
+    ("logistic_regression", "dense"),
+    ("logistic_regression", "sparse"),
+    ("random_forest", "dense"),
+    ("random_forest", "sparse"),
+    ("lightgbm", "dense"),
+    ("lightgbm", "native"),
+]
+PARAMS = {
+    "logistic_regression": {"logreg_C": 1.0},
+    "random_forest": {"n_estimators": 50, "max_depth": 10},
+    "lightgbm": {"lgbm_n_estimators": 100},
+}
+
+
+def matrix_mb(X) -> float:
+    if sparse.issparse(X):
+        return (X.data.nbytes + X.indices.nbytes + X.indptr.nbytes) / 2**20
+    return X.nbytes / 2**20
+
+
+def _run(model_type: str, mode: str, n: int, n_airports: int, conn) -> None:
+    from sklearn.metrics import f1_score
+
+    from ml.training.models import get_model
+    from ml.training.preprocessing import (
+        categorical_feature_indices,
+        preprocessing,
+        split,
+    )
+
+    airports = [f"A{i:03d}" for i in range(n_airports)]
+    df = make_flights(n, seed=0, airports=airports)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    X, y, preprocessor = preprocessing(
+        df, NUMERICAL_COLS, CATEGORICAL_COLS, df[TARGET_COL], mode=mode
+    )
+    preprocess_seconds = time.perf_counter() - start
+    X_train, X_test, y_train, y_test = split(X, y)
+
+    model = get_model({"model_type": model_type, **PARAMS[model_type]})
+    fit_params = {}
+    if model_type == "lightgbm" and mode == "native":
+        fit_params["categorical_feature"] = categorical_feature_indices(preprocessor)
+    start = time.perf_counter()
+    model.fit(X_train, y_train, **fit_params)
+    fit_seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    conn.send(
+        {
+            "model": model_type,
+            "mode": mode,
+            "rows": n,
+            "features": X.shape[1],
+            "matrix_mb": matrix_mb(X),
+            "preprocess_seconds": preprocess_seconds,
+            "fit_seconds": fit_seconds,
+            "tracemalloc_peak_mb": peak / 2**20,
+            # Linux reports ru_maxrss in KiB
+            "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10,
+            "f1_score": f1_score(y_test, model.predict(X_test)),
+        }
+    )
+
+
+def run(args) -> list:
+    context = mp.get_context("spawn")
+    results = []
+    for model_type, mode in RUNS:
+        if args.models and model_type not in args.models:
+            continue
+        parent, child = context.Pipe()
+        process = context.Process(
+            target=_run, args=(model_type, mode, args.rows, args.airports, child)
+        )
+        process.start()
+        stats = parent.recv()
+        process.join()
+        results.append(stats)
+        print(
+            f"{model_type:<20} {mode:<7} features={stats['features']:<5} "
+            f"matrix={stats['matrix_mb']:8.1f} MB  "
+            f"preprocess={stats['preprocess_seconds']:6.2f} s  "
+            f"fit={stats['fit_seconds']:7.2f} s  "
+            f"py_peak={stats['tracemalloc_peak_mb']:8.1f} MB  "
+            f"max_rss={stats['max_rss_mb']:8.1f} MB  f1={stats['f1_score']:.3f}"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--airports", type=int, default=350)
+    parser.add_argument("--models", nargs="+", help="Subset of model types")
+    parser.add_argument("--output", help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,109 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../api")))
+
+from benchmarks.synthetic import FEATURE_COLS, fit_model, make_flights  # noqa: E402
+from services.model_registry import ModelRegistry  # noqa: E402
+from services.process_backend import ProcessBackend  # noqa: E402
+
+# ───────────────────────────────────────────────────────────────
+# Benchmark: scoring throughput, request threads vs process pool
+# ───────────────────────────────────────────────────────────────
+#
+# `concurrency` client threads each score batches of `batch_size` rows, the
+# way request handlers call predict_batch. Thread rows use LoadedModel.score
+# directly; process rows go through ProcessBackend with N workers.
+
+
+def measure(score, records, batch_size: int, concurrency: int, seconds: float):
+    batch = records[:batch_size]
+    deadline = time.perf_counter() + seconds
+
+    def client() -> int:
+        rows = 0
+        while time.perf_counter() < deadline:
+            score(batch)
+            rows += len(batch)
+        return rows
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        rows = sum(pool.map(lambda _: client(), range(concurrency)))
+    return rows / (time.perf_counter() - start)
+
+
+def run(args) -> list:
+    directory = tempfile.mkdtemp(prefix="bench-process-")
+    model, preprocessor = fit_model("lightgbm", n=20000, lgbm_n_estimators=300)
+    model_path = os.path.join(directory, "lightgbm_model.pkl")
+    preprocessor_path = os.path.join(directory, "lightgbm_preprocessor.pkl")
+    joblib.dump(model, model_path)
+    joblib.dump(preprocessor, preprocessor_path)
+
+    loaded = ModelRegistry("lightgbm", model_path, preprocessor_path).load()
+    records = make_flights(max(args.batch_size), seed=1)[FEATURE_COLS].to_dict(
+        "records"
+    )
+    print(f"cpu_count={os.cpu_count()}")
+
+    backends, pools = [("thread", 0, loaded.score)], []
+    for workers in args.workers:
+        backend = ProcessBackend(
+            {"lightgbm": (model_path, preprocessor_path, None)},
+            workers=workers,
+            split_size=args.split_size,
+        )
+        backend.start()
+        pools.append(backend)
+        backends.append(
+            ("process", workers, lambda recs, b=backend: b.score(loaded, recs))
+        )
+
+    results = []
+    for batch_size in args.batch_size:
+        for kind, workers, score in backends:
+            rows_per_s = measure(
+                score, records, batch_size, args.concurrency, args.seconds
+            )
+            results.append(
+                {
+                    "backend": kind,
+                    "workers": workers,
+                    "batch_size": batch_size,
+                    "concurrency": args.concurrency,
+                    "rows_per_second": rows_per_s,
+                }
+            )
+            label = kind if kind == "thread" else f"process x{workers}"
+            print(
+                f"batch={batch_size:<6} {label:<12} "
+                f"throughput={rows_per_s:12,.0f} rows/s"
+            )
+    for backend in pools:
+        backend.stop()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[1, 64, 4096])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--split-size", type=int, default=1024)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--output", help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,92 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.bench_micro_batching import drive  # noqa: E402
+from benchmarks.synthetic import FEATURE_COLS, fit_model, make_flights  # noqa: E402
+from services import prediction_service  # noqa: E402
+from services.shadow import ShadowScorer  # noqa: E402
+
+# ───────────────────────────────────────────────────────────────
+# Benchmark: /predict latency with shadow scoring off vs on
+# ───────────────────────────────────────────────────────────────
+#
+# Primary: LightGBM. Shadow: a random forest, the slowest model we train, so
+# any leak of shadow work into the response path shows up in the percentiles.
+
+
+async def run(args) -> list:
+    from main import app
+
+    for name, params in (
+        ("lightgbm", {"lgbm_n_estimators": 100}),
+        ("random_forest", {"n_estimators": 100, "max_depth": 10}),
+    ):
+        model, preprocessor = fit_model(name, n=20000, **params)
+        prediction_service.set_model(model, preprocessor, name=name)
+    prediction_service.cache.maxsize = 0  # measure the models, not the cache
+
+    # Comparisons are discarded: only their cost matters here
+    quiet = logging.getLogger("shadow-benchmark")
+    quiet.addHandler(logging.NullHandler())
+    quiet.propagate = False
+
+    records = make_flights(args.requests, seed=1)[FEATURE_COLS].to_dict("records")
+    results = []
+    for concurrency in args.concurrency:
+        for shadowing in (False, True):
+            shadow = None
+            if shadowing:
+                shadow = ShadowScorer(
+                    prediction_service.get_registry("random_forest"),
+                    max_queue_size=args.queue_size,
+                    logger=quiet,
+                )
+                shadow.start()
+            prediction_service.shadow = shadow
+
+            stats = await drive(app, records, concurrency)
+            drain_start = time.perf_counter()
+            if shadow is not None:
+                shadow.stop()
+            stats.update(
+                {
+                    "concurrency": concurrency,
+                    "shadow": shadowing,
+                    # Shadow work left when the load stopped, and work shed
+                    "shadow_drain_s": time.perf_counter() - drain_start,
+                    "shadow_scored": shadow.scored if shadow else 0,
+                    "shadow_dropped": shadow.dropped if shadow else 0,
+                }
+            )
+            results.append(stats)
+            print(
+                f"concurrency={concurrency:<4} shadow={'on ' if shadowing else 'off'} "
+                f"throughput={stats['throughput_rps']:8.1f} req/s  "
+                f"p50={stats['p50_ms']:7.2f} ms  p95={stats['p95_ms']:7.2f} ms  "
+                f"p99={stats['p99_ms']:7.2f} ms  "
+                f"drain={stats['shadow_drain_s']:5.2f} s  "
+                f"dropped={stats['shadow_dropped']:.0f}"
+            )
+    prediction_service.shadow = None
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("--queue-size", type=int, default=1024)
+    parser.add_argument("--output", help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
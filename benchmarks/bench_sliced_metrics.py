@@ -0,0 +1,87 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import make_flights  # noqa: E402
+from ml.evaluation.metrics import SLICE_DIMENSIONS, SlicedMetrics  # noqa: E402
+
+# ───────────────────────────────────────────────────────────────
+# Benchmark: per-slice metrics, one grouped pass vs one filter per slice
+# ───────────────────────────────────────────────────────────────
+#
+# Predictions are random (80% right); only the slicing cost is measured.
+# Flights use a few hundred airports, like the real data, so "route" has
+# tens of thousands of slices. The per-slice baseline is a boolean filter
+# and four counts per slice value, and is only run up to --naive-max-rows.
+
+AIRPORTS = [f"A{i:03}" for i in range(350)]
+
+
+def naive_slices(df, y_true, y_pred) -> int:
+    n_slices = 0
+    for columns in SLICE_DIMENSIONS.values():
+        key = df[list(columns)].astype(str).agg("-".join, axis=1).to_numpy()
+        for value in np.unique(key):
+            mask = key == value
+            t, p = y_true[mask], y_pred[mask]
+            _ = (
+                np.sum((t == 0) & (p == 0)),
+                np.sum((t == 0) & (p == 1)),
+                np.sum((t == 1) & (p == 0)),
+                np.sum((t == 1) & (p == 1)),
+            )
+            n_slices += 1
+    return n_slices
+
+
+def main(args) -> list:
+    results = []
+    for rows in args.rows:
+        df = make_flights(rows, seed=0, airports=AIRPORTS)
+        y_true = df["arr_del15"].astype(int).to_numpy()
+        rng = np.random.default_rng(0)
+        y_pred = np.where(rng.random(rows) < 0.8, y_true, 1 - y_true)
+
+        start = time.perf_counter()
+        sliced = SlicedMetrics()
+        sliced.update(df, y_true, y_pred)
+        table = sliced.result(min_support=0)
+        engine = time.perf_counter() - start
+        result = {"rows": rows, "slices": len(table), "engine_seconds": engine}
+
+        if rows <= args.naive_max_rows:
+            start = time.perf_counter()
+            naive_slices(df, y_true, y_pred)
+            result["per_slice_seconds"] = time.perf_counter() - start
+
+        results.append(result)
+        naive = result.get("per_slice_seconds")
+        print(
+            f"rows={rows:<9} slices={len(table):<7} engine={engine:7.3f} s  "
+            + (f"per-slice filters={naive:8.2f} s" if naive else "")
+        )
+    return results
+
+
+# ───────────────────────────────────────────────────────────────
+# Entry Point
+# ───────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sliced metrics cost")
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000, 4_000_000]
+    )
+    parser.add_argument("--naive-max-rows", type=int, default=100_000)
+    parser.add_argument("--output", help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    results = main(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
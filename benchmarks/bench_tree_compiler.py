@@ -0,0 +1,79 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import fit_model, make_flights  # noqa: E402
+from services.tree_compiler import compile_model  # noqa: E402
+
+# ───────────────────────────────────────────────────────────────
+# Benchmark: flattened trees vs sklearn / LightGBM predict_proba
+# ───────────────────────────────────────────────────────────────
+
+MODELS = {
+    "lightgbm": {"lgbm_n_estimators": 100},
+    "random_forest": {"n_estimators": 100, "max_depth": 10},
+}
+
+
+def time_call(fn, repeat: int) -> float:
+    """Median wall-clock seconds of `repeat` calls."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def run(batch_sizes, repeat: int) -> list:
+    results = []
+    for model_type, params in MODELS.items():
+        model, preprocessor = fit_model(model_type, n=20000, **params)
+        compiled = compile_model(model)
+        X_all = preprocessor.transform(make_flights(max(batch_sizes), seed=1))
+
+        np.testing.assert_allclose(
+            compiled.predict_proba(X_all), model.predict_proba(X_all), atol=1e-9
+        )
+
+        for size in batch_sizes:
+            X = X_all[:size]
+            n = repeat if size <= 1000 else max(3, repeat // 20)
+            native = time_call(lambda: model.predict_proba(X), n)
+            flat = time_call(lambda: compiled.predict_proba(X), n)
+            results.append(
+                {
+                    "model": model_type,
+                    "batch_size": size,
+                    "native_ms": native * 1e3,
+                    "compiled_ms": flat * 1e3,
+                    "native_rows_per_s": size / native,
+                    "compiled_rows_per_s": size / flat,
+                    "speedup": native / flat,
+                }
+            )
+            print(
+                f"{model_type:<14} batch={size:<7} "
+                f"native={native * 1e3:9.3f} ms  compiled={flat * 1e3:9.3f} ms  "
+                f"speedup={native / flat:5.2f}x"
+            )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 10000])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--output", help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
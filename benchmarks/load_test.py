@@ -0,0 +1,303 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Dict, List
+
+import httpx
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import FEATURE_COLS, ROOT, make_flights  # noqa: E402
+
+# ───────────────────────────────────────────────────────────────
+# Load test: replay a request mix against the API
+# ───────────────────────────────────────────────────────────────
+#
+# Every (concurrency, batch size) cell sends the same number of requests
+# from `concurrency` concurrent clients. Batch size 1 posts single flights
+# to /predict, larger sizes post lists to /predict/batch. Results are one
+# JSON document per run, so two commits can be compared field by field.
+
+
+# ───────────────────────────────────────────────────────────────
+# Request Mix
+# ───────────────────────────────────────────────────────────────
+def load_mix(source: str, size: int, seed: int) -> List[Dict]:
+    """
+    Flight feature dicts to replay:
+    - "db": a uniform sample of flights from the SQLite database
+    - "synthetic": generated flights (no database needed)
+    - a path: a JSON-lines file, one flight per line, either flat or
+      wrapped as {"features": {...}}
+    """
+    if source == "db":
+        from database.services.flight_service import sample_scoring_features
+
+        df = sample_scoring_features(size)
+        return df[FEATURE_COLS].to_dict("records")
+    if source == "synthetic":
+        return make_flights(size, seed=seed)[FEATURE_COLS].to_dict("records")
+
+    mix = []
+    with open(source) as f:
+        for line in f:
+            if line.strip():
+                item = json.loads(line)
+                item = item.get("features", item)
+                mix.append({col: item.get(col) for col in FEATURE_COLS})
+    return mix
+
+
+def save_mix(mix: List[Dict], path: str) -> None:
+    """Write the mix as JSON lines, so later runs replay exactly the same flights."""
+    with open(path, "w") as f:
+        for record in mix:
+            f.write(json.dumps(record, default=float) + "\n")
+
+
+def make_requests(mix: List[Dict], batch_size: int, n_requests: int, seed: int):
+    """(path, payload) pairs cycling through a shuffled copy of the mix."""
+    records = list(mix)
+    random.Random(seed).shuffle(records)
+    requests, position = [], 0
+    for _ in range(n_requests):
+        batch = [records[(position + i) % len(records)] for i in range(batch_size)]
+        position += batch_size
+        if batch_size == 1:
+            requests.append(("/predict", batch[0]))
+        else:
+            requests.append(("/predict/batch", batch))
+    return requests
+
+
+# ───────────────────────────────────────────────────────────────
+# Targets: all expose an httpx.AsyncClient
+# ───────────────────────────────────────────────────────────────
+@asynccontextmanager
+async def in_process_client():
+    """The app running in this process, with its lifespan, over ASGI."""
+    from main import app
+    from services import prediction_service
+
+    if not prediction_service.is_model_loaded():
+        from benchmarks.synthetic import fit_model
+
+        print("⚠️ No trained model found, serving a synthetic LightGBM model")
+        model, preprocessor = fit_model("lightgbm", n=20000, lgbm_n_estimators=100)
+        prediction_service.set_model(model, preprocessor, version="synthetic")
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://load-test", timeout=60.0
+        ) as client:
+            yield client
+
+
+@asynccontextmanager
+async def local_server_client(port: int, workers: int):
+    """A uvicorn server started for the run, configured from the environment."""
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "main:app",
+            "--app-dir",
+            "api",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        cwd=ROOT,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60.0) as client:
+            await wait_until_healthy(client, server)
+            yield client
+    finally:
+        server.terminate()
+        server.wait()
+
+
+@asynccontextmanager
+async def remote_client(url: str):
+    async with httpx.AsyncClient(base_url=url, timeout=60.0) as client:
+        await wait_until_healthy(client)
+        yield client
+
+
+async def wait_until_healthy(client, server=None, timeout: float = 120.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if server is not None and server.poll() is not None:
+            raise SystemExit("❌ The API server exited during startup")
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.5)
+    raise SystemExit(f"❌ {client.base_url} not healthy after {timeout:.0f}s")
+
+
+# ───────────────────────────────────────────────────────────────
+# Measurement
+# ───────────────────────────────────────────────────────────────
+async def replay(client, requests, concurrency: int) -> dict:
+    """Send `requests` from `concurrency` clients; latency per request."""
+    latencies, errors = [], 0
+    pending = iter(requests)
+
+    async def worker():
+        nonlocal errors
+        for path, payload in pending:
+            start = time.perf_counter()
+            try:
+                response = await client.post(path, json=payload)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - start)
+            errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array(latencies) * 1e3
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": elapsed,
+        "throughput_rps": len(latencies) / elapsed,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "max_ms": float(latencies.max()),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run(args) -> dict:
+    mix = load_mix(args.source, args.mix_size, args.seed)
+    if not mix:
+        raise SystemExit(f"❌ Empty request mix from {args.source}")
+    if args.save_mix:
+        save_mix(mix, args.save_mix)
+
+    if args.url:
+        target, client_context = args.url, remote_client(args.url)
+    elif args.serve:
+        target = f"uvicorn --workers {args.server_workers}"
+        client_context = local_server_client(args.port, args.server_workers)
+    else:
+        target, client_context = "in-process", in_process_client()
+
+    results = []
+    async with client_context as client:
+        for batch_size in args.batch_size:
+            for concurrency in args.concurrency:
+                warmup = make_requests(mix, batch_size, args.warmup, args.seed + 1)
+                await replay(client, warmup, concurrency)
+
+                requests = make_requests(mix, batch_size, args.requests, args.seed)
+                stats = await replay(client, requests, concurrency)
+                stats.update(
+                    {
+                        "batch_size": batch_size,
+                        "concurrency": concurrency,
+                        "rows_per_second": stats["throughput_rps"] * batch_size,
+                    }
+                )
+                results.append(stats)
+                print(
+                    f"batch={batch_size:<5} concurrency={concurrency:<4} "
+                    f"throughput={stats['throughput_rps']:8.1f} req/s "
+                    f"({stats['rows_per_second']:9.0f} rows/s)  "
+                    f"p50={stats['p50_ms']:7.2f} ms  p95={stats['p95_ms']:7.2f} ms  "
+                    f"p99={stats['p99_ms']:7.2f} ms  errors={stats['errors']}"
+                )
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "target": target,
+            "source": args.source,
+            "mix_size": len(mix),
+            "requests_per_cell": args.requests,
+            "warmup_per_cell": args.warmup,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "env": {
+                key: value
+                for key, value in os.environ.items()
+                if key.startswith(("PREDICT_", "INFERENCE_", "MODEL", "SHADOW_"))
+                or key == "DEFAULT_MODEL"
+            },
+        },
+        "results": results,
+    }
+
+
+# ───────────────────────────────────────────────────────────────
+# Entry Point
+# ───────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API load test")
+    parser.add_argument(
+        "--source",
+        default="synthetic",
+        help='"db", "synthetic" or a JSON-lines file of flights',
+    )
+    parser.add_argument("--mix-size", type=int, default=5000)
+    parser.add_argument("--save-mix", help="Write the request mix as JSON lines")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[1, 100])
+    parser.add_argument("--requests", type=int, default=1000, help="Per cell")
+    parser.add_argument("--warmup", type=int, default=50, help="Per cell")
+    parser.add_argument("--seed", type=int, default=0)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="Benchmark an already running server")
+    target.add_argument(
+        "--serve", action="store_true", help="Start a local uvicorn server"
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--server-workers", type=int, default=1)
+    parser.add_argument("--output", help="JSON results file (default: stdout)")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Results written to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
@@ -0,0 +1,284 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+import joblib
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import FEATURE_COLS, fit_model, make_flights  # noqa: E402
+
+# ───────────────────────────────────────────────────────────────
+# Micro-benchmarks: preprocessing and inference hot paths
+# ───────────────────────────────────────────────────────────────
+#
+# Offline, on synthetic flights:
+#   <model>/transform/<n>       ColumnTransformer.transform of n rows
+#   <model>/predict_proba/<n>   predict_proba of n already transformed rows
+#   validation/<n>              FlightFeatures(**item).dict() for n items,
+#                               as /predict/batch does
+#   load_training_data/<n>      the training query on an n-row SQLite table
+#
+# Every entry is timed after one warm-up call, repeated until --min-seconds
+# have passed (at least --repeats times), and keeps the median, p95 and
+# rows per second. `run` writes them to a JSON baseline; `compare` flags the
+# entries whose median got slower than the baseline's by more than
+# --threshold.
+#
+#   python benchmarks/microbench.py run --output benchmarks/baselines/micro.json
+#   python benchmarks/microbench.py compare baseline.json current.json
+
+MODELS_DIR = "ml/models_artifact"
+MODEL_TYPES = ["random_forest", "logistic_regression", "lightgbm"]
+# Artifacts fitted when a saved one is missing or cannot be unpickled
+# (same modes and hyperparameters as ml/training/train_model.py)
+SYNTHETIC_ARTIFACTS = {
+    "random_forest": ("dense", {"n_estimators": 100, "max_depth": 10}),
+    "logistic_regression": ("dense", {"logreg_C": 1.0}),
+    "lightgbm": ("dense", {}),
+}
+SIZES = [1, 100, 10_000, 1_000_000]
+# Validation is per item: larger batches only multiply the same cost
+VALIDATION_MAX_ROWS = 10_000
+DB_ROWS = 500_000
+THRESHOLD = 0.2
+# Entries faster than this are too noisy to compare (seconds)
+NOISE_FLOOR = 1e-4
+
+
+def time_call(
+    fn: Callable, rows: int, repeats: int = 3, min_seconds: float = 1.0
+) -> Dict[str, float]:
+    """Time `fn()` after one warm-up call; statistics over all repeats."""
+    fn()
+    times: List[float] = []
+    start = time.perf_counter()
+    while len(times) < repeats or time.perf_counter() - start < min_seconds:
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+        if len(times) >= 10_000:
+            break
+    median = float(np.median(times))
+    return {
+        "rows": rows,
+        "repeats": len(times),
+        "median_seconds": median,
+        "p95_seconds": float(np.percentile(times, 95)),
+        "min_seconds": float(np.min(times)),
+        "rows_per_second": rows / median if median else float("inf"),
+    }
+
+
+def load_artifact(model_type: str, models_dir: str, synthetic: bool, sample):
+    """
+    (model, preprocessor, source): the saved pair if it scores `sample`
+    (pickles from another scikit-learn version may load but not run), or
+    one fitted here.
+    """
+    if not synthetic:
+        try:
+            model = joblib.load(os.path.join(models_dir, f"{model_type}_model.pkl"))
+            preprocessor = joblib.load(
+                os.path.join(models_dir, f"{model_type}_preprocessor.pkl")
+            )
+            model.predict_proba(preprocessor.transform(sample))
+            return model, preprocessor, "file"
+        except Exception as e:
+            print(f"⚠️ {model_type}: saved artifact unusable, fitting one ({e!r})")
+    mode, params = SYNTHETIC_ARTIFACTS[model_type]
+    model, preprocessor = fit_model(model_type, n=20_000, mode=mode, **params)
+    return model, preprocessor, "synthetic"
+
+
+def bench_validation(sizes: List[int], timing: dict) -> Dict[str, dict]:
+    from models.schemas import FlightFeatures
+
+    records = make_flights(max(sizes), seed=1)[FEATURE_COLS].to_dict("records")
+    results = {}
+    for n in sizes:
+        items = records[:n]
+        results[f"validation/{n}"] = time_call(
+            lambda: [FlightFeatures(**item).dict() for item in items], n, **timing
+        )
+    return results
+
+
+def bench_load_training_data(rows: int, timing: dict) -> Dict[str, dict]:
+    workdir = tempfile.mkdtemp(prefix="microbench-")
+    db_path = os.path.join(workdir, "flights.db")
+    # Read by database.base on import
+    os.environ["DATABASE_URL"] = "sqlite:///" + db_path
+    from benchmarks.synthetic import make_flights_db
+
+    make_flights_db(db_path, rows, seed=0)
+    from loguru import logger
+
+    from database.services.flight_service import load_training_data
+
+    logger.disable("database.services.flight_service")
+    return {f"load_training_data/{rows}": time_call(load_training_data, rows, **timing)}
+
+
+def run(args) -> dict:
+    timing = {"repeats": args.repeats, "min_seconds": args.min_seconds}
+    sizes = sorted(args.sizes)
+    df = make_flights(max(sizes), seed=1)
+    meta = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "artifacts": {},
+    }
+    results: Dict[str, dict] = {}
+
+    for model_type in args.models:
+        model, preprocessor, source = load_artifact(
+            model_type, args.models_dir, args.synthetic_artifacts, df.iloc[:10]
+        )
+        meta["artifacts"][model_type] = source
+        for n in sizes:
+            batch = df.iloc[:n][FEATURE_COLS]
+            X = preprocessor.transform(batch)
+            results[f"{model_type}/transform/{n}"] = time_call(
+                lambda: preprocessor.transform(batch), n, **timing
+            )
+            results[f"{model_type}/predict_proba/{n}"] = time_call(
+                lambda: model.predict_proba(X), n, **timing
+            )
+            print(f"   {model_type:<20} {n:>9} rows done")
+
+    validation_sizes = [n for n in sizes if n <= args.validation_max_rows]
+    if validation_sizes:
+        results.update(bench_validation(validation_sizes, timing))
+    if args.db_rows:
+        results.update(bench_load_training_data(args.db_rows, timing))
+
+    print(f"\n{'benchmark':<42} {'median':>12} {'p95':>12} {'rows/s':>14}")
+    for name, stats in results.items():
+        print(
+            f"{name:<42} {stats['median_seconds'] * 1e3:9.3f} ms "
+            f"{stats['p95_seconds'] * 1e3:9.3f} ms {stats['rows_per_second']:14,.0f}"
+        )
+    return {"meta": meta, "results": results}
+
+
+# ───────────────────────────────────────────────────────────────
+# Baseline Comparison
+# ───────────────────────────────────────────────────────────────
+
+
+def compare(
+    baseline: dict,
+    current: dict,
+    threshold: float = THRESHOLD,
+    noise_floor: float = NOISE_FLOOR,
+) -> List[dict]:
+    """
+    Entries present in both runs with their median change (current /
+    baseline - 1); those slower by more than `threshold` are regressions.
+    Entries whose medians are both under `noise_floor` are never flagged.
+    """
+    rows = []
+    for name, old in baseline["results"].items():
+        new = current["results"].get(name)
+        if new is None:
+            continue
+        before, after = old["median_seconds"], new["median_seconds"]
+        change = after / before - 1 if before else 0.0
+        rows.append(
+            {
+                "name": name,
+                "baseline_seconds": before,
+                "current_seconds": after,
+                "change": change,
+                "regression": change > threshold and max(before, after) >= noise_floor,
+            }
+        )
+    return rows
+
+
+def print_comparison(rows: List[dict], baseline: dict, current: dict) -> None:
+    for key in ("python", "machine", "cpu_count"):
+        if baseline["meta"][key] != current["meta"][key]:
+            print(f"⚠️ Different {key}: timings are not comparable across machines")
+    for model_type, source in current["meta"]["artifacts"].items():
+        if baseline["meta"]["artifacts"].get(model_type, source) != source:
+            print(f"⚠️ {model_type}: artifacts differ between runs")
+    print(f"{'benchmark':<42} {'baseline':>12} {'current':>12} {'change':>9}")
+    for row in rows:
+        print(
+            f"{row['name']:<42} {row['baseline_seconds'] * 1e3:9.3f} ms "
+            f"{row['current_seconds'] * 1e3:9.3f} ms {row['change']:+8.1%}"
+            + ("  ❌ regression" if row["regression"] else "")
+        )
+
+
+# ───────────────────────────────────────────────────────────────
+# Entry Point
+# ───────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hot path micro-benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the suite")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    run_parser.add_argument("--models", nargs="+", default=MODEL_TYPES)
+    run_parser.add_argument("--models-dir", default=MODELS_DIR)
+    run_parser.add_argument(
+        "--synthetic-artifacts",
+        action="store_true",
+        help="Fit small models on synthetic data instead of loading the saved ones",
+    )
+    run_parser.add_argument(
+        "--validation-max-rows", type=int, default=VALIDATION_MAX_ROWS
+    )
+    run_parser.add_argument(
+        "--db-rows", type=int, default=DB_ROWS, help="0 skips load_training_data"
+    )
+    run_parser.add_argument("--repeats", type=int, default=3)
+    run_parser.add_argument("--min-seconds", type=float, default=1.0)
+    run_parser.add_argument("--output", help="Write the results as a JSON baseline")
+
+    compare_parser = commands.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=THRESHOLD,
+        help="Relative slowdown of the median that counts as a regression",
+    )
+    args = parser.parse_args()
+
+    if args.command == "run":
+        output = os.path.abspath(args.output) if args.output else None
+        results = run(args)
+        if output:
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+            with open(output, "w") as f:
+                json.dump(results, f, indent=2)
+    elif not os.path.exists(args.baseline):
+        # Baselines are machine-specific and recorded locally, not committed
+        print(
+            f"ℹ️ No baseline at {args.baseline}: record one with "
+            "`make bench-micro-baseline` (nothing compared)"
+        )
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        rows = compare(baseline, current, args.threshold)
+        print_comparison(rows, baseline, current)
+        regressions = [row["name"] for row in rows if row["regression"]]
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) over {args.threshold:.0%}")
+            sys.exit(1)
+        print("\n✅ No regression")
@@ -0,0 +1,146 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add project root and API root to sys.path for imports
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+for path in (ROOT, os.path.join(ROOT, "api")):
+    if path not in sys.path:
+        sys.path.append(path)
+
+# ───────────────────────────────────────────────────────────────
+# Feature Definitions (same as ml/training/train_model.py)
+# ───────────────────────────────────────────────────────────────
+NUMERICAL_COLS = [
+    "month",
+    "day_of_week",
+    "crs_dep_time",
+    "crs_arr_time",
+    "crs_elapsed_time",
+    "distance",
+]
+CATEGORICAL_COLS = ["unique_carrier", "origin", "dest", "dep_time_blk"]
+FEATURE_COLS = NUMERICAL_COLS + CATEGORICAL_COLS
+TARGET_COL = "arr_del15"
+
+CARRIERS = ["AA", "DL", "UA", "WN", "B6", "AS", "NK", "F9"]
+AIRPORTS = ["JFK", "LAX", "ORD", "ATL", "DFW", "SFO", "MIA", "SEA", "DEN", "BOS"]
+TIME_BLOCKS = ["0001-0559"] + [f"{h:02}00-{h:02}59" for h in range(6, 24)]
+
+
+# ───────────────────────────────────────────────────────────────
+# Synthetic Data
+# ───────────────────────────────────────────────────────────────
+
+
+def make_flights(n: int = 2000, seed: int = 0, airports=AIRPORTS) -> pd.DataFrame:
+    """
+    Build a synthetic flights DataFrame with the training query's columns.
+    """
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "month": rng.integers(1, 13, n),
+            "day_of_week": rng.integers(1, 8, n),
+            "crs_dep_time": rng.integers(0, 2400, n),
+            "crs_arr_time": rng.integers(0, 2400, n),
+            "crs_elapsed_time": rng.integers(30, 400, n),
+            "distance": rng.uniform(50, 3000, n).round(1),
+            "unique_carrier": rng.choice(CARRIERS, n),
+            "origin": rng.choice(airports, n),
+            "dest": rng.choice(airports, n),
+            "dep_time_blk": rng.choice(TIME_BLOCKS, n),
+        }
+    )
+    signal = (df["distance"] > 1500) | (df["dep_time_blk"] >= "1700-1759")
+    df[TARGET_COL] = (signal ^ (rng.random(n) < 0.2)).astype(float)
+    return df
+
+
+def fit_model(
+    model_type: str,
+    n: int = 5000,
+    seed: int = 0,
+    mode: str = "dense",
+    airports=AIRPORTS,
+    **params,
+):
+    """
+    Fit a preprocessor (in the given preprocessing mode) and a model of the
+    given type on synthetic flights. Returns (model, preprocessor).
+    """
+    from ml.training.models import get_model
+    from ml.training.preprocessing import categorical_feature_indices, preprocessing
+
+    df = make_flights(n, seed, airports=airports)
+    X, y, preprocessor = preprocessing(
+        df, NUMERICAL_COLS, CATEGORICAL_COLS, df[TARGET_COL], mode=mode
+    )
+    model = get_model({"model_type": model_type, **params})
+    fit_params = {}
+    if model_type == "lightgbm" and mode == "native":
+        fit_params["categorical_feature"] = categorical_feature_indices(preprocessor)
+    model.fit(X, y, **fit_params)
+    return model, preprocessor
+
+
+def make_flights_db(path: str, n: int = 100_000, seed: int = 0, airports=AIRPORTS):
+    """
+    Create a SQLite database with the application schema at `path` and fill
+    it with `n` synthetic flights (a few cancelled or without a label, like
+    the real table). Returns its SQLAlchemy engine.
+    """
+    from sqlalchemy import create_engine
+
+    from database.base import Base
+    from database.models import airline, airports as airport_model, flight  # noqa: F401
+
+    engine = create_engine("sqlite:///" + path)
+    Base.metadata.create_all(engine)
+    rng = np.random.default_rng(seed)
+
+    airline_ids = {code: i + 1 for i, code in enumerate(CARRIERS)}
+    airport_ids = {code: i + 1 for i, code in enumerate(airports)}
+    with engine.begin() as connection:
+        pd.DataFrame(
+            {"id": list(airline_ids.values()), "unique_carrier": list(airline_ids)}
+        ).to_sql("airlines", connection, if_exists="append", index=False)
+        pd.DataFrame(
+            {"id": list(airport_ids.values()), "code": list(airport_ids)}
+        ).to_sql("airports", connection, if_exists="append", index=False)
+
+        for start in range(0, n, 100_000):
+            df = make_flights(
+                min(100_000, n - start), seed=seed + start, airports=airports
+            )
+            rows = len(df)
+            df["arr_del15"] = df["arr_del15"].where(rng.random(rows) >= 0.01)
+            flights = pd.DataFrame(
+                {
+                    "year": 2016,
+                    "month": df["month"],
+                    "day_of_week": df["day_of_week"],
+                    "fl_date": pd.to_datetime(
+                        {
+                            "year": 2016,
+                            "month": df["month"],
+                            "day": rng.integers(1, 29, rows),
+                        }
+                    ).dt.date,
+                    "airline_id": df["unique_carrier"].map(airline_ids),
+                    "origin_id": df["origin"].map(airport_ids),
+                    "dest_id": df["dest"].map(airport_ids),
+                    "crs_dep_time": df["crs_dep_time"].astype(float),
+                    "dep_time_blk": df["dep_time_blk"],
+                    "crs_arr_time": df["crs_arr_time"].astype(float),
+                    "arr_del15": df["arr_del15"],
+                    "crs_elapsed_time": df["crs_elapsed_time"].astype(float),
+                    "distance": df["distance"],
+                    "cancelled": rng.random(rows) < 0.02,
+                    "diverted": False,
+                }
+            )
+            flights.to_sql("flights", connection, if_exists="append", index=False)
+    return engine
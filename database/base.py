@@ -6,6 +6,7 @@ from sqlalchemy.orm import declarative_base, sessionmaker
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 bdd_file_path = os.path.join(BASE_DIR, "dump", "flights.db")
-engine = create_engine("sqlite:///" + bdd_file_path)
+# DATABASE_URL points the application (and child processes) at another database
+engine = create_engine(os.getenv("DATABASE_URL", "sqlite:///" + bdd_file_path))
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 Base = declarative_base()
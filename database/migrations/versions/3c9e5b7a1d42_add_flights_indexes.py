@@ -0,0 +1,60 @@
+"""add flights indexes
+
+Revision ID: 3c9e5b7a1d42
+Revises: 18f4d41fb5f2
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c9e5b7a1d42"
+down_revision: Union[str, Sequence[str], None] = "18f4d41fb5f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same as database/models/flight.py, frozen at this revision
+TRAINING_ROWS = "arr_del15 IS NOT NULL AND cancelled = 0"
+TRAINING_INDEX_COLUMNS = [
+    "airline_id",
+    "origin_id",
+    "dest_id",
+    "month",
+    "day_of_week",
+    "crs_dep_time",
+    "crs_arr_time",
+    "crs_elapsed_time",
+    "distance",
+    "dep_time_blk",
+    "arr_del15",
+    "cancelled",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Foreign keys (origin_id is the first column of ix_flights_route)
+    op.create_index("ix_flights_airline_id", "flights", ["airline_id"])
+    op.create_index("ix_flights_dest_id", "flights", ["dest_id"])
+    # Route lookups
+    op.create_index("ix_flights_route", "flights", ["origin_id", "dest_id", "fl_date"])
+    # Training query: only its rows, with every column it reads
+    op.create_index(
+        "ix_flights_training",
+        "flights",
+        TRAINING_INDEX_COLUMNS,
+        sqlite_where=sa.text(TRAINING_ROWS),
+        postgresql_where=sa.text(TRAINING_ROWS),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_flights_training", table_name="flights")
+    op.drop_index("ix_flights_route", table_name="flights")
+    op.drop_index("ix_flights_dest_id", table_name="flights")
+    op.drop_index("ix_flights_airline_id", table_name="flights")
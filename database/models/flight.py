@@ -1,10 +1,55 @@
-from sqlalchemy import Boolean, Column, Date, Float, ForeignKey, Integer, String
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    text,
+)
 
 from database.base import Base
 
+# Rows the training query reads (database/services/flight_service.py)
+TRAINING_ROWS = "arr_del15 IS NOT NULL AND cancelled = 0"
+# Every flights column the training query selects, filters or joins on. The
+# query returns rows in index order: the label and the filter columns come
+# last (the partial WHERE already filters on them) so rows are not sorted by
+# class
+TRAINING_INDEX_COLUMNS = [
+    "airline_id",
+    "origin_id",
+    "dest_id",
+    "month",
+    "day_of_week",
+    "crs_dep_time",
+    "crs_arr_time",
+    "crs_elapsed_time",
+    "distance",
+    "dep_time_blk",
+    "arr_del15",
+    "cancelled",
+]
+
 
 class Flight(Base):
     __tablename__ = "flights"
+    # Mirrors migration 3c9e5b7a1d42
+    __table_args__ = (
+        Index("ix_flights_airline_id", "airline_id"),
+        Index("ix_flights_dest_id", "dest_id"),
+        # Route lookups; its first column also indexes the origin_id key
+        Index("ix_flights_route", "origin_id", "dest_id", "fl_date"),
+        # Partial and covering: the training query reads it, not the table
+        Index(
+            "ix_flights_training",
+            *TRAINING_INDEX_COLUMNS,
+            sqlite_where=text(TRAINING_ROWS),
+            postgresql_where=text(TRAINING_ROWS),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
 
@@ -1,9 +1,12 @@
+import os
 from collections import Counter
+from contextlib import nullcontext
+from typing import Iterator
 
 import pandas as pd
 from loguru import logger
 from sklearn.model_selection import train_test_split
-from sqlalchemy import select
+from sqlalchemy import select, text
 from sqlalchemy.orm import Session
 
 from database.base import SessionLocal, engine
@@ -52,8 +55,42 @@ def get_airline_code_to_id() -> dict:
         }
 
 
-def load_training_data() -> pd.DataFrame:
-    """Load a stratified 20% sample of training data from flights, airlines, and airports."""
+# Share of the training query kept by load_training_data, and its seed
+TRAINING_SAMPLE_FRACTION = 0.1
+TRAINING_SAMPLE_RANDOM_STATE = 42
+
+# Reads the covering index ix_flights_training instead of the table. The
+# unary + keeps SQLite from driving the joins from airports through
+# ix_flights_route instead (which it prefers once ANALYZE has run, and is
+# slower than one pass over the index)
+TRAINING_QUERY = """
+SELECT
+    flights.month,
+    flights.day_of_week,
+    flights.crs_dep_time,
+    flights.crs_arr_time,
+    flights.crs_elapsed_time,
+    flights.distance,
+    airlines.unique_carrier,
+    airports_origin.code AS origin,
+    airports_dest.code AS dest,
+    flights.dep_time_blk,
+    flights.arr_del15
+FROM flights
+JOIN airlines ON airlines.id = +flights.airline_id
+JOIN airports AS airports_origin ON airports_origin.id = +flights.origin_id
+JOIN airports AS airports_dest ON airports_dest.id = +flights.dest_id
+WHERE arr_del15 IS NOT NULL
+    AND cancelled = 0
+"""
+
+
+def load_training_data(profiler=None) -> pd.DataFrame:
+    """
+    Load a stratified 10% sample of training data from flights, airlines, and airports.
+    A profiler (ml.training.profiling.StageProfiler) times each step.
+    """
+    stage = profiler.stage if profiler is not None else nullcontext
     logger.info("Loading training data from database...")
 
     # Query with id to improve performance
@@ -76,47 +113,192 @@ def load_training_data() -> pd.DataFrame:
     #     AND cancelled = 0
     # """
 
-    query = """
-    SELECT
-        flights.month,
-        flights.day_of_week,
-        flights.crs_dep_time,
-        flights.crs_arr_time,
-        flights.crs_elapsed_time,
-        flights.distance,
-        airlines.unique_carrier,
-        airports_origin.code AS origin,
-        airports_dest.code AS dest,
-        flights.dep_time_blk,
-        flights.arr_del15
-    FROM flights
-    JOIN airlines ON airlines.id = flights.airline_id
-    JOIN airports AS airports_origin ON airports_origin.id = flights.origin_id
-    JOIN airports AS airports_dest ON airports_dest.id = flights.dest_id
-    WHERE arr_del15 IS NOT NULL
-        AND cancelled = 0
-    """
-
-    df = pd.read_sql(query, engine)
+    with stage("sql_load"):
+        df = pd.read_sql(TRAINING_QUERY, engine)
 
     if df.empty:
         logger.warning("No training data found.")
         return df
 
-    df = df.dropna()
+    with stage("dropna"):
+        df = df.dropna()
     logger.success(f"{len(df)} total rows loaded before sampling.")
 
     label_counts = Counter(df["arr_del15"])
     min_class_ratio = min(count / len(df) for count in label_counts.values())
 
     # Stratified sampling if possible and keep only 10% of data
+    stratify = df["arr_del15"]
     if min_class_ratio < 0.05:
         logger.warning("Minority class is under 5%. Disabling stratified sampling.")
-        _, df_sampled = train_test_split(df, test_size=0.1, random_state=42)
-    else:
+        stratify = None
+    with stage("sampling"):
         _, df_sampled = train_test_split(
-            df, test_size=0.1, stratify=df["arr_del15"], random_state=42
+            df,
+            test_size=TRAINING_SAMPLE_FRACTION,
+            stratify=stratify,
+            random_state=TRAINING_SAMPLE_RANDOM_STATE,
         )
 
     logger.success(f"{len(df_sampled)} rows returned after 10% stratified sampling.")
     return df_sampled.reset_index(drop=True)
+
+
+def training_data_signature() -> dict:
+    """
+    Identity of the data load_training_data() would return: the query, the
+    sampling parameters and the database file's size and modification time.
+    """
+    signature = {
+        "query": TRAINING_QUERY,
+        "sample_fraction": TRAINING_SAMPLE_FRACTION,
+        "sample_random_state": TRAINING_SAMPLE_RANDOM_STATE,
+        "database": engine.url.render_as_string(hide_password=True),
+    }
+    path = engine.url.database
+    if engine.url.get_backend_name() == "sqlite" and path:
+        # Uncheckpointed writes live in the -wal file, not the database file
+        for suffix in ("", "-wal"):
+            if os.path.exists(path + suffix):
+                stat = os.stat(path + suffix)
+                signature[f"file{suffix}"] = [stat.st_size, stat.st_mtime_ns]
+    return signature
+
+
+# The training query in a fixed pseudo-random order of the flight ids
+# (multiplicative hashing), whatever order the table or the index keeps rows
+# in. SQLite sorts it out of core (temporary files); on 1M rows it reads
+# about 15% slower than TRAINING_QUERY
+SHUFFLED_TRAINING_QUERY = (
+    TRAINING_QUERY + "ORDER BY (flights.id * 2654435761) % 4294967296\n"
+)
+
+
+def iter_training_chunks(
+    chunksize: int = 100_000, shuffle: bool = True
+) -> Iterator[pd.DataFrame]:
+    """
+    Every row of the training query, without sampling, as DataFrames of at
+    most `chunksize` rows. Rows are fetched from the cursor as they are
+    consumed, so memory does not depend on the size of the table.
+
+    With `shuffle`, rows come in the same pseudo-random order on every call,
+    so chunks mix classes, carriers and dates (incremental learners need
+    that); without it, in whatever order SQLite reads them.
+    """
+    query = SHUFFLED_TRAINING_QUERY if shuffle else TRAINING_QUERY
+    with engine.connect() as connection:
+        for chunk in pd.read_sql(text(query), connection, chunksize=chunksize):
+            chunk = chunk.dropna()
+            if not chunk.empty:
+                yield chunk.reset_index(drop=True)
+
+
+SCORING_QUERY = """
+SELECT
+    flights.id AS flight_id,
+    flights.month,
+    flights.day_of_week,
+    flights.crs_dep_time,
+    flights.crs_arr_time,
+    flights.crs_elapsed_time,
+    flights.distance,
+    airlines.unique_carrier,
+    airports_origin.code AS origin,
+    airports_dest.code AS dest,
+    flights.dep_time_blk
+FROM flights
+JOIN airlines ON airlines.id = flights.airline_id
+JOIN airports AS airports_origin ON airports_origin.id = flights.origin_id
+JOIN airports AS airports_dest ON airports_dest.id = flights.dest_id
+WHERE flights.id >= :start_id AND flights.id < :stop_id
+ORDER BY flights.id
+"""
+
+
+def get_flight_id_range() -> tuple:
+    """Smallest and largest flight id, or (None, None) for an empty table."""
+    with engine.connect() as connection:
+        return tuple(
+            connection.execute(text("SELECT MIN(id), MAX(id) FROM flights")).one()
+        )
+
+
+def load_scoring_chunk(start_id: int, stop_id: int) -> pd.DataFrame:
+    """Model features of the flights with start_id <= id < stop_id, by id."""
+    return pd.read_sql(
+        text(SCORING_QUERY),
+        engine,
+        params={"start_id": start_id, "stop_id": stop_id},
+    )
+
+
+# Full scan: unary + as in TRAINING_QUERY, to keep ix_flights_route out
+SAMPLE_QUERY = """
+SELECT
+    flights.month,
+    flights.day_of_week,
+    flights.crs_dep_time,
+    flights.crs_arr_time,
+    flights.crs_elapsed_time,
+    flights.distance,
+    airlines.unique_carrier,
+    airports_origin.code AS origin,
+    airports_dest.code AS dest,
+    flights.dep_time_blk
+FROM flights
+JOIN airlines ON airlines.id = +flights.airline_id
+JOIN airports AS airports_origin ON airports_origin.id = +flights.origin_id
+JOIN airports AS airports_dest ON airports_dest.id = +flights.dest_id
+ORDER BY RANDOM()
+LIMIT :n
+"""
+
+
+def sample_scoring_features(n: int = 5000) -> pd.DataFrame:
+    """Model features of `n` flights drawn uniformly at random."""
+    return pd.read_sql(text(SAMPLE_QUERY), engine, params={"n": n})
+
+
+# Full scan: unary + as in TRAINING_QUERY, to keep ix_flights_route out
+FREQUENT_COMBINATIONS_QUERY = """
+SELECT
+    flights.month,
+    flights.day_of_week,
+    flights.crs_dep_time,
+    flights.crs_arr_time,
+    flights.crs_elapsed_time,
+    flights.distance,
+    airlines.unique_carrier,
+    airports_origin.code AS origin,
+    airports_dest.code AS dest,
+    flights.dep_time_blk,
+    COUNT(*) AS n_flights
+FROM flights
+JOIN airlines ON airlines.id = +flights.airline_id
+JOIN airports AS airports_origin ON airports_origin.id = +flights.origin_id
+JOIN airports AS airports_dest ON airports_dest.id = +flights.dest_id
+GROUP BY
+    flights.month,
+    flights.day_of_week,
+    flights.crs_dep_time,
+    flights.crs_arr_time,
+    flights.crs_elapsed_time,
+    flights.distance,
+    airlines.unique_carrier,
+    airports_origin.code,
+    airports_dest.code,
+    flights.dep_time_blk
+ORDER BY n_flights DESC
+LIMIT :limit
+"""
+
+
+def load_frequent_combinations(limit: int = 5000) -> pd.DataFrame:
+    """
+    The `limit` most common full feature combinations in the flights history,
+    most frequent first, with their flight count in `n_flights`.
+    """
+    return pd.read_sql(
+        text(FREQUENT_COMBINATIONS_QUERY), engine, params={"limit": limit}
+    )
@@ -1,8 +1,20 @@
+import argparse
+import hashlib
+import json
+import multiprocessing as mp
 import os
+import resource
+import shutil
 import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
 
 import joblib
 import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
 import seaborn as sns
 from sklearn.metrics import (
     accuracy_score,
@@ -12,6 +24,7 @@ from sklearn.metrics import (
     precision_score,
     recall_score,
 )
+from threadpoolctl import threadpool_limits
 
 # ───────────────────────────────────────────────────────────────
 # Add project root to path
@@ -21,8 +34,10 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"
 # ───────────────────────────────────────────────────────────────
 # Custom Imports
 # ───────────────────────────────────────────────────────────────
-from database.services.flight_service import load_training_data
-from ml.training.preprocessing import preprocessing, split
+from database.services.flight_service import iter_training_chunks, load_training_data
+from ml.evaluation.metrics import MIN_SLICE_SUPPORT, SlicedMetrics, StreamingMetrics
+from ml.training.feature_cache import load_matrix, save_matrix
+from ml.training.preprocessing import split
 
 # ───────────────────────────────────────────────────────────────
 # Constants
@@ -32,50 +47,105 @@ MODELS_DIR = "ml/models_artifact"
 ASSETS_DIR = "assets"
 os.makedirs(ASSETS_DIR, exist_ok=True)
 
+NUMERICAL_COLS = [
+    "month",
+    "day_of_week",
+    "crs_dep_time",
+    "crs_arr_time",
+    "crs_elapsed_time",
+    "distance",
+]
+CATEGORICAL_COLS = ["unique_carrier", "origin", "dest", "dep_time_blk"]
+TARGET_COL = "arr_del15"
+CHUNKSIZE = 200_000
+
+
+# ───────────────────────────────────────────────────────────────
+# Shared Helpers
+# ───────────────────────────────────────────────────────────────
+def load_artifacts(model_type: str = MODEL_TYPE, models_dir: str = MODELS_DIR):
+    """The saved (model, preprocessor) pair of a model type."""
+    model_path = os.path.join(models_dir, f"{model_type}_model.pkl")
+    preproc_path = os.path.join(models_dir, f"{model_type}_preprocessor.pkl")
+
+    if not os.path.exists(model_path) or not os.path.exists(preproc_path):
+        raise FileNotFoundError("❌ Model or preprocessor file not found.")
+
+    return joblib.load(model_path), joblib.load(preproc_path)
+
+
+def save_confusion_matrix(cm, title: str, filename: str) -> None:
+    plt.figure(figsize=(6, 4))
+    sns.heatmap(cm, annot=True, fmt="d", cmap="Blues")
+    plt.xlabel("Predicted")
+    plt.ylabel("Actual")
+    plt.title(title)
+    plt.tight_layout()
+    plt.savefig(os.path.join(ASSETS_DIR, filename))
+    plt.close()
+
+
+def save_slice_table(
+    sliced: SlicedMetrics, filename: str, min_support: int = MIN_SLICE_SUPPORT
+) -> pd.DataFrame:
+    """Write the per-slice metrics as CSV in 'assets/' and print the worst ones."""
+    table = sliced.result(min_support)
+    table.to_csv(os.path.join(ASSETS_DIR, filename), index=False, float_format="%.4f")
+
+    print(f"\n🧩 Worst slices (at least {min_support} rows):")
+    worst = table.sort_values("f1_score").head(10)
+    columns = ["dimension", "slice", "rows", "delay_rate", "f1_score"]
+    print(worst[columns].to_string(index=False))
+    return table
+
+
+def worst_slice_metrics(table: pd.DataFrame) -> dict:
+    """Lowest slice F1 of every dimension, as flat metrics."""
+    return {
+        f"slice_min_f1_{dimension}": float(group["f1_score"].min())
+        for dimension, group in table.groupby("dimension", sort=False)
+    }
+
+
+def log_to_mlflow(run_name: str, metrics: dict, artifacts: List[str]) -> None:
+    """Record an evaluation as an MLflow run (mlflow is only needed here)."""
+    import mlflow
+
+    mlflow.set_experiment("flight_delay_models")
+    with mlflow.start_run(run_name=run_name):
+        for name, value in metrics.items():
+            mlflow.log_metric(name, value)
+        for path in artifacts:
+            mlflow.log_artifact(path, artifact_path="evaluation")
+    print("✅ Evaluation logged to MLflow.")
+
 
 # ───────────────────────────────────────────────────────────────
 # Evaluation Function
 # ───────────────────────────────────────────────────────────────
-def evaluate_model():
+def evaluate_model(
+    model_type: str = MODEL_TYPE,
+    min_support: int = MIN_SLICE_SUPPORT,
+    log_mlflow: bool = False,
+):
     """
     Load model and preprocessor, run evaluation on test data,
-    print metrics and save confusion matrix plot.
+    print metrics and save confusion matrix plot and per-slice metrics.
     """
     print("🔍 Loading data...")
     df = load_training_data()
 
-    # Define features and target
-    numerical_cols = [
-        "month",
-        "day_of_week",
-        "crs_dep_time",
-        "crs_arr_time",
-        "crs_elapsed_time",
-        "distance",
-    ]
-    categorical_cols = [
-        "unique_carrier",
-        "origin",
-        "dest",
-        "dep_time_blk",
-    ]
-    target_col = "arr_del15"
-    y_raw = df[target_col]
+    y_raw = df[TARGET_COL]
 
     # Load preprocessor and model
     print("📦 Loading model and preprocessor...")
-    model_path = os.path.join(MODELS_DIR, f"{MODEL_TYPE}_model.pkl")
-    preproc_path = os.path.join(MODELS_DIR, f"{MODEL_TYPE}_preprocessor.pkl")
+    model, preprocessor = load_artifacts(model_type)
 
-    if not os.path.exists(model_path) or not os.path.exists(preproc_path):
-        raise FileNotFoundError("❌ Model or preprocessor file not found.")
-
-    model = joblib.load(model_path)
-    preprocessor = joblib.load(preproc_path)
-
-    # Preprocess data
-    X_processed, y, _ = preprocessing(df, numerical_cols, categorical_cols, y_raw)
-    _, X_test, _, y_test = split(X_processed, y)
+    # Preprocess data with the fitted preprocessor the model was trained with
+    X_processed = preprocessor.transform(df[NUMERICAL_COLS + CATEGORICAL_COLS])
+    # Same split as training; row positions keep the slicing columns aligned
+    _, test_rows, _, y_test = split(np.arange(len(df)), y_raw)
+    X_test = X_processed[test_rows]
 
     # Predictions
     print("🔎 Predicting...")
@@ -100,20 +170,384 @@ def evaluate_model():
     # Plot confusion matrix
     print("📈 Saving confusion matrix plot...")
     cm = confusion_matrix(y_test, y_pred)
-    plt.figure(figsize=(6, 4))
-    sns.heatmap(cm, annot=True, fmt="d", cmap="Blues")
-    plt.xlabel("Predicted")
-    plt.ylabel("Actual")
-    plt.title(f"{MODEL_TYPE} - Confusion Matrix")
-    plt.tight_layout()
-    plt.savefig(os.path.join(ASSETS_DIR, f"{MODEL_TYPE}_confusion_matrix.png"))
-    plt.close()
+    save_confusion_matrix(
+        cm, f"{model_type} - Confusion Matrix", f"{model_type}_confusion_matrix.png"
+    )
+
+    # Per-slice metrics
+    sliced = SlicedMetrics()
+    sliced.update(df.iloc[test_rows], y_test, y_pred)
+    table = save_slice_table(sliced, f"{model_type}_slice_metrics.csv", min_support)
 
     print("✅ Evaluation complete and saved in 'assets/'.")
+    if log_mlflow:
+        log_to_mlflow(
+            f"{model_type}_evaluation",
+            {**metrics, **worst_slice_metrics(table)},
+            [
+                os.path.join(ASSETS_DIR, f"{model_type}_confusion_matrix.png"),
+                os.path.join(ASSETS_DIR, f"{model_type}_slice_metrics.csv"),
+            ],
+        )
+
+
+# ───────────────────────────────────────────────────────────────
+# Streaming Evaluation over the Full Table
+# ───────────────────────────────────────────────────────────────
+def stream_metrics(
+    model,
+    preprocessor,
+    chunks,
+    accumulator: Optional[StreamingMetrics] = None,
+    sliced: Optional[SlicedMetrics] = None,
+) -> dict:
+    """
+    Score DataFrame chunks with the fitted preprocessor and model, adding
+    them to `accumulator` (and to `sliced`, per slice). Only one chunk is
+    held at a time. Returns timing and throughput; the metrics themselves
+    are accumulator.result().
+    """
+    accumulator = accumulator if accumulator is not None else StreamingMetrics()
+    start = time.perf_counter()
+    scoring_seconds = 0.0
+    n_chunks = 0
+    for chunk in chunks:
+        scoring_start = time.perf_counter()
+        X = preprocessor.transform(chunk[NUMERICAL_COLS + CATEGORICAL_COLS])
+        proba = model.predict_proba(X)[:, 1]
+        scoring_seconds += time.perf_counter() - scoring_start
+        y_true = chunk[TARGET_COL].to_numpy()
+        accumulator.update(y_true, proba)
+        if sliced is not None:
+            sliced.update(chunk, y_true, proba > accumulator.threshold)
+        n_chunks += 1
+
+    seconds = time.perf_counter() - start
+    rows = accumulator.n_rows
+    return {
+        "chunks": n_chunks,
+        "seconds": seconds,
+        "scoring_seconds": scoring_seconds,
+        "rows_per_second": rows / seconds if seconds else 0.0,
+        "scoring_rows_per_second": rows / scoring_seconds if scoring_seconds else 0.0,
+    }
+
+
+def evaluate_model_streaming(
+    model_type: str = MODEL_TYPE,
+    chunksize: int = CHUNKSIZE,
+    models_dir: str = MODELS_DIR,
+    min_support: int = MIN_SLICE_SUPPORT,
+    log_mlflow: bool = False,
+) -> dict:
+    """
+    Evaluate the saved model on every labelled, non-cancelled flight (the
+    training query without sampling, so rows the model was trained on are
+    included), `chunksize` rows at a time. Memory stays bounded by the
+    chunk size whatever the table size. Prints and returns the metrics,
+    saves them as JSON, the confusion matrix plot and the per-slice
+    metrics in 'assets/'.
+    """
+    print("📦 Loading model and preprocessor...")
+    model, preprocessor = load_artifacts(model_type, models_dir)
+
+    print(f"🔎 Streaming the flights table in chunks of {chunksize} rows...")
+    accumulator, sliced = StreamingMetrics(), SlicedMetrics()
+    timing = stream_metrics(
+        model,
+        preprocessor,
+        # Metrics do not depend on the row order: skip the sort
+        iter_training_chunks(chunksize, shuffle=False),
+        accumulator,
+        sliced,
+    )
+    metrics = {
+        **accumulator.result(),
+        **timing,
+        # Linux reports KiB
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+    print("📊 Streaming evaluation:")
+    for k, v in metrics.items():
+        print(f"{k.capitalize():<24}: {v:.4f}")
+
+    metrics_path = os.path.join(ASSETS_DIR, f"{model_type}_streaming_metrics.json")
+    with open(metrics_path, "w") as f:
+        json.dump(metrics, f, indent=2)
+    save_confusion_matrix(
+        accumulator.confusion,
+        f"{model_type} - Confusion Matrix (full table)",
+        f"{model_type}_streaming_confusion_matrix.png",
+    )
+    table = save_slice_table(
+        sliced, f"{model_type}_streaming_slice_metrics.csv", min_support
+    )
+
+    print("✅ Streaming evaluation complete and saved in 'assets/'.")
+    if log_mlflow:
+        log_to_mlflow(
+            f"{model_type}_streaming_evaluation",
+            {**metrics, **worst_slice_metrics(table)},
+            [
+                metrics_path,
+                *(
+                    os.path.join(ASSETS_DIR, f"{model_type}_streaming_{name}")
+                    for name in ("confusion_matrix.png", "slice_metrics.csv")
+                ),
+            ],
+        )
+    return metrics
+
+
+# ───────────────────────────────────────────────────────────────
+# Parallel Evaluation of Every Artifact
+# ───────────────────────────────────────────────────────────────
+def find_model_types(models_dir: str = MODELS_DIR) -> List[str]:
+    """Model types with both a saved model and a saved preprocessor."""
+    return sorted(
+        name[: -len("_model.pkl")]
+        for name in os.listdir(models_dir)
+        if name.endswith("_model.pkl")
+        and os.path.exists(
+            os.path.join(models_dir, name.replace("_model.pkl", "_preprocessor.pkl"))
+        )
+    )
+
+
+def _file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _score_artifact(
+    model_path: str, matrix_dir: str, matrix: str, spec: Dict, threads: int
+) -> dict:
+    """Score one model on a shared, memory-mapped feature matrix."""
+    start = time.perf_counter()
+    with threadpool_limits(threads):
+        model = joblib.load(model_path)
+        X = load_matrix(matrix_dir, matrix, spec)
+        proba = model.predict_proba(X)[:, 1]
+    seconds = time.perf_counter() - start
+
+    accumulator = StreamingMetrics()
+    y_true = np.load(os.path.join(matrix_dir, "y.npy"), mmap_mode="r")
+    accumulator.update(y_true, proba)
+    return {
+        "metrics": accumulator.result(),
+        "confusion": accumulator.confusion,
+        "y_pred": (proba > accumulator.threshold).astype(np.int8),
+        "seconds": seconds,
+    }
+
+
+def save_confusion_matrices(confusions: Dict[str, np.ndarray], filename: str) -> None:
+    """All models' confusion matrices side by side in one figure."""
+    fig, axes = plt.subplots(
+        1, len(confusions), figsize=(5 * len(confusions), 4), squeeze=False
+    )
+    for ax, (model_type, cm) in zip(axes[0], confusions.items()):
+        sns.heatmap(cm, annot=True, fmt="d", cmap="Blues", ax=ax, cbar=False)
+        ax.set_xlabel("Predicted")
+        ax.set_ylabel("Actual")
+        ax.set_title(model_type)
+    fig.tight_layout()
+    fig.savefig(os.path.join(ASSETS_DIR, filename))
+    plt.close(fig)
+
+
+def evaluate_all(
+    model_types: Optional[List[str]] = None,
+    models_dir: str = MODELS_DIR,
+    workers: int = os.cpu_count() or 1,
+    min_support: int = MIN_SLICE_SUPPORT,
+    log_mlflow: bool = False,
+) -> dict:
+    """
+    Compare every saved model on the same test split:
+
+    1. the evaluation data is loaded and split once;
+    2. each distinct preprocessor (same file content) transforms it once,
+       into a matrix saved to a temporary directory;
+    3. the models are scored in `workers` spawned processes, each mapping
+       its matrix read-only instead of receiving a copy (workers=1 scores
+       them one after another in this process).
+
+    Writes assets/model_comparison.csv (metrics, worst slice F1 per
+    dimension, scoring time per model), assets/model_comparison.json
+    (the same plus wall-clock timings) and one figure with every confusion
+    matrix. The scoring wall-clock is reported next to the sum of the
+    models' scoring times, i.e. what running them sequentially costs.
+    """
+    model_types = model_types or find_model_types(models_dir)
+    if not model_types:
+        raise FileNotFoundError(f"❌ No model artifacts found in {models_dir}.")
+    start = time.perf_counter()
+
+    print("🔍 Loading data...")
+    df = load_training_data()
+    # Same split as training; row positions keep the slicing columns aligned
+    _, test_rows, _, y_test = split(np.arange(len(df)), df[TARGET_COL])
+    df_test = df.iloc[test_rows]
+    data_seconds = time.perf_counter() - start
+
+    workdir = tempfile.mkdtemp(prefix="evaluation-")
+    try:
+        np.save(os.path.join(workdir, "y.npy"), np.asarray(y_test).astype(np.int64))
+
+        # One feature matrix per distinct preprocessor
+        print("🧮 Building feature matrices...")
+        features_start = time.perf_counter()
+        matrices: Dict[str, Dict] = {}
+        jobs = []
+        for model_type in model_types:
+            path = os.path.join(models_dir, f"{model_type}_preprocessor.pkl")
+            digest = _file_digest(path)[:16]
+            if digest not in matrices:
+                preprocessor = joblib.load(path)
+                X = preprocessor.transform(df_test[NUMERICAL_COLS + CATEGORICAL_COLS])
+                matrices[digest] = save_matrix(workdir, digest, X)
+                del X
+            jobs.append(
+                (
+                    model_type,
+                    os.path.join(models_dir, f"{model_type}_model.pkl"),
+                    digest,
+                )
+            )
+        features_seconds = time.perf_counter() - features_start
+        print(f"   {len(matrices)} matrices for {len(model_types)} models")
+
+        print(f"🔎 Scoring {len(jobs)} models with {workers} worker(s)...")
+        scoring_start = time.perf_counter()
+        threads = max(1, (os.cpu_count() or 1) // max(1, min(workers, len(jobs))))
+        if workers <= 1:
+            scores = [
+                _score_artifact(path, workdir, digest, matrices[digest], threads)
+                for _, path, digest in jobs
+            ]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(jobs)), mp_context=mp.get_context("spawn")
+            ) as pool:
+                futures = [
+                    pool.submit(
+                        _score_artifact,
+                        path,
+                        workdir,
+                        digest,
+                        matrices[digest],
+                        threads,
+                    )
+                    for _, path, digest in jobs
+                ]
+                scores = [future.result() for future in futures]
+        scoring_seconds = time.perf_counter() - scoring_start
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    # Comparison report
+    rows = []
+    for (model_type, _, digest), score in zip(jobs, scores):
+        sliced = SlicedMetrics()
+        sliced.update(df_test, y_test, score["y_pred"])
+        rows.append(
+            {
+                "model": model_type,
+                "preprocessor": digest,
+                **score["metrics"],
+                "scoring_seconds": score["seconds"],
+                "rows_per_second": score["metrics"]["rows"] / score["seconds"],
+                **worst_slice_metrics(sliced.result(min_support)),
+            }
+        )
+    report = pd.DataFrame(rows)
+    timing = {
+        "workers": workers,
+        "models": len(jobs),
+        "feature_matrices": len(matrices),
+        "data_seconds": data_seconds,
+        "features_seconds": features_seconds,
+        "scoring_wall_seconds": scoring_seconds,
+        "scoring_sequential_seconds": float(report["scoring_seconds"].sum()),
+        "total_seconds": time.perf_counter() - start,
+    }
+
+    report_path = os.path.join(ASSETS_DIR, "model_comparison.csv")
+    report.to_csv(report_path, index=False, float_format="%.4f")
+    summary_path = os.path.join(ASSETS_DIR, "model_comparison.json")
+    with open(summary_path, "w") as f:
+        json.dump({"timing": timing, "models": rows}, f, indent=2, default=str)
+    plot_file = "model_comparison_confusion_matrices.png"
+    confusions = {job[0]: score["confusion"] for job, score in zip(jobs, scores)}
+    save_confusion_matrices(confusions, plot_file)
+
+    print("\n📊 Model comparison:")
+    columns = ["model", "accuracy", "precision", "recall", "f1_score", "roc_auc"]
+    print(report[columns + ["log_loss", "scoring_seconds"]].to_string(index=False))
+    print(
+        f"\n⏱️ Scoring: {scoring_seconds:.2f}s wall-clock with {workers} worker(s) "
+        f"vs {timing['scoring_sequential_seconds']:.2f}s one model after another; "
+        f"{timing['total_seconds']:.2f}s in total"
+    )
+    print("✅ Comparison saved in 'assets/'.")
+
+    if log_mlflow:
+        log_to_mlflow(
+            "model_comparison",
+            {
+                **{f"timing_{name}": value for name, value in timing.items()},
+                **{
+                    f"{row['model']}_{metric}": row[metric]
+                    for row in rows
+                    for metric in ("f1_score", "roc_auc", "log_loss")
+                },
+            },
+            [report_path, summary_path, os.path.join(ASSETS_DIR, plot_file)],
+        )
+    return {"timing": timing, "report": report}
 
 
 # ───────────────────────────────────────────────────────────────
 # Entry Point
 # ───────────────────────────────────────────────────────────────
 if __name__ == "__main__":
-    evaluate_model()
+    parser = argparse.ArgumentParser(description="Evaluate a saved model")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Evaluate on the full flights table, chunk by chunk",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Compare every saved model, scored in parallel worker processes",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--model", default=MODEL_TYPE)
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE)
+    parser.add_argument(
+        "--min-support",
+        type=int,
+        default=MIN_SLICE_SUPPORT,
+        help="Smallest slice (in rows) reported in the per-slice table",
+    )
+    parser.add_argument("--mlflow", action="store_true", help="Log to MLflow")
+    args = parser.parse_args()
+
+    if args.all:
+        evaluate_all(
+            workers=args.workers,
+            min_support=args.min_support,
+            log_mlflow=args.mlflow,
+        )
+    elif args.stream:
+        evaluate_model_streaming(
+            args.model,
+            args.chunksize,
+            min_support=args.min_support,
+            log_mlflow=args.mlflow,
+        )
+    else:
+        evaluate_model(args.model, args.min_support, args.mlflow)
@@ -0,0 +1,214 @@
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+# ───────────────────────────────────────────────────────────────
+# Constants
+# ───────────────────────────────────────────────────────────────
+# Probability bins of the ROC-AUC histograms: the AUC is exact up to ties
+# inside a bin (counted as half right), i.e. within about 1 / AUC_BINS
+AUC_BINS = 10_000
+# Probabilities are clipped away from 0 and 1 before taking the log (the
+# float64 machine epsilon, as sklearn.metrics.log_loss does)
+LOG_LOSS_EPS = np.finfo(np.float64).eps
+
+# Slicing dimensions: name -> the columns whose combined value is the slice
+SLICE_DIMENSIONS: Dict[str, Tuple[str, ...]] = {
+    "unique_carrier": ("unique_carrier",),
+    "origin": ("origin",),
+    "dest": ("dest",),
+    "route": ("origin", "dest"),
+    "dep_time_blk": ("dep_time_blk",),
+    "month": ("month",),
+}
+# Slices with fewer rows are left out of the table: their metrics are noise
+MIN_SLICE_SUPPORT = 100
+
+
+# ───────────────────────────────────────────────────────────────
+# Incremental Binary Classification Metrics
+# ───────────────────────────────────────────────────────────────
+class StreamingMetrics:
+    """
+    Binary classification metrics accumulated batch by batch in constant
+    memory: a confusion matrix, one histogram of predicted probabilities per
+    class (for ROC-AUC) and the summed log-loss. Accumulators can be merged,
+    so batches may be scored in separate processes.
+    """
+
+    def __init__(self, threshold: float = 0.5, bins: int = AUC_BINS):
+        self.threshold = threshold
+        self.bins = bins
+        self.confusion = np.zeros((2, 2), dtype=np.int64)
+        self.histograms = np.zeros((2, bins), dtype=np.int64)
+        self.log_loss_sum = 0.0
+
+    @property
+    def n_rows(self) -> int:
+        return int(self.confusion.sum())
+
+    def update(self, y_true, proba) -> None:
+        """Add a batch of labels (0/1) and positive-class probabilities."""
+        y_true = np.asarray(y_true).astype(np.int64, copy=False)
+        proba = np.asarray(proba, dtype=np.float64)
+        # Same decision as model.predict: the positive class must win outright
+        y_pred = (proba > self.threshold).astype(np.int64)
+
+        self.confusion += np.bincount(2 * y_true + y_pred, minlength=4).reshape(2, 2)
+        bin_index = np.minimum((proba * self.bins).astype(np.int64), self.bins - 1)
+        self.histograms += np.bincount(
+            y_true * self.bins + bin_index, minlength=2 * self.bins
+        ).reshape(2, self.bins)
+
+        clipped = np.clip(proba, LOG_LOSS_EPS, 1 - LOG_LOSS_EPS)
+        self.log_loss_sum -= float(
+            np.sum(np.where(y_true == 1, np.log(clipped), np.log1p(-clipped)))
+        )
+
+    def merge(self, other: "StreamingMetrics") -> "StreamingMetrics":
+        if (other.threshold, other.bins) != (self.threshold, self.bins):
+            raise ValueError("Cannot merge metrics with different thresholds or bins")
+        self.confusion += other.confusion
+        self.histograms += other.histograms
+        self.log_loss_sum += other.log_loss_sum
+        return self
+
+    def roc_auc(self) -> float:
+        """Probability that a random positive outscores a random negative."""
+        negatives, positives = self.histograms
+        n_neg, n_pos = negatives.sum(), positives.sum()
+        if not n_neg or not n_pos:
+            return float("nan")
+        negatives_below = np.cumsum(negatives) - negatives
+        wins = positives * (negatives_below + 0.5 * negatives)
+        return float(wins.sum() / (n_neg * n_pos))
+
+    def result(self) -> Dict[str, float]:
+        (tn, fp), (fn, tp) = self.confusion
+        n = self.n_rows
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+        return {
+            "rows": n,
+            "accuracy": float((tp + tn) / n) if n else 0.0,
+            "precision": float(precision),
+            "recall": float(recall),
+            "f1_score": (
+                float(2 * precision * recall / (precision + recall))
+                if precision + recall
+                else 0.0
+            ),
+            "roc_auc": self.roc_auc(),
+            "log_loss": self.log_loss_sum / n if n else float("nan"),
+        }
+
+
+# ───────────────────────────────────────────────────────────────
+# Sliced Confusion Counts
+# ───────────────────────────────────────────────────────────────
+class SlicedMetrics:
+    """
+    Confusion counts for every value of several slicing dimensions (carrier,
+    route, month...), accumulated batch by batch. Each batch costs one
+    factorize + bincount per dimension, so the work grows with the number
+    of rows, not rows x slices. Accumulators can be merged.
+    """
+
+    def __init__(self, dimensions: Dict[str, Tuple[str, ...]] = SLICE_DIMENSIONS):
+        self.dimensions = dimensions
+        # Per dimension: slice value -> row of its [tn, fp, fn, tp] counts
+        self._index: Dict[str, Dict] = {name: {} for name in dimensions}
+        self._counts = {name: np.zeros((0, 4), dtype=np.int64) for name in dimensions}
+
+    @staticmethod
+    def _factorize(df: pd.DataFrame, columns: Tuple[str, ...]):
+        """Slice code of every row (array) and the value of every code (list)."""
+        if len(columns) == 1:
+            codes, uniques = pd.factorize(df[columns[0]], use_na_sentinel=False)
+            return codes, list(uniques)
+
+        # Several columns: combine their codes into one integer key
+        key = np.zeros(len(df), dtype=np.int64)
+        parts = []
+        for column in columns:
+            codes, uniques = pd.factorize(df[column], use_na_sentinel=False)
+            key = key * len(uniques) + codes
+            parts.append(uniques)
+        codes, keys = pd.factorize(key)
+        # Decode the keys back into "value-value" labels, last column first
+        labels = None
+        for uniques in reversed(parts):
+            keys, positions = np.divmod(keys, len(uniques))
+            values = uniques.take(positions).astype(str)
+            labels = values if labels is None else values + "-" + labels
+        return codes, list(labels)
+
+    def update(self, df: pd.DataFrame, y_true, y_pred) -> None:
+        """Add a batch: the rows' slicing columns, labels and predictions (0/1)."""
+        # Confusion cell of every row: tn=0, fp=1, fn=2, tp=3
+        y_true = np.asarray(y_true).astype(np.int64)
+        cell = 2 * y_true + np.asarray(y_pred).astype(np.int64)
+        for name, columns in self.dimensions.items():
+            codes, labels = self._factorize(df, columns)
+            counts = np.bincount(4 * codes + cell, minlength=4 * len(labels))
+            self._add(name, labels, counts.reshape(-1, 4))
+
+    def _add(self, name: str, labels, counts: np.ndarray) -> None:
+        index = self._index[name]
+        rows = np.array([index.setdefault(label, len(index)) for label in labels])
+        if len(index) > len(self._counts[name]):
+            grown = np.zeros((len(index), 4), dtype=np.int64)
+            grown[: len(self._counts[name])] = self._counts[name]
+            self._counts[name] = grown
+        if len(rows):
+            self._counts[name][rows] += counts
+
+    def merge(self, other: "SlicedMetrics") -> "SlicedMetrics":
+        for name in self.dimensions:
+            labels = list(other._index[name])
+            self._add(name, labels, other._counts[name][: len(labels)])
+        return self
+
+    def result(self, min_support: int = MIN_SLICE_SUPPORT) -> pd.DataFrame:
+        """
+        One row per slice with at least `min_support` rows: support, observed
+        and predicted delay rates, accuracy, precision, recall, F1 and the
+        confusion counts. Worst F1 first within each dimension.
+        """
+        tables = []
+        for name in self.dimensions:
+            counts = self._counts[name]
+            tn, fp, fn, tp = counts.T
+            rows = counts.sum(axis=1)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                precision = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+                recall = np.where(tp + fn > 0, tp / (tp + fn), 0.0)
+                f1 = np.where(
+                    precision + recall > 0,
+                    2 * precision * recall / (precision + recall),
+                    0.0,
+                )
+                table = pd.DataFrame(
+                    {
+                        "dimension": name,
+                        "slice": list(self._index[name]),
+                        "rows": rows,
+                        "delay_rate": (tp + fn) / rows,
+                        "predicted_delay_rate": (tp + fp) / rows,
+                        "accuracy": (tp + tn) / rows,
+                        "precision": precision,
+                        "recall": recall,
+                        "f1_score": f1,
+                        "tn": tn,
+                        "fp": fp,
+                        "fn": fn,
+                        "tp": tp,
+                    }
+                )
+            tables.append(
+                table[table["rows"] >= min_support].sort_values(
+                    ["f1_score", "rows"], ascending=[True, False]
+                )
+            )
+        return pd.concat(tables, ignore_index=True)
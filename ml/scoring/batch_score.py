@@ -0,0 +1,313 @@
+import argparse
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import joblib
+import numpy as np
+import pandas as pd
+from sqlalchemy import inspect
+from threadpoolctl import threadpool_limits
+
+# ───────────────────────────────────────────────────────────────
+# Setup project path
+# ───────────────────────────────────────────────────────────────
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+# ───────────────────────────────────────────────────────────────
+# Custom Imports
+# ───────────────────────────────────────────────────────────────
+from database.base import Base, engine
+from database.services.flight_service import get_flight_id_range, load_scoring_chunk
+
+# ───────────────────────────────────────────────────────────────
+# Constants and Configuration
+# ───────────────────────────────────────────────────────────────
+MODELS_DIR = "ml/models_artifact"
+OUTPUT_DIR = "dump/predictions"
+
+NUMERICAL_COLS = [
+    "month",
+    "day_of_week",
+    "crs_dep_time",
+    "crs_arr_time",
+    "crs_elapsed_time",
+    "distance",
+]
+CATEGORICAL_COLS = ["unique_carrier", "origin", "dest", "dep_time_blk"]
+FEATURE_COLS = NUMERICAL_COLS + CATEGORICAL_COLS
+# Columns every predictions table written by TableOutput has
+OUTPUT_TABLE_COLS = {"prediction", "delay_probability", "model_version", "chunk"}
+
+
+# ───────────────────────────────────────────────────────────────
+# Sources: (chunk index, payload) pairs in a stable order
+# ───────────────────────────────────────────────────────────────
+def db_chunks(chunk_size: int):
+    """
+    Flight id ranges of `chunk_size` ids; workers query their own range,
+    so only two integers per chunk cross the process boundary.
+    """
+    first_id, last_id = get_flight_id_range()
+    if first_id is None:
+        return
+    for index, start in enumerate(range(first_id, last_id + 1, chunk_size)):
+        yield index, (start, start + chunk_size)
+
+
+def file_chunks(path: str, chunk_size: int):
+    """DataFrames of `chunk_size` rows from a CSV or NDJSON file."""
+    if path.endswith((".ndjson", ".jsonl")):
+        reader = pd.read_json(path, lines=True, chunksize=chunk_size)
+    else:
+        reader = pd.read_csv(path, chunksize=chunk_size)
+
+    offset = 0
+    for index, df in enumerate(reader):
+        if "flight_id" not in df.columns:
+            df.insert(0, "row", np.arange(offset, offset + len(df)))
+        offset += len(df)
+        yield index, df
+
+
+# ───────────────────────────────────────────────────────────────
+# Worker: one model copy per process
+# ───────────────────────────────────────────────────────────────
+_model = None
+_preprocessor = None
+
+
+def _init_worker(model_path: str, preprocessor_path: str, threads: int):
+    global _model, _preprocessor
+    # Processes already use every core: keep OpenMP/BLAS from oversubscribing
+    threadpool_limits(threads)
+    _model = joblib.load(model_path)
+    _preprocessor = joblib.load(preprocessor_path)
+
+
+def _score_chunk(index: int, payload):
+    df = load_scoring_chunk(*payload) if isinstance(payload, tuple) else payload
+    key = "flight_id" if "flight_id" in df.columns else "row"
+    if df.empty:
+        return index, pd.DataFrame({key: [], "prediction": [], "delay_probability": []})
+
+    X = _preprocessor.transform(df.reindex(columns=FEATURE_COLS))
+    proba = _model.predict_proba(X)
+    return index, pd.DataFrame(
+        {
+            key: df[key].to_numpy(),
+            "prediction": _model.classes_[np.argmax(proba, axis=1)].astype(np.int64),
+            "delay_probability": proba[:, 1],
+        }
+    )
+
+
+# ───────────────────────────────────────────────────────────────
+# Outputs: writing a chunk twice replaces it, so retries are safe
+# ───────────────────────────────────────────────────────────────
+class ParquetOutput:
+    """One part-<chunk>.parquet file per chunk, renamed into place when complete."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.checkpoint_path = os.path.join(directory, "_checkpoint.json")
+
+    def reset(self) -> None:
+        for name in os.listdir(self.directory):
+            if name.startswith("part-"):
+                os.remove(os.path.join(self.directory, name))
+
+    def write(self, index: int, df: pd.DataFrame) -> None:
+        path = os.path.join(self.directory, f"part-{index:06d}.parquet")
+        df.to_parquet(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+
+
+class TableOutput:
+    """Rows appended to a predictions table, tagged with their chunk index."""
+
+    def __init__(self, table: str):
+        # The application's tables (registered by the models flight_service
+        # imports) are never an output: reset() would drop them
+        if table in Base.metadata.tables:
+            raise ValueError(f"❌ '{table}' is an application table, not an output")
+        self.table = table
+        self.quoted = engine.dialect.identifier_preparer.quote(table)
+        self.checkpoint_path = os.path.join("dump", f"{table}_checkpoint.json")
+
+    def reset(self) -> None:
+        """Drop the table, only if it is one this job wrote."""
+        with engine.begin() as connection:
+            if not connection.dialect.has_table(connection, self.table):
+                return
+            columns = {c["name"] for c in inspect(connection).get_columns(self.table)}
+            if not OUTPUT_TABLE_COLS <= columns:
+                raise ValueError(
+                    f"❌ Table '{self.table}' exists and is not a predictions "
+                    "table; refusing to drop it"
+                )
+            connection.exec_driver_sql(f"DROP TABLE {self.quoted}")
+
+    def write(self, index: int, df: pd.DataFrame) -> None:
+        with engine.begin() as connection:
+            if connection.dialect.has_table(connection, self.table):
+                connection.exec_driver_sql(
+                    f"DELETE FROM {self.quoted} WHERE chunk = ?", (index,)
+                )
+            df.assign(chunk=index).to_sql(
+                self.table, connection, if_exists="append", index=False
+            )
+
+
+# ───────────────────────────────────────────────────────────────
+# Checkpoint
+# ───────────────────────────────────────────────────────────────
+def model_version(*paths: str) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def load_checkpoint(path: str, run_key: dict, restart: bool) -> set:
+    """Chunks already completed by an identical earlier run."""
+    if restart or not os.path.exists(path):
+        return set()
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if checkpoint["run"] != run_key:
+        raise SystemExit(
+            f"❌ {path} belongs to a different run ({checkpoint['run']}); "
+            "use --restart to score from scratch"
+        )
+    return set(checkpoint["completed"])
+
+
+def save_checkpoint(path: str, run_key: dict, completed: set) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".tmp", "w") as f:
+        json.dump({"run": run_key, "completed": sorted(completed)}, f)
+    os.replace(path + ".tmp", path)
+
+
+# ───────────────────────────────────────────────────────────────
+# Scoring Function
+# ───────────────────────────────────────────────────────────────
+def score(
+    model_type: str = "lightgbm",
+    source: str = "db",
+    output=None,
+    chunk_size: int = 50_000,
+    workers: int = os.cpu_count() or 1,
+    threads_per_worker: int = 1,
+    restart: bool = False,
+    models_dir: str = MODELS_DIR,
+) -> dict:
+    """
+    Score every flight of `source` ("db" or a CSV/NDJSON path) in chunks on
+    a process pool and write the predictions to `output`. Completed chunks
+    are recorded in a checkpoint; rerunning the same command resumes.
+    """
+    model_path = os.path.join(models_dir, f"{model_type}_model.pkl")
+    preprocessor_path = os.path.join(models_dir, f"{model_type}_preprocessor.pkl")
+    output = output or ParquetOutput(os.path.join(OUTPUT_DIR, model_type))
+    run_key = {
+        "source": source,
+        "chunk_size": chunk_size,
+        "model_version": model_version(model_path, preprocessor_path),
+    }
+    completed = load_checkpoint(output.checkpoint_path, run_key, restart)
+    if completed:
+        print(f"↩️ Resuming: {len(completed)} chunks already scored")
+    else:
+        output.reset()
+
+    chunks = (
+        db_chunks(chunk_size) if source == "db" else file_chunks(source, chunk_size)
+    )
+    n_rows, start = 0, time.perf_counter()
+
+    def collect(futures):
+        nonlocal n_rows
+        for future in futures:
+            index, result = future.result()
+            output.write(index, result.assign(model_version=run_key["model_version"]))
+            completed.add(index)
+            save_checkpoint(output.checkpoint_path, run_key, completed)
+            n_rows += len(result)
+            elapsed = time.perf_counter() - start
+            print(
+                f"✅ chunk {index}: {len(result)} rows "
+                f"({n_rows / elapsed:,.0f} rows/s overall)"
+            )
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(model_path, preprocessor_path, threads_per_worker),
+    ) as pool:
+        pending = set()
+        for index, payload in chunks:
+            if index in completed:
+                continue
+            pending.add(pool.submit(_score_chunk, index, payload))
+            # Bound the chunks held in memory to two per worker
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        collect(pending)
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        "rows": n_rows,
+        "seconds": elapsed,
+        "rows_per_second": n_rows / elapsed if elapsed else 0.0,
+        "chunks": len(completed),
+    }
+    print(
+        f"🏁 {n_rows} rows scored in {elapsed:.1f}s "
+        f"({stats['rows_per_second']:,.0f} rows/s, {workers} workers)"
+    )
+    return stats
+
+
+# ───────────────────────────────────────────────────────────────
+# Entry Point
+# ───────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline bulk flight scoring")
+    parser.add_argument("--model", default="lightgbm")
+    parser.add_argument(
+        "--source", default="db", help='"db" or a path to a .csv/.ndjson file'
+    )
+    parser.add_argument(
+        "--output", help=f"Parquet directory (default: {OUTPUT_DIR}/<model>)"
+    )
+    parser.add_argument("--table", help="Write to this database table instead")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--threads-per-worker", type=int, default=1)
+    parser.add_argument("--restart", action="store_true")
+    args = parser.parse_args()
+
+    if args.table:
+        destination = TableOutput(args.table)
+    else:
+        destination = ParquetOutput(args.output or os.path.join(OUTPUT_DIR, args.model))
+    score(
+        args.model,
+        args.source,
+        destination,
+        args.chunk_size,
+        args.workers,
+        args.threads_per_worker,
+        args.restart,
+    )
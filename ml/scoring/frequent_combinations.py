@@ -0,0 +1,57 @@
+import argparse
+import os
+import sys
+
+# ───────────────────────────────────────────────────────────────
+# Setup project path
+# ───────────────────────────────────────────────────────────────
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+# ───────────────────────────────────────────────────────────────
+# Custom Imports
+# ───────────────────────────────────────────────────────────────
+from database.services.flight_service import load_frequent_combinations
+
+# ───────────────────────────────────────────────────────────────
+# Constants and Configuration
+# ───────────────────────────────────────────────────────────────
+OUTPUT_PATH = "ml/models_artifact/frequent_combinations.csv"
+
+
+# ───────────────────────────────────────────────────────────────
+# Export Function
+# ───────────────────────────────────────────────────────────────
+def export_frequent_combinations(limit: int, output_path: str = OUTPUT_PATH) -> int:
+    """
+    Write the most frequent feature combinations of the flights history to
+    CSV. The API scores this file with every model version it activates and
+    answers matching requests from the resulting lookup table.
+    """
+    df = load_frequent_combinations(limit).dropna()
+    if df.empty:
+        print("⚠️ No flights found, nothing exported.")
+        return 0
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    df.to_csv(output_path + ".tmp", index=False)
+    os.replace(output_path + ".tmp", output_path)
+
+    coverage = df["n_flights"].sum()
+    print(
+        f"✅ {len(df)} combinations covering {coverage} historical flights "
+        f"written to {output_path}"
+    )
+    return len(df)
+
+
+# ───────────────────────────────────────────────────────────────
+# Entry Point
+# ───────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export the most frequent flight feature combinations"
+    )
+    parser.add_argument("--limit", type=int, default=5000)
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    args = parser.parse_args()
+    export_frequent_combinations(args.limit, args.output)
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+from contextlib import nullcontext
+from typing import Dict, List, Optional
+
+import joblib
+import numpy as np
+import sklearn
+from loguru import logger
+from scipy import sparse
+
+# ───────────────────────────────────────────────────────────────
+# Setup project path
+# ───────────────────────────────────────────────────────────────
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+# ───────────────────────────────────────────────────────────────
+# Custom Imports
+# ───────────────────────────────────────────────────────────────
+from database.services.flight_service import (
+    load_training_data,
+    training_data_signature,
+)
+from ml.training.preprocessing import preprocessing, split
+
+# ───────────────────────────────────────────────────────────────
+# Constants and Configuration
+# ───────────────────────────────────────────────────────────────
+CACHE_DIR = os.getenv("FEATURE_CACHE_DIR", "dump/feature_cache")
+# Bump when the layout below or the way matrices are built changes
+FORMAT_VERSION = 1
+# Entries kept on disk; the least recently used are removed first
+MAX_ENTRIES = 4
+
+_SPLITS = ("X_train", "X_test", "y_train", "y_test")
+_CSR_PARTS = ("data", "indices", "indptr")
+
+
+# ───────────────────────────────────────────────────────────────
+# Feature-matrix Cache
+# ───────────────────────────────────────────────────────────────
+#
+# One directory per key:
+#   meta.json         the inputs the key was computed from, plus shapes
+#   preprocessor.pkl  the fitted ColumnTransformer
+#   <split>.npy       dense matrices and labels, or for a CSR matrix
+#   <split>.<part>.npy  its data / indices / indptr arrays
+# Entries are written to a temporary directory and renamed into place, so
+# a reader never sees a half-written entry.
+
+
+def cache_key(config: Dict) -> str:
+    return hashlib.sha256(
+        json.dumps(config, sort_keys=True, default=str).encode()
+    ).hexdigest()[:16]
+
+
+def save_matrix(directory: str, name: str, X) -> Dict:
+    """Save a dense or CSR matrix as .npy files; returns what load_matrix needs."""
+    if sparse.issparse(X):
+        X = X.tocsr()
+        for part in _CSR_PARTS:
+            np.save(os.path.join(directory, f"{name}.{part}.npy"), getattr(X, part))
+        return {"format": "csr", "shape": list(X.shape)}
+    np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(X))
+    return {"format": "dense", "shape": list(np.shape(X))}
+
+
+def load_matrix(directory: str, name: str, spec: Dict):
+    """Read-only memory-mapped view of a saved matrix."""
+    if spec["format"] == "csr":
+        data, indices, indptr = (
+            np.load(os.path.join(directory, f"{name}.{part}.npy"), mmap_mode="r")
+            for part in _CSR_PARTS
+        )
+        return sparse.csr_matrix(
+            (data, indices, indptr), shape=tuple(spec["shape"]), copy=False
+        )
+    return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+
+
+def _prune(cache_dir: str, keep: str) -> None:
+    entries = [
+        os.path.join(cache_dir, entry)
+        for entry in os.listdir(cache_dir)
+        if not entry.startswith(".") and entry != keep
+    ]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for path in entries[MAX_ENTRIES - 1 :]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def load_features(
+    numerical_cols: List[str],
+    categorical_cols: List[str],
+    target_col: str,
+    mode: str = "dense",
+    cache_dir: Optional[str] = CACHE_DIR,
+    profiler=None,
+):
+    """
+    Train/test split of the preprocessed training data and the fitted
+    preprocessor: (X_train, X_test, y_train, y_test, preprocessor).
+
+    Served from `cache_dir` when an entry exists for the same query,
+    sampling, database file, columns, preprocessing mode and split;
+    otherwise built with load_training_data + preprocessing + split and
+    stored. Cached matrices are read-only memory maps, so every caller in
+    every process shares the same pages. cache_dir=None disables caching.
+    A profiler (profiling.StageProfiler) times each step.
+    """
+    stage = profiler.stage if profiler is not None else nullcontext
+    config = {
+        "format_version": FORMAT_VERSION,
+        "data": training_data_signature(),
+        "numerical_cols": list(numerical_cols),
+        "categorical_cols": list(categorical_cols),
+        "target_col": target_col,
+        "preprocessing": mode,
+        "split": {"test_size": 0.2, "random_state": 42},
+        "sklearn": sklearn.__version__,
+    }
+    key = cache_key(config)
+    directory = os.path.join(cache_dir, key) if cache_dir else None
+
+    if directory and os.path.exists(os.path.join(directory, "meta.json")):
+        with stage("feature_cache_load"):
+            with open(os.path.join(directory, "meta.json")) as f:
+                meta = json.load(f)
+            os.utime(directory)  # mark as recently used
+            matrices = [
+                load_matrix(directory, name, meta["arrays"][name]) for name in _SPLITS
+            ]
+            preprocessor = joblib.load(os.path.join(directory, "preprocessor.pkl"))
+        logger.info(f"Feature matrices loaded from cache {key}.")
+        return (*matrices, preprocessor)
+
+    df = load_training_data(profiler)
+    with stage("fit_transform"):
+        X, y, preprocessor = preprocessing(
+            df, numerical_cols, categorical_cols, df[target_col], mode=mode
+        )
+    with stage("split"):
+        X_train, X_test, y_train, y_test = split(X, y.to_numpy(), **config["split"])
+    if directory is None:
+        return X_train, X_test, y_train, y_test, preprocessor
+
+    with stage("feature_cache_store"):
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=".tmp-", dir=cache_dir)
+        arrays = {
+            name: save_matrix(tmp, name, matrix)
+            for name, matrix in zip(_SPLITS, (X_train, X_test, y_train, y_test))
+        }
+        joblib.dump(preprocessor, os.path.join(tmp, "preprocessor.pkl"))
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump({"key": key, "config": config, "arrays": arrays}, f, indent=2)
+        try:
+            os.rename(tmp, directory)
+        except OSError:
+            # Another process stored the same entry first: keep theirs
+            shutil.rmtree(tmp, ignore_errors=True)
+        _prune(cache_dir, keep=key)
+    logger.success(f"Feature matrices cached as {key}.")
+
+    return (
+        *(load_matrix(directory, name, arrays[name]) for name in _SPLITS),
+        preprocessor,
+    )
@@ -3,7 +3,7 @@ from typing import Dict
 from lightgbm import LGBMClassifier
 from sklearn.base import ClassifierMixin
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 
 # ───────────────────────────────────────────────────────────────
 # Model Factory Functions
@@ -34,6 +34,19 @@ def get_logistic_regression(params: Dict) -> LogisticRegression:
     )
 
 
+def get_sgd_logistic_regression(params: Dict) -> SGDClassifier:
+    """
+    Create a logistic regression trained by SGD, which supports partial_fit.
+    Its class_weight must be a dict: 'balanced' needs the whole dataset.
+    """
+    return SGDClassifier(
+        loss="log_loss",
+        alpha=params.get("sgd_alpha", 1e-4),
+        class_weight=params.get("class_weight", None),
+        random_state=42,
+    )
+
+
 def get_lightgbm(params: Dict) -> LGBMClassifier:
     """
     Create a configured LightGBM classifier instance.
@@ -42,6 +55,9 @@ def get_lightgbm(params: Dict) -> LGBMClassifier:
         n_estimators=params.get("lgbm_n_estimators", 100),
         max_depth=params.get("lgbm_max_depth", -1),
         class_weight=params.get("class_weight", None),
+        # Regularization of native categorical splits (LightGBM defaults)
+        min_data_per_group=params.get("lgbm_min_data_per_group", 100),
+        cat_smooth=params.get("lgbm_cat_smooth", 10.0),
         random_state=42,
         verbosity=-1,
     )
@@ -1,8 +1,18 @@
+from collections import Counter
+
+import numpy as np
+import pandas as pd
 from sklearn.compose import ColumnTransformer
 from sklearn.impute import SimpleImputer
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+
+# "dense": one-hot float64 array (historical default)
+# "sparse": one-hot CSR matrix, for logistic regression and random forest
+# "native": one integer code column per categorical, for LightGBM's
+#           categorical_feature (unknown categories -> -1, treated as missing)
+PREPROCESSING_MODES = ("dense", "sparse", "native")
 
 
 def split(X, y, test_size=0.2, random_state=42):
@@ -21,7 +31,17 @@ def outliers_filter(df, col: str):
     return df
 
 
-def preprocessing(df, numerical_cols, categorical_cols, predict_col):
+def categorical_encoder(mode: str = "dense"):
+    """Final step of the categorical pipeline for a preprocessing mode."""
+    if mode not in PREPROCESSING_MODES:
+        raise ValueError(f"Unsupported preprocessing mode: {mode}")
+    if mode == "native":
+        return OrdinalEncoder(handle_unknown="use_encoded_value", unknown_value=-1)
+    return OneHotEncoder(handle_unknown="ignore", sparse_output=mode == "sparse")
+
+
+def build_preprocessor(numerical_cols, categorical_cols, mode="dense"):
+    """Unfitted ColumnTransformer for a preprocessing mode."""
     num_pipeline = Pipeline(
         [("imputer", SimpleImputer(strategy="mean")), ("scaler", StandardScaler())]
     )
@@ -29,16 +49,116 @@ def preprocessing(df, numerical_cols, categorical_cols, predict_col):
     cat_pipeline = Pipeline(
         [
             ("imputer", SimpleImputer(strategy="most_frequent")),
-            ("encoder", OneHotEncoder(handle_unknown="ignore", sparse_output=False)),
+            ("encoder", categorical_encoder(mode)),
         ]
     )
 
     preprocessor = ColumnTransformer(
-        [("num", num_pipeline, numerical_cols), ("cat", cat_pipeline, categorical_cols)]
+        [
+            ("num", num_pipeline, numerical_cols),
+            ("cat", cat_pipeline, categorical_cols),
+        ],
+        # Always CSR in sparse mode, whatever the share of non-zeros
+        sparse_threshold=1.0 if mode == "sparse" else 0.0,
     )
+    return preprocessor
+
+
+def preprocessing(df, numerical_cols, categorical_cols, predict_col, mode="dense"):
+    preprocessor = build_preprocessor(numerical_cols, categorical_cols, mode)
 
     y = predict_col
 
     X_processed = preprocessor.fit_transform(df)
 
     return X_processed, y, preprocessor
+
+
+def categorical_feature_indices(preprocessor) -> list:
+    """
+    Output columns holding ordinal category codes ("native" mode), to pass
+    as LightGBM's categorical_feature. Empty for the one-hot modes.
+    """
+    indices, offset = [], 0
+    for _, transformer, columns in preprocessor.transformers_:
+        if transformer == "drop" or len(columns) == 0:
+            continue
+        step = transformer.steps[-1][1] if isinstance(transformer, Pipeline) else None
+        if isinstance(step, OrdinalEncoder):
+            indices.extend(range(offset, offset + len(columns)))
+            width = len(columns)
+        elif isinstance(step, OneHotEncoder):
+            width = sum(len(categories) for categories in step.categories_)
+        else:
+            width = len(columns)
+        offset += width
+    return indices
+
+
+class StreamingPreprocessorFit:
+    """
+    Fit the preprocessor of preprocessing() from DataFrame chunks, keeping
+    only running statistics: mean and variance per numeric column
+    (StandardScaler.partial_fit) and value counts per categorical column.
+
+    build() returns a regular fitted ColumnTransformer, interchangeable with
+    one fitted on the concatenated chunks: same categories, imputation
+    values and (up to float rounding) scaling.
+    """
+
+    def __init__(self, numerical_cols, categorical_cols, mode="dense"):
+        self.numerical_cols = list(numerical_cols)
+        self.categorical_cols = list(categorical_cols)
+        self.mode = mode
+        self.scaler = StandardScaler()
+        self.counts = {col: Counter() for col in self.categorical_cols}
+        self.n_rows = 0
+
+    def update(self, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+        # As an array: inside the pipeline the scaler only sees the imputer's output
+        self.scaler.partial_fit(df[self.numerical_cols].to_numpy(dtype=np.float64))
+        for col in self.categorical_cols:
+            self.counts[col].update(df[col].dropna().value_counts().to_dict())
+        self.n_rows += len(df)
+
+    def build(self) -> ColumnTransformer:
+        if not self.n_rows:
+            raise ValueError("No rows seen, cannot fit the preprocessor")
+
+        # Fit the pipeline structure on one row per category level...
+        levels = {col: sorted(self.counts[col]) for col in self.categorical_cols}
+        n = max(len(values) for values in levels.values())
+        prototype = pd.DataFrame(
+            {
+                **{
+                    col: np.full(n, mean)
+                    for col, mean in zip(self.numerical_cols, self.scaler.mean_)
+                },
+                **{
+                    col: [values[i % len(values)] for i in range(n)]
+                    for col, values in levels.items()
+                },
+            }
+        )
+        preprocessor = build_preprocessor(
+            self.numerical_cols, self.categorical_cols, self.mode
+        )
+        preprocessor.fit(prototype)
+
+        # ...then install the statistics of the full stream
+        num = preprocessor.named_transformers_["num"]
+        num.named_steps["imputer"].statistics_ = self.scaler.mean_.copy()
+        num.steps[-1] = ("scaler", self.scaler)
+
+        # SimpleImputer breaks most_frequent ties with the smallest value
+        cat = preprocessor.named_transformers_["cat"]
+        cat.named_steps["imputer"].statistics_ = np.array(
+            [
+                min(self.counts[col].items(), key=lambda item: (-item[1], item[0]))[0]
+                for col in self.categorical_cols
+            ],
+            dtype=object,
+        )
+        return preprocessor
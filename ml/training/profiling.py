@@ -0,0 +1,118 @@
+import os
+import resource
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# ───────────────────────────────────────────────────────────────
+# Constants and Configuration
+# ───────────────────────────────────────────────────────────────
+# tracemalloc measures each stage's own peak of Python/NumPy allocations,
+# but slows allocation-heavy stages (SQL row decoding, pandas) noticeably.
+# Without it, each stage records how much it raised the process peak RSS.
+TRACE_MEMORY = os.getenv("TRAINING_TRACEMALLOC", "0") == "1"
+
+_MB = 1024 * 1024
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process (Linux reports KiB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# ───────────────────────────────────────────────────────────────
+# Per-stage Profiler
+# ───────────────────────────────────────────────────────────────
+class StageProfiler:
+    """
+    Wall-clock time and memory of the named stages of a training run.
+
+    For every stage it records its duration, how much it raised the process
+    peak RSS (native allocations included; a stage that fits in memory
+    already reached earlier records 0) and, with trace_memory, the stage's
+    own peak of traced allocations. Stages are flat: a repeated name
+    accumulates time and RSS growth.
+    """
+
+    def __init__(self, trace_memory: bool = TRACE_MEMORY):
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        rss_before = peak_rss_mb()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats = self.stages.setdefault(name, {"seconds": 0.0, "rss_growth_mb": 0.0})
+            stats["seconds"] += time.perf_counter() - start
+            # ru_maxrss never goes down: only its increase belongs to the stage
+            stats["rss_growth_mb"] += max(0.0, peak_rss_mb() - rss_before)
+            if self.trace_memory:
+                peak = (tracemalloc.get_traced_memory()[1] - baseline) / _MB
+                stats["traced_peak_mb"] = max(stats.get("traced_peak_mb", 0.0), peak)
+            if started_tracing:
+                tracemalloc.stop()
+
+    @property
+    def total_seconds(self) -> float:
+        return time.perf_counter() - self._start
+
+    def metrics(self) -> Dict[str, float]:
+        """Flat metrics for MLflow: profile_<stage>_<measure>."""
+        metrics = {
+            f"profile_{name}_{measure}": value
+            for name, stats in self.stages.items()
+            for measure, value in stats.items()
+        }
+        metrics["profile_total_seconds"] = self.total_seconds
+        metrics["profile_peak_rss_mb"] = peak_rss_mb()
+        return metrics
+
+    def summary(self, run: Optional[str] = None) -> Dict:
+        """JSON-serialisable profile of the run, stages in execution order."""
+        total = self.total_seconds
+        stages: List[Dict] = [
+            {"stage": name, **stats, "share": stats["seconds"] / total}
+            for name, stats in self.stages.items()
+        ]
+        return {
+            "run": run,
+            "total_seconds": total,
+            "untracked_seconds": total - sum(s["seconds"] for s in stages),
+            "peak_rss_mb": peak_rss_mb(),
+            "trace_memory": self.trace_memory,
+            "stages": stages,
+        }
+
+
+def format_profile(summary: Dict) -> str:
+    """Plain-text table of a StageProfiler.summary()."""
+    lines = [
+        f"Training profile: {summary['run'] or ''}".rstrip(),
+        f"{'stage':<20} {'seconds':>9} {'share':>7} {'RSS growth MB':>14}"
+        + (f" {'traced MB':>10}" if summary["trace_memory"] else ""),
+    ]
+    for stats in summary["stages"]:
+        line = (
+            f"{stats['stage']:<20} {stats['seconds']:>9.2f} "
+            f"{stats['share']:>7.1%} {stats['rss_growth_mb']:>14.0f}"
+        )
+        if summary["trace_memory"]:
+            line += f" {stats.get('traced_peak_mb', 0.0):>10.1f}"
+        lines.append(line)
+    lines.append(
+        f"{'(untracked)':<20} {summary['untracked_seconds']:>9.2f}\n"
+        f"{'total':<20} {summary['total_seconds']:>9.2f}\n"
+        f"{'peak RSS MB':<20} {summary['peak_rss_mb']:>9.0f}"
+    )
+    return "\n".join(lines)
@@ -0,0 +1,267 @@
+import argparse
+import os
+import resource
+import sys
+import time
+
+import joblib
+import mlflow
+import mlflow.sklearn
+import numpy as np
+import pandas as pd
+from sklearn.metrics import confusion_matrix
+
+# ───────────────────────────────────────────────────────────────
+# Setup project path
+# ───────────────────────────────────────────────────────────────
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+# ───────────────────────────────────────────────────────────────
+# Custom Imports
+# ───────────────────────────────────────────────────────────────
+from database.services.flight_service import iter_training_chunks
+from ml.training.models import get_model, get_sgd_logistic_regression
+from ml.training.preprocessing import (
+    StreamingPreprocessorFit,
+    categorical_feature_indices,
+)
+
+# ───────────────────────────────────────────────────────────────
+# Constants and Configuration
+# ───────────────────────────────────────────────────────────────
+MODELS_DIR = "ml/models_artifact"
+
+NUMERICAL_COLS = [
+    "month",
+    "day_of_week",
+    "crs_dep_time",
+    "crs_arr_time",
+    "crs_elapsed_time",
+    "distance",
+]
+CATEGORICAL_COLS = ["unique_carrier", "origin", "dest", "dep_time_blk"]
+FEATURE_COLS = NUMERICAL_COLS + CATEGORICAL_COLS
+TARGET_COL = "arr_del15"
+
+CHUNKSIZE = 200_000
+TEST_SIZE = 0.2
+MODEL_TYPES = ["logistic_regression", "lightgbm"]
+DEFAULT_MODES = {"logistic_regression": "sparse", "lightgbm": "native"}
+
+
+# ───────────────────────────────────────────────────────────────
+# Chunk Stream
+# ───────────────────────────────────────────────────────────────
+def split_chunks(chunksize: int, test_size: float = TEST_SIZE, seed: int = 42):
+    """
+    (train, test) DataFrame pairs for every chunk of the training query.
+    The held-out rows depend only on the seed and the chunk index, so every
+    pass over the table sees the same split.
+    """
+    for index, chunk in enumerate(iter_training_chunks(chunksize)):
+        is_test = np.random.default_rng([seed, index]).random(len(chunk)) < test_size
+        yield chunk[~is_test], chunk[is_test]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process (Linux reports KiB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# ───────────────────────────────────────────────────────────────
+# Chunked Training Function
+# ───────────────────────────────────────────────────────────────
+def train_model_chunked(
+    params: dict, chunksize: int = CHUNKSIZE, models_dir: str = MODELS_DIR
+):
+    """
+    Train on every row of the flights table, one chunk at a time, so memory
+    is bounded by `chunksize` instead of the table size:
+
+    1. one pass fits the preprocessor and counts the classes;
+    2. `epochs` passes train the model: LightGBM adds a share of its
+       `lgbm_n_estimators` trees per chunk on top of the previous booster
+       (init_model), so model size does not grow with the table; logistic
+       regression is an SGDClassifier (partial_fit). Rows are weighted like
+       class_weight="balanced" on the whole table;
+    3. one pass scores the held-out rows and accumulates a confusion matrix.
+
+    Saves model and preprocessor like train_model().
+    """
+    model_type = params["model_type"]
+    if model_type not in MODEL_TYPES:
+        raise ValueError(f"{model_type} has no incremental learner")
+    mode = params.get("preprocessing", DEFAULT_MODES[model_type])
+    epochs = params.get("epochs", 1)
+    start = time.perf_counter()
+
+    # Pass 1: preprocessing statistics and class balance
+    stats = StreamingPreprocessorFit(NUMERICAL_COLS, CATEGORICAL_COLS, mode)
+    class_counts = np.zeros(2, dtype=np.int64)
+    # One training row of each class
+    examples = {}
+    n_chunks = 0
+    for train, _ in split_chunks(chunksize):
+        n_chunks += 1
+        stats.update(train)
+        labels = train[TARGET_COL].astype(int)
+        class_counts += np.bincount(labels, minlength=2)
+        for label in set(labels.unique()) - set(examples):
+            examples[label] = train[labels == label].iloc[:1]
+    preprocessor = stats.build()
+    print(f"[INFO] Preprocessor fitted on {stats.n_rows} rows.")
+    if not class_counts.all():
+        raise ValueError(f"Training rows hold a single class: {class_counts}")
+
+    # Per-row weights, same as class_weight="balanced" on the whole table (a
+    # class_weight dict fails on chunks that miss one of its classes)
+    class_weights = class_counts.sum() / (2 * class_counts)
+
+    # Passes 2..: training
+    if model_type == "lightgbm":
+        # Spread the tree budget evenly over the chunks
+        rounds = params.get("lgbm_chunk_rounds") or -(
+            -params.get("lgbm_n_estimators", 100) // (n_chunks * epochs)
+        )
+        # Each chunk holds few rows per category: split on larger groups only
+        model = get_model(
+            {
+                "lgbm_min_data_per_group": 1000,
+                "lgbm_cat_smooth": 50.0,
+                **params,
+                "lgbm_n_estimators": rounds,
+            }
+        )
+        fit_params = {}
+        if mode == "native":
+            fit_params["categorical_feature"] = categorical_feature_indices(
+                preprocessor
+            )
+    else:
+        model = get_sgd_logistic_regression(params)
+
+    booster = None
+    pending = []
+    for epoch in range(epochs):
+        for train, _ in split_chunks(chunksize):
+            if model_type == "lightgbm" and booster is None:
+                # A booster started on one class never splits afterwards: the
+                # first fit waits for a chunk that holds both
+                train = pd.concat([*pending, train])
+                pending = [] if train[TARGET_COL].nunique() == 2 else [train]
+                if pending:
+                    continue
+            y = train[TARGET_COL].astype(int).to_numpy()
+            sample_weight = class_weights[y]
+            if model_type == "lightgbm":
+                # LGBMClassifier relabels whatever classes a chunk holds, so a
+                # single-class chunk would be learnt as class 0: add a row of
+                # the missing class, with no weight
+                missing = [examples[label] for label in {0, 1} - set(y)]
+                if missing:
+                    train = pd.concat([train, *missing])
+                    y = train[TARGET_COL].astype(int).to_numpy()
+                    sample_weight = np.append(sample_weight, np.zeros(len(missing)))
+            X = preprocessor.transform(train[FEATURE_COLS])
+            if model_type == "lightgbm":
+                model.fit(
+                    X,
+                    y,
+                    sample_weight=sample_weight,
+                    init_model=booster,
+                    **fit_params,
+                )
+                booster = model.booster_
+            else:
+                model.partial_fit(X, y, classes=[0, 1], sample_weight=sample_weight)
+        print(f"[INFO] Epoch {epoch + 1}/{epochs} done.")
+
+    # Final pass: held-out evaluation
+    cm = np.zeros((2, 2), dtype=np.int64)
+    for _, test in split_chunks(chunksize):
+        if test.empty:
+            continue
+        y_pred = model.predict(preprocessor.transform(test[FEATURE_COLS]))
+        cm += confusion_matrix(
+            test[TARGET_COL].astype(int), y_pred.astype(int), labels=[0, 1]
+        )
+
+    (tn, fp), (fn, tp) = cm
+    precision = float(tp / (tp + fp)) if tp + fp else 0.0
+    recall = float(tp / (tp + fn)) if tp + fn else 0.0
+    metrics = {
+        "accuracy": float((tp + tn) / cm.sum()) if cm.sum() else 0.0,
+        "precision": precision,
+        "recall": recall,
+        "f1_score": (
+            2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        ),
+        "train_rows": int(class_counts.sum()),
+        "test_rows": int(cm.sum()),
+        "training_seconds": time.perf_counter() - start,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+    # Save model and preprocessor
+    os.makedirs(models_dir, exist_ok=True)
+    joblib.dump(model, os.path.join(models_dir, f"{model_type}_model.pkl"))
+    joblib.dump(
+        preprocessor, os.path.join(models_dir, f"{model_type}_preprocessor.pkl")
+    )
+
+    report = f"Confusion matrix (rows: actual 0/1, columns: predicted 0/1):\n{cm}"
+    return model, preprocessor, metrics, report
+
+
+# ───────────────────────────────────────────────────────────────
+# Main Training Loop
+# ───────────────────────────────────────────────────────────────
+def main(model_types, chunksize: int, epochs: int):
+    mlflow.set_experiment("flight_delay_models")
+
+    for model_type in model_types:
+        print(f"\n🚀 Training model on the full table: {model_type}")
+        if model_type == "lightgbm":
+            params = {
+                "model_type": model_type,
+                "lgbm_n_estimators": 100,
+                "preprocessing": "native",
+            }
+        else:
+            params = {
+                "model_type": model_type,
+                "sgd_alpha": 1e-4,
+                "preprocessing": "sparse",
+            }
+        params.update(epochs=epochs, chunksize=chunksize)
+
+        with mlflow.start_run(run_name=f"{model_type}_chunked"):
+            model, preprocessor, metrics, report = train_model_chunked(
+                params, chunksize
+            )
+
+            mlflow.log_params(params)
+            for name, value in metrics.items():
+                mlflow.log_metric(name, value)
+
+            mlflow.sklearn.log_model(model, artifact_path="model")
+            mlflow.sklearn.log_model(preprocessor, artifact_path="preprocessor")
+
+            print(report)
+            print(
+                f"✅ {metrics['train_rows']} training rows, "
+                f"f1={metrics['f1_score']:.4f}, peak RSS {metrics['peak_rss_mb']:.0f} MB"
+            )
+
+
+# ───────────────────────────────────────────────────────────────
+# Entry Point
+# ───────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Out-of-core training")
+    parser.add_argument("--models", nargs="+", default=MODEL_TYPES)
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE)
+    parser.add_argument("--epochs", type=int, default=1)
+    args = parser.parse_args()
+
+    main(args.models, args.chunksize, args.epochs)
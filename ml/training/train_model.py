@@ -1,13 +1,20 @@
+import argparse
+import multiprocessing as mp
 import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from typing import List, Optional
 
 import joblib
 import mlflow
 import mlflow.sklearn
-import optuna
 from imblearn.combine import SMOTEENN
 from imblearn.over_sampling import SMOTE
 from imblearn.under_sampling import RandomUnderSampler
+from joblib import parallel_config
 from sklearn.metrics import (
     accuracy_score,
     classification_report,
@@ -15,6 +22,7 @@ from sklearn.metrics import (
     precision_score,
     recall_score,
 )
+from threadpoolctl import threadpool_limits
 
 # ───────────────────────────────────────────────────────────────
 # Setup project path
@@ -24,9 +32,11 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"
 # ───────────────────────────────────────────────────────────────
 # Custom Imports
 # ───────────────────────────────────────────────────────────────
-from database.services.flight_service import load_training_data
+from ml.training.feature_cache import load_features
 from ml.training.models import get_model
-from ml.training.preprocessing import preprocessing, split
+from ml.training.preprocessing import categorical_feature_indices
+from ml.training.profiling import StageProfiler, format_profile
+from ml.training.tuning import LightGBMPruningCallback, lgbm_f1, run_study
 
 # ───────────────────────────────────────────────────────────────
 # Constants and Configuration
@@ -36,55 +46,87 @@ os.makedirs(MODELS_DIR, exist_ok=True)
 
 MODEL_TYPES = ["random_forest", "logistic_regression", "lightgbm"]
 
+# Feature types
+NUMERICAL_COLS = [
+    "month",
+    "day_of_week",
+    "crs_dep_time",
+    "crs_arr_time",
+    "crs_elapsed_time",
+    "distance",
+]
+CATEGORICAL_COLS = ["unique_carrier", "origin", "dest", "dep_time_blk"]
+TARGET_COL = "arr_del15"
+
+# Optuna search: trials added per run, and processes running them
+OPTUNA_TRIALS = int(os.getenv("OPTUNA_TRIALS", "10"))
+OPTUNA_WORKERS = int(os.getenv("OPTUNA_WORKERS", str(os.cpu_count() or 1)))
+
+# Relative share of the cores each model gets when all are trained at once
+# (see thread_limits); liblinear is single-threaded whatever it is given
+TRAINING_CORE_SHARES = {"random_forest": 1, "logistic_regression": 0, "lightgbm": 1}
+
+# Opt-in preprocessing modes (--compact-preprocessing, see preprocessing.py):
+# sparse one-hot for the sklearn models, native categoricals for LightGBM.
+# Models are trained on the dense matrix by default.
+COMPACT_PREPROCESSING = {
+    "random_forest": "sparse",
+    "logistic_regression": "sparse",
+    "lightgbm": "native",
+}
+
 
 # ───────────────────────────────────────────────────────────────
 # Training Function
 # ───────────────────────────────────────────────────────────────
-def train_model(params: dict):
+def train_model(
+    params: dict,
+    callbacks=None,
+    save: bool = True,
+    profiler: Optional[StageProfiler] = None,
+):
     """
     Load data, preprocess it, train a model, compute metrics,
-    and save both model and preprocessor to disk.
+    and save both model and preprocessor to disk (unless save=False).
+
+    For LightGBM, `callbacks` are called after every boosting round with
+    the F1 score on the test split (see tuning.LightGBMPruningCallback).
+    With a profiler, every stage is timed and its profile_* metrics are
+    added to the returned metrics.
     """
-    df = load_training_data()
-
-    # Define feature types
-    numerical_cols = [
-        "month",
-        "day_of_week",
-        "crs_dep_time",
-        "crs_arr_time",
-        "crs_elapsed_time",
-        "distance",
-    ]
-    categorical_cols = ["unique_carrier", "origin", "dest", "dep_time_blk"]
-    target_col = "arr_del15"
-
-    y_raw = df[target_col]
-
-    # Preprocess input data
-    X_processed, y, preprocessor = preprocessing(
-        df, numerical_cols, categorical_cols, y_raw
+    stage = profiler.stage if profiler is not None else nullcontext
+
+    # Preprocessed train/test split ("dense", "sparse" or "native", see
+    # preprocessing.py), shared by every run with the same inputs
+    mode = params.get("preprocessing", "dense")
+    X_train, X_test, y_train, y_test, preprocessor = load_features(
+        NUMERICAL_COLS, CATEGORICAL_COLS, TARGET_COL, mode=mode, profiler=profiler
     )
-    X_train, X_test, y_train, y_test = split(X_processed, y)
 
     # ───────────────────────────────────────────────────────────────
     # Balancing strategy
     # ───────────────────────────────────────────────────────────────
     strategy = params.get("balance_strategy", "none")
+    if mode == "native" and strategy in ("smote", "smoteen"):
+        # Interpolating between category codes would invent categories
+        raise ValueError(f"{strategy} cannot be combined with native categoricals")
 
     if strategy == "smote":
         smote = SMOTE(random_state=42)
-        X_train, y_train = smote.fit_resample(X_train, y_train)
+        with stage("resampling"):
+            X_train, y_train = smote.fit_resample(X_train, y_train)
         print("[INFO] SMOTE applied for class balancing.")
 
     elif strategy == "smoteen":
         smote_enn = SMOTEENN(random_state=42)
-        X_train, y_train = smote_enn.fit_resample(X_train, y_train)
+        with stage("resampling"):
+            X_train, y_train = smote_enn.fit_resample(X_train, y_train)
         print("[INFO] SMOTEENN applied: SMOTE + undersampling.")
 
     elif strategy == "undersample":
         rus = RandomUnderSampler(random_state=42)
-        X_train, y_train = rus.fit_resample(X_train, y_train)
+        with stage("resampling"):
+            X_train, y_train = rus.fit_resample(X_train, y_train)
         print("[INFO] RandomUnderSampler applied: majority class reduced.")
 
     else:
@@ -102,94 +144,231 @@ def train_model(params: dict):
 
     # Train selected model
     model = get_model(params)
-    model.fit(X_train, y_train)
+    fit_params = {}
+    if params["model_type"] == "lightgbm" and mode == "native":
+        fit_params["categorical_feature"] = categorical_feature_indices(preprocessor)
+    if params["model_type"] == "lightgbm" and callbacks:
+        fit_params.update(
+            eval_set=[(X_test, y_test)], eval_metric=lgbm_f1, callbacks=callbacks
+        )
+    with stage("model_fit"):
+        model.fit(X_train, y_train, **fit_params)
 
     # Evaluate model
-    y_pred = model.predict(X_test)
-    metrics = {
-        "accuracy": accuracy_score(y_test, y_pred),
-        "precision": precision_score(y_test, y_pred),
-        "recall": recall_score(y_test, y_pred),
-        "f1_score": f1_score(y_test, y_pred),
-    }
+    with stage("evaluation"):
+        y_pred = model.predict(X_test)
+        metrics = {
+            "accuracy": accuracy_score(y_test, y_pred),
+            "precision": precision_score(y_test, y_pred),
+            "recall": recall_score(y_test, y_pred),
+            "f1_score": f1_score(y_test, y_pred),
+        }
+        report = classification_report(y_test, y_pred, digits=3)
 
     # Save model and preprocessor
-    joblib.dump(model, os.path.join(MODELS_DIR, f"{params['model_type']}_model.pkl"))
-    joblib.dump(
-        preprocessor,
-        os.path.join(MODELS_DIR, f"{params['model_type']}_preprocessor.pkl"),
-    )
-
-    report = classification_report(y_test, y_pred, digits=3)
+    if save:
+        with stage("artifact_dump"):
+            joblib.dump(
+                model, os.path.join(MODELS_DIR, f"{params['model_type']}_model.pkl")
+            )
+            joblib.dump(
+                preprocessor,
+                os.path.join(MODELS_DIR, f"{params['model_type']}_preprocessor.pkl"),
+            )
+
+    if profiler is not None:
+        metrics.update(profiler.metrics())
     return model, preprocessor, metrics, report
 
 
 # ───────────────────────────────────────────────────────────────
 # Optuna Objective Function for LightGBM
 # ───────────────────────────────────────────────────────────────
-def objective(trial):
+def objective(trial, preprocessing: str = "dense"):
     """
     Objective function for Optuna to optimize LightGBM hyperparameters.
+    Trials are pruned on their intermediate validation F1; they never
+    write model files, the best parameters are retrained in main().
     """
     params = {
         "model_type": "lightgbm",
         "lgbm_n_estimators": trial.suggest_int("lgbm_n_estimators", 50, 300),
         "lgbm_max_depth": trial.suggest_int("lgbm_max_depth", 3, 15),
+        "preprocessing": preprocessing,
         # "balance_strategy": "smote",
     }
 
-    _, _, metrics, _ = train_model(params)
+    _, _, metrics, _ = train_model(
+        params, callbacks=[LightGBMPruningCallback(trial)], save=False
+    )
     return metrics["f1_score"]
 
 
 # ───────────────────────────────────────────────────────────────
-# Main Training Loop
+# Training All Models
 # ───────────────────────────────────────────────────────────────
-def main():
+def model_params(model_type: str, compact: bool = False) -> dict:
     """
-    Train and evaluate multiple models.
-    Log results and artifacts to MLflow.
+    Hyperparameters for each model; LightGBM's come from the Optuna study.
+    `compact` selects the model's COMPACT_PREPROCESSING mode instead of dense.
     """
-    mlflow.set_experiment("flight_delay_models")
+    preprocessing = COMPACT_PREPROCESSING[model_type] if compact else "dense"
+    if model_type == "random_forest":
+        return {
+            "model_type": model_type,
+            "n_estimators": 100,
+            "max_depth": 10,
+            "preprocessing": preprocessing,
+        }
+
+    if model_type == "logistic_regression":
+        return {
+            "model_type": model_type,
+            "logreg_C": 1.0,
+            "preprocessing": preprocessing,
+        }
+
+    print("🎯 Running Optuna for LightGBM...")
+
+    # Build the cached feature matrices once, before the workers
+    # start: they all map the same files
+    load_features(NUMERICAL_COLS, CATEGORICAL_COLS, TARGET_COL, mode=preprocessing)
+    study = run_study(
+        partial(objective, preprocessing=preprocessing),
+        OPTUNA_TRIALS,
+        workers=OPTUNA_WORKERS,
+    )
+
+    print(f"✅ Best trial score: {study.best_trial.value}")
+    print(f"✅ Best hyperparameters: {study.best_trial.params}")
 
-    for model_type in MODEL_TYPES:
-        print(f"\n🚀 Training model: {model_type}")
+    return {
+        **study.best_trial.params,
+        "model_type": "lightgbm",
+        "preprocessing": preprocessing,
+    }
 
-        # Default hyperparameters for each model
-        if model_type == "random_forest":
-            params = {"model_type": model_type, "n_estimators": 100, "max_depth": 10}
 
-        elif model_type == "logistic_regression":
-            params = {"model_type": model_type, "logreg_C": 1.0}
+def thread_limits(model_types: List[str], cpus: int = os.cpu_count() or 1) -> dict:
+    """
+    Cores for each model trained concurrently. Models with a zero share in
+    TRAINING_CORE_SHARES are single-threaded; the others split what is left
+    in proportion to their share.
+    """
+    shares = {m: TRAINING_CORE_SHARES.get(m, 1) for m in model_types}
+    spare = cpus - sum(1 for share in shares.values() if not share)
+    total = sum(shares.values()) or 1
+    return {m: max(1, spare * share // total) for m, share in shares.items()}
 
-        elif model_type == "lightgbm":
-            print("🎯 Running Optuna for LightGBM...")
 
-            study = optuna.create_study(direction="maximize")
-            study.optimize(objective, n_trials=10)
+def _timed_training(params: dict, threads: Optional[int] = None):
+    """
+    train_model() plus its wall-clock time and stage profile, optionally
+    with a thread cap.
+    """
+    profiler = StageProfiler()
+    if threads is None:
+        model, preprocessor, metrics, report = train_model(params, profiler=profiler)
+    else:
+        # BLAS/OpenMP pools (LightGBM, linear models) and joblib (random forest)
+        with threadpool_limits(threads), parallel_config(n_jobs=threads):
+            model, preprocessor, metrics, report = train_model(
+                params, profiler=profiler
+            )
+    metrics["training_seconds"] = profiler.total_seconds
+    profile = profiler.summary(run=params["model_type"])
+    # params are returned because train_model() adds class_weight to them
+    return params, model, preprocessor, metrics, report, profile
+
+
+def train_all(params_list: List[dict], concurrent: bool = False) -> list:
+    """
+    Train one model per params, one after another or each in its own spawned
+    worker process (with thread_limits() cores). Every distinct feature
+    matrix is built once up front; workers map it from the feature cache.
+    Returns (params, model, preprocessor, metrics, report, profile) in
+    params order.
+    """
+    if not concurrent:
+        return [_timed_training(params) for params in params_list]
 
-            print(f"✅ Best trial score: {study.best_trial.value}")
-            print(f"✅ Best hyperparameters: {study.best_trial.params}")
+    for mode in dict.fromkeys(p.get("preprocessing", "dense") for p in params_list):
+        load_features(NUMERICAL_COLS, CATEGORICAL_COLS, TARGET_COL, mode=mode)
 
-            params = {**study.best_trial.params, "model_type": "lightgbm"}
+    threads = thread_limits([params["model_type"] for params in params_list])
+    with ProcessPoolExecutor(
+        max_workers=len(params_list), mp_context=mp.get_context("spawn")
+    ) as pool:
+        futures = [
+            pool.submit(_timed_training, params, threads[params["model_type"]])
+            for params in params_list
+        ]
+        return [future.result() for future in futures]
 
-        # Start MLflow tracking
-        with mlflow.start_run(run_name=model_type):
-            model, preprocessor, metrics, report = train_model(params)
 
-            mlflow.log_params(params)
-            for name, value in metrics.items():
-                mlflow.log_metric(name, value)
+# ───────────────────────────────────────────────────────────────
+# Main Training Loop
+# ───────────────────────────────────────────────────────────────
+def log_run(params, model, preprocessor, metrics, report, profile) -> None:
+    """Log one trained model to MLflow (always from the parent process)."""
+    with mlflow.start_run(run_name=params["model_type"]):
+        mlflow.log_params(params)
+        for name, value in metrics.items():
+            mlflow.log_metric(name, value)
+
+        mlflow.sklearn.log_model(model, artifact_path="model")
+        mlflow.sklearn.log_model(preprocessor, artifact_path="preprocessor")
+        mlflow.log_dict(profile, "profile/training_profile.json")
+        mlflow.log_text(format_profile(profile), "profile/training_profile.txt")
+
+    print(report)
+    print(format_profile(profile))
+    print("✅ Model and metrics logged to MLflow.")
+
+
+def main(
+    model_types: List[str] = MODEL_TYPES,
+    concurrent: bool = False,
+    compact: bool = False,
+):
+    """
+    Train and evaluate multiple models.
+    Log results and artifacts to MLflow.
+    """
+    mlflow.set_experiment("flight_delay_models")
+    start = time.perf_counter()
 
-            mlflow.sklearn.log_model(model, artifact_path="model")
-            mlflow.sklearn.log_model(preprocessor, artifact_path="preprocessor")
+    if concurrent:
+        params_list = [model_params(model_type, compact) for model_type in model_types]
+        print(f"\n🚀 Training concurrently: {', '.join(model_types)}")
+        for result in train_all(params_list, concurrent=True):
+            log_run(*result)
+    else:
+        for model_type in model_types:
+            print(f"\n🚀 Training model: {model_type}")
+            params = model_params(model_type, compact)
+            log_run(*_timed_training(params))
 
-            print(report)
-            print("✅ Model and metrics logged to MLflow.")
+    print(f"⏱️ All models trained in {time.perf_counter() - start:.1f}s")
 
 
 # ───────────────────────────────────────────────────────────────
 # Entry Point
 # ───────────────────────────────────────────────────────────────
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Train and log every model")
+    parser.add_argument("--models", nargs="+", default=MODEL_TYPES)
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Train the models in parallel worker processes",
+    )
+    parser.add_argument(
+        "--compact-preprocessing",
+        action="store_true",
+        help="Sparse one-hot (random forest, logistic regression) and native "
+        "categoricals (LightGBM) instead of the dense matrix",
+    )
+    args = parser.parse_args()
+
+    main(args.models, args.concurrent, args.compact_preprocessing)
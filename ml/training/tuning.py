@@ -0,0 +1,194 @@
+import multiprocessing as mp
+import os
+import sys
+import time
+from typing import Callable, Optional
+
+import numpy as np
+import optuna
+from optuna.study import MaxTrialsCallback
+from optuna.trial import TrialState
+from threadpoolctl import threadpool_limits
+
+# ───────────────────────────────────────────────────────────────
+# Setup project path
+# ───────────────────────────────────────────────────────────────
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+# ───────────────────────────────────────────────────────────────
+# Constants and Configuration
+# ───────────────────────────────────────────────────────────────
+# Studies live in a local SQLite file: re-running with the same study name
+# resumes it, and every worker process shares its trials
+OPTUNA_STORAGE = os.getenv("OPTUNA_STORAGE", "sqlite:///dump/optuna.db")
+STUDY_NAME = os.getenv("OPTUNA_STUDY", "lightgbm_f1")
+# Report the validation score to the pruner every this many boosting rounds
+REPORT_EVERY = 10
+
+
+# ───────────────────────────────────────────────────────────────
+# LightGBM Validation Callbacks
+# ───────────────────────────────────────────────────────────────
+def lgbm_f1(y_true, y_pred):
+    """
+    LightGBM eval_metric: F1 at the 0.5 threshold used by model.predict,
+    so the last reported value is the trial's objective.
+    """
+    y_true = np.asarray(y_true)
+    predicted = np.asarray(y_pred) > 0.5
+    tp = np.count_nonzero(predicted & (y_true == 1))
+    fp = np.count_nonzero(predicted & (y_true == 0))
+    fn = np.count_nonzero(~predicted & (y_true == 1))
+    f1 = 2 * tp / (2 * tp + fp + fn) if tp else 0.0
+    return "f1", f1, True
+
+
+class LightGBMPruningCallback:
+    """
+    Report a validation metric to an Optuna trial while LightGBM trains,
+    and stop the trial as soon as the study's pruner gives up on it.
+    """
+
+    def __init__(
+        self, trial: optuna.Trial, metric: str = "f1", report_every: int = REPORT_EVERY
+    ):
+        self.trial = trial
+        self.metric = metric
+        self.report_every = report_every
+
+    def __call__(self, env) -> None:
+        step = env.iteration + 1
+        if step % self.report_every and step != env.end_iteration:
+            return
+        for _, name, value, _ in env.evaluation_result_list:
+            if name == self.metric:
+                break
+        else:
+            raise ValueError(f"{self.metric} is not among the evaluation metrics")
+
+        self.trial.report(value, step)
+        if self.trial.should_prune():
+            raise optuna.TrialPruned(f"{self.metric}={value:.4f} at round {step}")
+
+
+# ───────────────────────────────────────────────────────────────
+# Parallel, Resumable Study
+# ───────────────────────────────────────────────────────────────
+def create_study(
+    storage: str = OPTUNA_STORAGE,
+    study_name: str = STUDY_NAME,
+    pruning: bool = True,
+    seed: Optional[int] = None,
+) -> optuna.Study:
+    """Create the study, or load it with its trials if it already exists."""
+    if storage.startswith("sqlite:///"):
+        directory = os.path.dirname(storage[len("sqlite:///") :])
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    pruner = (
+        optuna.pruners.MedianPruner(n_startup_trials=3, n_warmup_steps=REPORT_EVERY)
+        if pruning
+        else optuna.pruners.NopPruner()
+    )
+    return optuna.create_study(
+        storage=optuna.storages.RDBStorage(
+            storage,
+            # Workers wait for each other's writes instead of failing
+            engine_kwargs={"connect_args": {"timeout": 60}},
+        ),
+        study_name=study_name,
+        direction="maximize",
+        sampler=optuna.samplers.TPESampler(seed=seed),
+        pruner=pruner,
+        load_if_exists=True,
+    )
+
+
+def _finished_trials(study: optuna.Study) -> int:
+    return len(study.get_trials(states=(TrialState.COMPLETE, TrialState.PRUNED)))
+
+
+def _optimize(
+    objective: Callable,
+    storage: str,
+    study_name: str,
+    pruning: bool,
+    total_trials: int,
+    threads: int,
+    seed: Optional[int],
+) -> None:
+    # Every worker trains one model at a time: its share of the cores only
+    threadpool_limits(threads)
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    study = create_study(storage, study_name, pruning, seed)
+    study.optimize(
+        objective,
+        # Stop once the study as a whole reaches its budget
+        callbacks=[
+            MaxTrialsCallback(
+                total_trials, states=(TrialState.COMPLETE, TrialState.PRUNED)
+            )
+        ],
+    )
+
+
+def run_study(
+    objective: Callable,
+    n_trials: int,
+    workers: int = 1,
+    storage: str = OPTUNA_STORAGE,
+    study_name: str = STUDY_NAME,
+    pruning: bool = True,
+    seed: Optional[int] = None,
+) -> optuna.Study:
+    """
+    Add `n_trials` finished trials to the study, running them in `workers`
+    spawned processes that share it through `storage`.
+
+    Trials already in the study are kept, so an interrupted or finished
+    study is resumed or extended by running again with the same name.
+    `objective` must be importable by the workers (a module-level function).
+    Each worker's seed is offset so they do not sample the same points.
+    """
+    study = create_study(storage, study_name, pruning, seed)
+    total_trials = _finished_trials(study) + n_trials
+    start = time.perf_counter()
+
+    if workers <= 1:
+        _optimize(
+            objective, storage, study_name, pruning, total_trials, os.cpu_count(), seed
+        )
+    else:
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        context = mp.get_context("spawn")
+        processes = [
+            context.Process(
+                target=_optimize,
+                args=(
+                    objective,
+                    storage,
+                    study_name,
+                    pruning,
+                    total_trials,
+                    threads,
+                    None if seed is None else seed + index,
+                ),
+            )
+            for index in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        failed = [process.exitcode for process in processes if process.exitcode]
+        if failed:
+            raise RuntimeError(f"{len(failed)} Optuna worker(s) failed: {failed}")
+
+    study = create_study(storage, study_name, pruning, seed)
+    pruned = len(study.get_trials(states=(TrialState.PRUNED,)))
+    print(
+        f"[INFO] Study {study_name}: {_finished_trials(study)} trials "
+        f"({pruned} pruned) after {time.perf_counter() - start:.1f}s "
+        f"with {workers} worker(s)."
+    )
+    return study
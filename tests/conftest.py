@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Add project root and API root to sys.path for imports
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "api"))
+
+from benchmarks.synthetic import (  # noqa: E402
+    CATEGORICAL_COLS,
+    NUMERICAL_COLS,
+    TARGET_COL,
+    make_flights,
+)
+
+
+@pytest.fixture(scope="session")
+def synthetic_flights() -> pd.DataFrame:
+    return make_flights()
+
+
+@pytest.fixture(scope="session")
+def fitted_preprocessor(synthetic_flights):
+    from ml.training.preprocessing import preprocessing
+
+    X, y, preprocessor = preprocessing(
+        synthetic_flights,
+        NUMERICAL_COLS,
+        CATEGORICAL_COLS,
+        synthetic_flights[TARGET_COL],
+    )
+    return X, y, preprocessor
@@ -0,0 +1,84 @@
+import json
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, inspect
+
+from benchmarks.synthetic import FEATURE_COLS, fit_model, make_flights
+from ml.scoring.batch_score import ParquetOutput, TableOutput, score
+
+# ───────────────────────────────────────────────────────────────
+# Test: Offline Batch Scoring
+# ───────────────────────────────────────────────────────────────
+
+
+def test_score_file_in_parallel_chunks_and_resume(tmp_path):
+    """
+    Ensure a CSV is scored chunk by chunk on a process pool with the same
+    results as the model, and that a rerun only scores missing chunks.
+    """
+    model, preprocessor = fit_model("lightgbm", n=2000, lgbm_n_estimators=20)
+    joblib.dump(model, tmp_path / "lightgbm_model.pkl")
+    joblib.dump(preprocessor, tmp_path / "lightgbm_preprocessor.pkl")
+    flights = make_flights(1000, seed=5)[FEATURE_COLS]
+    flights.to_csv(tmp_path / "flights.csv", index=False)
+
+    output = ParquetOutput(str(tmp_path / "predictions"))
+    kwargs = dict(
+        source=str(tmp_path / "flights.csv"),
+        output=output,
+        chunk_size=300,
+        workers=2,
+        models_dir=str(tmp_path),
+    )
+    stats = score("lightgbm", **kwargs)
+    assert stats["rows"] == 1000 and stats["chunks"] == 4
+
+    result = pd.read_parquet(output.directory).sort_values("row")
+    expected = model.predict_proba(preprocessor.transform(flights))[:, 1]
+    np.testing.assert_allclose(result["delay_probability"], expected)
+    assert result["row"].tolist() == list(range(1000))
+
+    # Simulate an interruption before the last chunk was recorded
+    with open(output.checkpoint_path) as f:
+        checkpoint = json.load(f)
+    checkpoint["completed"].remove(3)
+    with open(output.checkpoint_path, "w") as f:
+        json.dump(checkpoint, f)
+    os.remove(os.path.join(output.directory, "part-000003.parquet"))
+
+    resumed = score("lightgbm", **kwargs)
+    assert resumed["rows"] == 100
+    assert len(pd.read_parquet(output.directory)) == 1000
+
+
+def test_table_output_only_drops_its_own_tables(tmp_path, monkeypatch):
+    """
+    Ensure application tables are rejected as outputs, other tables are
+    never dropped, and table names are quoted rather than pasted into SQL.
+    """
+    import ml.scoring.batch_score as batch_score
+
+    engine = create_engine("sqlite:///" + str(tmp_path / "scores.db"))
+    monkeypatch.setattr(batch_score, "engine", engine)
+    for table in ("flights", "airlines", "airports"):
+        with pytest.raises(ValueError):
+            TableOutput(table)
+
+    pd.DataFrame({"id": [1]}).to_sql("reports", engine, index=False)
+    with pytest.raises(ValueError):
+        TableOutput("reports").reset()
+    assert inspect(engine).has_table("reports")
+
+    output = TableOutput('predictions"; DROP TABLE reports; --')
+    predictions = pd.DataFrame(
+        {"row": [0], "prediction": [1], "delay_probability": [0.7]}
+    ).assign(model_version="abc")
+    output.write(0, predictions)
+    output.write(0, predictions)
+    assert len(pd.read_sql_table(output.table, engine)) == 1
+    output.reset()
+    assert inspect(engine).get_table_names() == ["reports"]
@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.synthetic import (
+    CATEGORICAL_COLS,
+    FEATURE_COLS,
+    NUMERICAL_COLS,
+    TARGET_COL,
+    make_flights,
+    make_flights_db,
+)
+from ml.training.preprocessing import StreamingPreprocessorFit, preprocessing
+
+# ───────────────────────────────────────────────────────────────
+# Test: Out-of-core Training
+# ───────────────────────────────────────────────────────────────
+
+
+@pytest.mark.parametrize("mode", ["dense", "native"])
+def test_streaming_preprocessor_matches_in_memory_fit(synthetic_flights, mode):
+    """
+    Ensure a preprocessor fitted chunk by chunk transforms like one fitted
+    on the whole DataFrame.
+    """
+    _, _, expected = preprocessing(
+        synthetic_flights,
+        NUMERICAL_COLS,
+        CATEGORICAL_COLS,
+        synthetic_flights[TARGET_COL],
+        mode=mode,
+    )
+    stats = StreamingPreprocessorFit(NUMERICAL_COLS, CATEGORICAL_COLS, mode)
+    for start in range(0, len(synthetic_flights), 300):
+        stats.update(synthetic_flights.iloc[start : start + 300])
+    streamed = stats.build()
+
+    df = make_flights(200, seed=9)[FEATURE_COLS]
+    df.loc[::4, "crs_dep_time"] = np.nan
+    df.loc[::5, "origin"] = None
+    np.testing.assert_allclose(
+        streamed.transform(df), expected.transform(df), rtol=0, atol=1e-12
+    )
+
+
+def test_chunked_training_covers_the_whole_table(tmp_path, monkeypatch):
+    """
+    Ensure chunked training sees every labelled, non-cancelled flight and
+    saves a model that scores the preprocessor's output.
+    """
+    pytest.importorskip("mlflow")
+    import database.services.flight_service as flight_service
+    from ml.training.train_chunked import train_model_chunked
+
+    engine = make_flights_db(str(tmp_path / "flights.db"), n=5000)
+    monkeypatch.setattr(flight_service, "engine", engine)
+    expected_rows = pd.read_sql(
+        "SELECT COUNT(*) AS n FROM flights "
+        "WHERE arr_del15 IS NOT NULL AND cancelled = 0",
+        engine,
+    )["n"][0]
+
+    model, preprocessor, metrics, _ = train_model_chunked(
+        {"model_type": "lightgbm", "lgbm_chunk_rounds": 5},
+        chunksize=1000,
+        models_dir=str(tmp_path / "models"),
+    )
+
+    assert metrics["train_rows"] + metrics["test_rows"] == expected_rows
+    assert model.booster_.num_trees() == 5 * 5  # rounds x chunks
+    X = preprocessor.transform(make_flights(10, seed=1)[FEATURE_COLS])
+    assert model.predict_proba(X).shape == (10, 2)
+
+
+def sort_flights_by_label(engine) -> None:
+    """Rewrite the flights table with its rows (and ids) in label order."""
+    from sqlalchemy import text
+
+    flights = pd.read_sql("SELECT * FROM flights", engine)
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM flights"))
+        flights.sort_values("arr_del15").drop(columns="id").to_sql(
+            "flights", connection, if_exists="append", index=False
+        )
+
+
+def test_training_chunks_mix_classes_whatever_the_table_order(tmp_path, monkeypatch):
+    """
+    Ensure shuffled training chunks hold both classes on a table stored in
+    label order, and come in the same order on every pass.
+    """
+    import database.services.flight_service as flight_service
+
+    engine = make_flights_db(str(tmp_path / "flights.db"), n=5000)
+    sort_flights_by_label(engine)
+    monkeypatch.setattr(flight_service, "engine", engine)
+
+    chunks = list(flight_service.iter_training_chunks(500))
+
+    assert all(chunk[TARGET_COL].nunique() == 2 for chunk in chunks)
+    again = pd.concat(flight_service.iter_training_chunks(500), ignore_index=True)
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), again)
+    unordered = pd.concat(flight_service.iter_training_chunks(500, shuffle=False))
+    assert len(unordered) == len(again)
+
+
+@pytest.mark.parametrize("model_type", ["lightgbm", "logistic_regression"])
+def test_chunked_training_fits_label_sorted_chunks(model_type, monkeypatch, tmp_path):
+    """
+    Ensure chunked training copes with chunks that hold a single class (a
+    source in label order) and saves a model of both classes.
+    """
+    pytest.importorskip("mlflow")
+    import ml.training.train_chunked as train_chunked
+
+    df = make_flights(3000, seed=4).sort_values(TARGET_COL, ignore_index=True)
+
+    def label_sorted_chunks(chunksize):
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start : start + chunksize].reset_index(drop=True)
+
+    monkeypatch.setattr(train_chunked, "iter_training_chunks", label_sorted_chunks)
+
+    model, preprocessor, metrics, _ = train_chunked.train_model_chunked(
+        {"model_type": model_type, "lgbm_chunk_rounds": 5},
+        chunksize=500,
+        models_dir=str(tmp_path / "models"),
+    )
+
+    assert metrics["train_rows"] + metrics["test_rows"] == len(df)
+    assert list(model.classes_) == [0, 1]
+    if model_type == "lightgbm":
+        # Chunks 1-2 hold only 0s: they are fitted together with chunk 3
+        assert model.booster_.num_trees() == 5 * 4
+    X = preprocessor.transform(make_flights(10, seed=1)[FEATURE_COLS])
+    assert model.predict_proba(X).shape == (10, 2)
@@ -0,0 +1,59 @@
+import pytest
+from benchmarks.synthetic import make_flights_db
+
+# ───────────────────────────────────────────────────────────────
+# Test: Concurrent Training of All Model Types
+# ───────────────────────────────────────────────────────────────
+
+
+def test_thread_limits_split_the_cores_between_multithreaded_models():
+    """
+    Ensure single-threaded models get one core and the others share the
+    rest, never dropping below one thread.
+    """
+    pytest.importorskip("mlflow")
+    from ml.training.train_model import MODEL_TYPES, thread_limits
+
+    assert thread_limits(MODEL_TYPES, cpus=9) == {
+        "random_forest": 4,
+        "logistic_regression": 1,
+        "lightgbm": 4,
+    }
+    assert set(thread_limits(MODEL_TYPES, cpus=1).values()) == {1}
+
+
+def test_concurrent_training_matches_sequential(tmp_path, monkeypatch):
+    """
+    Ensure models trained in worker processes come back to the parent with
+    the same scores as the sequential loop, in the order they were asked for.
+    """
+    pytest.importorskip("mlflow")
+    import database.services.flight_service as flight_service
+
+    # Workers inherit the working directory (feature cache, model files)
+    # and read the database from DATABASE_URL
+    monkeypatch.chdir(tmp_path)
+    db_path = str(tmp_path / "flights.db")
+    monkeypatch.setenv("DATABASE_URL", "sqlite:///" + db_path)
+    monkeypatch.setattr(flight_service, "engine", make_flights_db(db_path, n=4000))
+    (tmp_path / "ml" / "models_artifact").mkdir(parents=True)
+    from ml.training.train_model import train_all
+
+    params_list = [
+        {"model_type": "random_forest", "n_estimators": 10, "preprocessing": "sparse"},
+        {"model_type": "logistic_regression", "preprocessing": "sparse"},
+        {"model_type": "lightgbm", "lgbm_n_estimators": 20, "preprocessing": "native"},
+    ]
+    sequential = train_all([dict(p) for p in params_list])
+    concurrent = train_all([dict(p) for p in params_list], concurrent=True)
+
+    for expected, result in zip(sequential, concurrent):
+        params, model, preprocessor, metrics, _, profile = result
+        assert params == expected[0]  # class_weight set by the worker
+        assert metrics["f1_score"] == pytest.approx(expected[3]["f1_score"], abs=0.01)
+        assert metrics["training_seconds"] > 0
+        assert hasattr(model, "predict_proba")
+        assert {"model_fit", "evaluation", "artifact_dump"} <= {
+            stage["stage"] for stage in profile["stages"]
+        }
+        assert metrics["profile_model_fit_seconds"] > 0
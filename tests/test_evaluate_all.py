@@ -0,0 +1,60 @@
+import joblib
+import pytest
+from benchmarks.synthetic import FEATURE_COLS, TARGET_COL, fit_model, make_flights_db
+from sklearn.metrics import f1_score, log_loss
+
+# ───────────────────────────────────────────────────────────────
+# Test: Evaluating Every Model Artifact at Once
+# ───────────────────────────────────────────────────────────────
+
+
+def test_evaluate_all_in_parallel_matches_each_model_alone(tmp_path, monkeypatch):
+    """
+    Ensure every artifact is scored on the same test split, models with the
+    same preprocessor share one feature matrix, and worker processes give
+    the same metrics as scoring in-process.
+    """
+    import database.services.flight_service as flight_service
+    import ml.evaluation.evaluate as evaluate
+    from ml.training.preprocessing import split
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "assets").mkdir()
+    monkeypatch.setattr(evaluate, "ASSETS_DIR", str(tmp_path / "assets"))
+    engine = make_flights_db(str(tmp_path / "flights.db"), n=4000)
+    monkeypatch.setattr(flight_service, "engine", engine)
+
+    models_dir = tmp_path / "models"
+    models_dir.mkdir()
+    for model_type, mode, params in (
+        ("random_forest", "sparse", {"n_estimators": 10}),
+        ("logistic_regression", "sparse", {}),
+        ("lightgbm", "native", {"lgbm_n_estimators": 20}),
+    ):
+        model, preprocessor = fit_model(model_type, n=2000, mode=mode, **params)
+        joblib.dump(model, models_dir / f"{model_type}_model.pkl")
+        joblib.dump(preprocessor, models_dir / f"{model_type}_preprocessor.pkl")
+
+    sequential = evaluate.evaluate_all(models_dir=str(models_dir), workers=1)
+    parallel = evaluate.evaluate_all(models_dir=str(models_dir), workers=2)
+
+    assert sequential["timing"]["models"] == 3
+    # Both sparse preprocessors were fitted on the same data
+    assert sequential["timing"]["feature_matrices"] == 2
+    assert (tmp_path / "assets" / "model_comparison.csv").exists()
+    assert (tmp_path / "assets" / "model_comparison_confusion_matrices.png").exists()
+
+    df = flight_service.load_training_data()
+    for model_type in ("random_forest", "logistic_regression", "lightgbm"):
+        model, preprocessor = evaluate.load_artifacts(model_type, str(models_dir))
+        X = preprocessor.transform(df[FEATURE_COLS])
+        _, X_test, _, y_test = split(X, df[TARGET_COL].astype(int))
+        for result in (sequential, parallel):
+            row = result["report"].set_index("model").loc[model_type]
+            assert row["rows"] == len(y_test)
+            assert row["f1_score"] == pytest.approx(
+                f1_score(y_test, model.predict(X_test))
+            )
+            assert row["log_loss"] == pytest.approx(
+                log_loss(y_test, model.predict_proba(X_test)[:, 1]), rel=1e-6
+            )
@@ -0,0 +1,49 @@
+import numpy as np
+from benchmarks.synthetic import CATEGORICAL_COLS, NUMERICAL_COLS, TARGET_COL
+
+# ───────────────────────────────────────────────────────────────
+# Test: Feature-matrix Cache
+# ───────────────────────────────────────────────────────────────
+
+
+def test_feature_cache_reuses_split_until_an_input_changes(tmp_path, monkeypatch):
+    """
+    Ensure a second load is served memory-mapped from the cache without
+    querying the database, and that a new preprocessing mode or a modified
+    database file builds a new entry.
+    """
+    import database.services.flight_service as flight_service
+    from benchmarks.synthetic import make_flights_db
+    from ml.training import feature_cache
+
+    engine = make_flights_db(str(tmp_path / "flights.db"), n=3000)
+    monkeypatch.setattr(flight_service, "engine", engine)
+    loads = []
+
+    def counting_load(profiler=None):
+        loads.append(1)
+        return flight_service.load_training_data(profiler)
+
+    monkeypatch.setattr(feature_cache, "load_training_data", counting_load)
+    cache_dir = str(tmp_path / "cache")
+
+    def load(mode="sparse"):
+        return feature_cache.load_features(
+            NUMERICAL_COLS, CATEGORICAL_COLS, TARGET_COL, mode, cache_dir
+        )
+
+    first = load()
+    second = load()
+    assert len(loads) == 1
+    assert not second[0].data.flags.writeable  # a view on the mapped file
+    np.testing.assert_array_equal(first[0].toarray(), second[0].toarray())
+    np.testing.assert_array_equal(first[3], second[3])
+
+    native = load(mode="native")
+    assert len(loads) == 2
+    assert native[0].shape[1] == len(NUMERICAL_COLS) + len(CATEGORICAL_COLS)
+
+    with engine.begin() as connection:
+        connection.exec_driver_sql("UPDATE flights SET distance = distance + 1")
+    load()
+    assert len(loads) == 3
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.synthetic import (
+    CATEGORICAL_COLS,
+    FEATURE_COLS,
+    NUMERICAL_COLS,
+    TARGET_COL,
+    make_flights,
+)
+from scipy import sparse
+from services.feature_encoder import CompiledEncoder
+
+# ───────────────────────────────────────────────────────────────
+# Test: Compiled Encoder Parity
+# ───────────────────────────────────────────────────────────────
+
+
+def test_compiled_encoder_is_bit_identical(fitted_preprocessor):
+    """
+    Ensure the compiled encoder reproduces preprocessor.transform exactly,
+    including unseen categories.
+    """
+    _, _, preprocessor = fitted_preprocessor
+    encoder = CompiledEncoder.from_preprocessor(preprocessor)
+
+    df = make_flights(n=500, seed=1).drop(columns=["arr_del15"])
+    df.loc[::7, "origin"] = "ZZZ"  # unknown category, ignored by the encoder
+    records = df.to_dict("records")
+
+    expected = preprocessor.transform(pd.DataFrame(records))
+    actual = encoder.transform(records)
+
+    assert actual.dtype == expected.dtype
+    assert actual.shape == expected.shape
+    assert np.array_equal(actual, expected), "Compiled encoder output differs"
+
+
+def test_compiled_encoder_imputes_missing_values(fitted_preprocessor):
+    """
+    Ensure missing numeric and categorical values are imputed like SimpleImputer.
+    """
+    _, _, preprocessor = fitted_preprocessor
+    encoder = CompiledEncoder.from_preprocessor(preprocessor)
+
+    df = make_flights(n=50, seed=2).drop(columns=["arr_del15"]).astype(object)
+    df.loc[::3, "distance"] = np.nan
+    df.loc[::5, "dest"] = np.nan
+    records = df.to_dict("records")
+
+    expected = preprocessor.transform(pd.DataFrame(records))
+    assert np.array_equal(encoder.transform(records), expected)
+
+
+def test_compiled_encoder_reuses_output_buffer(fitted_preprocessor):
+    """
+    Ensure a preallocated buffer is overwritten rather than accumulated into.
+    """
+    _, _, preprocessor = fitted_preprocessor
+    encoder = CompiledEncoder.from_preprocessor(preprocessor)
+    records = make_flights(n=3, seed=3)[FEATURE_COLS].to_dict("records")
+
+    buffer = np.empty((3, encoder.n_features), dtype=encoder.dtype)
+    first = encoder.transform(records, out=buffer).copy()
+    second = encoder.transform(records, out=buffer)
+
+    assert second is buffer
+    assert np.array_equal(first, second)
+
+
+@pytest.mark.parametrize("mode", ["sparse", "native"])
+def test_compiled_encoder_matches_other_preprocessing_modes(synthetic_flights, mode):
+    """
+    Ensure sparse one-hot and ordinal preprocessors compile to the same
+    (dense) matrix as their transform, unknown categories included.
+    """
+    from ml.training.preprocessing import preprocessing
+
+    X, _, preprocessor = preprocessing(
+        synthetic_flights,
+        NUMERICAL_COLS,
+        CATEGORICAL_COLS,
+        synthetic_flights[TARGET_COL],
+        mode=mode,
+    )
+    assert sparse.issparse(X) == (mode == "sparse")
+    encoder = CompiledEncoder.from_preprocessor(preprocessor)
+
+    df = make_flights(n=200, seed=3).drop(columns=["arr_del15"])
+    df.loc[::7, "origin"] = "ZZZ"
+    records = df.to_dict("records")
+
+    expected = preprocessor.transform(pd.DataFrame(records))
+    if sparse.issparse(expected):
+        expected = expected.toarray()
+    assert np.array_equal(encoder.transform(records), expected)
+    assert np.array_equal(encoder.transform_encoded(*encoder.encode(records)), expected)
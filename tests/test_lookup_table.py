@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import FEATURE_COLS, fit_model, make_flights
+from services.lookup_table import LookupTable, load_combinations
+from services.model_registry import LoadedModel, ModelRegistry
+from services.prediction_cache import make_key
+
+# ───────────────────────────────────────────────────────────────
+# Test: Precomputed Lookup Table
+# ───────────────────────────────────────────────────────────────
+
+
+def test_lookup_table_matches_live_scores_and_flags_misses():
+    """
+    Ensure known combinations return exactly the live prediction, duplicates
+    collapse, and unseen combinations are reported as misses.
+    """
+    model, preprocessor = fit_model("lightgbm", n=2000, lgbm_n_estimators=20)
+    loaded = LoadedModel("lightgbm", "v1", model, preprocessor)
+    known = make_flights(200, seed=1)[FEATURE_COLS].to_dict("records")
+    unseen = make_flights(50, seed=2)[FEATURE_COLS].to_dict("records")
+
+    table = LookupTable.build(loaded, known + known[:10])
+    assert len(table) == len({make_key(r) for r in known})
+
+    records = known[:30] + unseen
+    found, labels, probas = table.lookup([make_key(r) for r in records])
+    live_labels, live_probas = loaded.score(records)
+
+    unseen_keys = {make_key(r) for r in unseen} - {make_key(r) for r in known}
+    expected_found = [make_key(r) not in unseen_keys for r in records]
+    np.testing.assert_array_equal(found, expected_found)
+    np.testing.assert_allclose(probas[found], live_probas[found], atol=1e-12)
+    np.testing.assert_array_equal(labels[found], live_labels[found])
+
+
+def test_registry_rebuilds_lookup_table_for_each_version(tmp_path):
+    """
+    Ensure every activated version gets its own table, scored by that version.
+    """
+    combos = make_flights(100, seed=3)[FEATURE_COLS]
+    lookup_path = tmp_path / "frequent_combinations.csv"
+    combos.to_csv(lookup_path, index=False)
+    registry = ModelRegistry(
+        "lightgbm", "unused", "unused", lookup_path=str(lookup_path)
+    )
+
+    tables = []
+    for seed in (0, 1):
+        model, preprocessor = fit_model(
+            "lightgbm", n=2000, seed=seed, lgbm_n_estimators=20
+        )
+        loaded = registry.activate(
+            LoadedModel("lightgbm", f"v{seed}", model, preprocessor)
+        )
+        assert loaded.lookup is not None and len(loaded.lookup) == 100
+        expected = model.predict_proba(preprocessor.transform(pd.DataFrame(combos)))[
+            :, 1
+        ]
+        np.testing.assert_allclose(np.sort(loaded.lookup.probas), np.sort(expected))
+        tables.append(loaded.lookup)
+
+    assert not np.array_equal(np.sort(tables[0].probas), np.sort(tables[1].probas))
+
+
+def test_lookup_table_confirms_keys_on_hash_matches(tmp_path):
+    """
+    Ensure a combination whose hash equals a stored one (hash(-1.0) ==
+    hash(-2.0)) is a miss, and that codes such as "NA" load as strings.
+    """
+    flights = make_flights(20, seed=3)[FEATURE_COLS]
+    flights.loc[0, "origin"] = "NA"
+    flights.loc[0, "month"] = -1
+    flights.to_csv(tmp_path / "combinations.csv", index=False)
+    records = load_combinations(str(tmp_path / "combinations.csv"))
+    assert records[0]["origin"] == "NA"
+
+    model, preprocessor = fit_model("lightgbm", n=2000, lgbm_n_estimators=20)
+    loaded = LoadedModel("lightgbm", "v1", model, preprocessor)
+    table = LookupTable.build(loaded, records)
+    colliding = dict(records[0], month=-2)
+    assert hash(make_key(colliding)) == hash(make_key(records[0]))
+
+    found, _, _ = table.lookup([make_key(records[0]), make_key(colliding)])
+    np.testing.assert_array_equal(found, [True, False])
@@ -0,0 +1,62 @@
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.microbench import compare, time_call
+
+# ───────────────────────────────────────────────────────────────
+# Test: Micro-benchmark Baselines
+# ───────────────────────────────────────────────────────────────
+
+
+def _results(**medians):
+    return {
+        "meta": {"artifacts": {}},
+        "results": {name: {"median_seconds": s} for name, s in medians.items()},
+    }
+
+
+def test_compare_flags_slowdowns_over_the_threshold_only():
+    """
+    Ensure only entries slower than the baseline by more than the threshold
+    are regressions, ignoring entries too fast to time reliably and
+    entries missing from either run.
+    """
+    baseline = _results(slower=0.010, faster=0.010, noise=1e-6, dropped=1.0)
+    current = _results(slower=0.013, faster=0.005, noise=1e-5, added=1.0)
+
+    rows = {row["name"]: row for row in compare(baseline, current, threshold=0.2)}
+
+    assert set(rows) == {"slower", "faster", "noise"}
+    assert rows["slower"]["regression"]
+    assert abs(rows["slower"]["change"] - 0.3) < 1e-9
+    assert not rows["faster"]["regression"]
+    assert not rows["noise"]["regression"]
+    assert not compare(baseline, current, threshold=0.5)[0]["regression"]
+
+
+def test_time_call_repeats_and_reports_throughput():
+    """Ensure the warm-up call is not timed and throughput is rows / median."""
+    calls = []
+    stats = time_call(lambda: calls.append(1), rows=100, repeats=5, min_seconds=0)
+
+    assert stats["repeats"] == 5 and len(calls) == 6
+    assert stats["rows_per_second"] == 100 / stats["median_seconds"]
+
+
+def test_compare_without_a_baseline_is_not_an_error(tmp_path):
+    """Ensure a fresh checkout, with no recorded baseline, does not fail."""
+    current = tmp_path / "current.json"
+    current.write_text(json.dumps(_results(entry=0.01)))
+    root = os.path.join(os.path.dirname(__file__), "..")
+    script = os.path.join(root, "benchmarks", "microbench.py")
+
+    result = subprocess.run(
+        [sys.executable, script, "compare", str(tmp_path / "missing.json"), current],
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0
+    assert "make bench-micro-baseline" in result.stdout
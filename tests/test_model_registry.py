@@ -0,0 +1,152 @@
+import joblib
+import numpy as np
+
+from benchmarks.synthetic import FEATURE_COLS, fit_model, make_flights
+from services.model_artifact import artifact_dir, export_from_pickles
+from services.model_registry import ModelRegistry
+
+# ───────────────────────────────────────────────────────────────
+# Test: Model Registry
+# ───────────────────────────────────────────────────────────────
+
+
+def _write_artifacts(directory, seed):
+    model, preprocessor = fit_model("lightgbm", n=2000, seed=seed, lgbm_n_estimators=20)
+    model_path = directory / "lightgbm_model.pkl"
+    preprocessor_path = directory / "lightgbm_preprocessor.pkl"
+    joblib.dump(model, model_path)
+    joblib.dump(preprocessor, preprocessor_path)
+    return str(model_path), str(preprocessor_path)
+
+
+def test_registry_swaps_versions_without_touching_in_flight_snapshots(tmp_path):
+    """
+    Ensure a reload activates a new version, notifies listeners, and leaves
+    the previously active snapshot usable for requests still holding it.
+    """
+    records = make_flights(50, seed=7)[FEATURE_COLS].to_dict("records")
+    model_path, preprocessor_path = _write_artifacts(tmp_path, seed=0)
+    registry = ModelRegistry("lightgbm", model_path, preprocessor_path)
+    swapped = []
+    registry.on_swap(lambda loaded: swapped.append(loaded.version))
+
+    first = registry.load()
+    _, before = first.score(records)
+
+    _write_artifacts(tmp_path, seed=1)
+    second = registry.load()
+
+    assert registry.current() is second
+    assert second.version != first.version
+    assert swapped == [first.version, second.version]
+
+    # The old snapshot still scores exactly as it did before the swap
+    _, after = first.score(records)
+    np.testing.assert_array_equal(before, after)
+
+
+def test_registry_prefers_current_memory_mapped_artifact(tmp_path):
+    """
+    Ensure an exported artifact is memory-mapped and scores like the pickles,
+    and that a stale export is ignored once the pickles change.
+    """
+    records = make_flights(50, seed=7)[FEATURE_COLS].to_dict("records")
+    model_path, preprocessor_path = _write_artifacts(tmp_path, seed=0)
+    export_from_pickles(str(tmp_path), "lightgbm")
+    mmap_dir = artifact_dir(str(tmp_path), "lightgbm")
+
+    pickled = ModelRegistry("lightgbm", model_path, preprocessor_path).load()
+    mapped = ModelRegistry("lightgbm", model_path, preprocessor_path, mmap_dir).load()
+
+    assert mapped.source == "mmap"
+    assert mapped.version == pickled.version
+    assert isinstance(mapped.compiled.threshold, np.memmap)
+    np.testing.assert_allclose(
+        mapped.score(records)[1], pickled.score(records)[1], atol=1e-12
+    )
+
+    _write_artifacts(tmp_path, seed=1)
+    reloaded = ModelRegistry("lightgbm", model_path, preprocessor_path, mmap_dir).load()
+    assert reloaded.source == "joblib"
+    assert reloaded.version != mapped.version
+
+
+def test_native_categorical_lightgbm_serves_from_memory_mapped_artifact(tmp_path):
+    """
+    Ensure a LightGBM model trained on native integer-coded categoricals
+    scores like model + saved preprocessor through the compiled artifact.
+    """
+    model, preprocessor = fit_model(
+        "lightgbm", n=3000, mode="native", lgbm_n_estimators=30
+    )
+    model_path = str(tmp_path / "lightgbm_model.pkl")
+    preprocessor_path = str(tmp_path / "lightgbm_preprocessor.pkl")
+    joblib.dump(model, model_path)
+    joblib.dump(preprocessor, preprocessor_path)
+    export_from_pickles(str(tmp_path), "lightgbm")
+
+    mapped = ModelRegistry(
+        "lightgbm",
+        model_path,
+        preprocessor_path,
+        artifact_dir(str(tmp_path), "lightgbm"),
+    ).load()
+    assert mapped.source == "mmap"
+    assert mapped.compiled.has_categorical
+
+    df = make_flights(200, seed=5)[FEATURE_COLS]
+    df.loc[::9, "dest"] = "ZZZ"  # unknown category: LightGBM treats it as missing
+    expected = model.predict_proba(preprocessor.transform(df))[:, 1]
+    _, probas = mapped.score(df.to_dict("records"))
+    np.testing.assert_allclose(probas, expected, atol=1e-12)
+
+
+def test_warm_up_is_not_recorded_in_inference_metrics(tmp_path):
+    """
+    Ensure loading (and so warming up) a model leaves the batch size and
+    stage latency histograms untouched, while real scoring is recorded.
+    """
+    from prometheus_client import REGISTRY
+
+    def observations():
+        return [
+            REGISTRY.get_sample_value("inference_batch_size_count") or 0,
+            REGISTRY.get_sample_value(
+                "inference_stage_duration_seconds_count", {"stage": "scoring"}
+            )
+            or 0,
+        ]
+
+    model_path, preprocessor_path = _write_artifacts(tmp_path, seed=0)
+    before = observations()
+    loaded = ModelRegistry("lightgbm", model_path, preprocessor_path).load()
+    assert observations() == before
+
+    loaded.score(make_flights(5, seed=7)[FEATURE_COLS].to_dict("records"))
+    assert observations() == [count + 1 for count in before]
+
+
+def test_admin_routes_are_closed_without_a_token(monkeypatch):
+    """
+    Ensure /admin answers 403 while ADMIN_TOKEN is unset, and once it is set
+    only to requests sending it back.
+    """
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from endpoints import admin
+
+    app = FastAPI()
+    app.include_router(admin.router)
+    client = TestClient(app)
+
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", None)
+    assert client.get("/admin/models").status_code == 403
+    assert client.post("/admin/models/reload").status_code == 403
+
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    assert client.get("/admin/models").status_code == 403
+    wrong = client.get("/admin/models", headers={"X-Admin-Token": "guess"})
+    assert wrong.status_code == 403
+    allowed = client.get("/admin/models", headers={"X-Admin-Token": "secret"})
+    assert allowed.status_code == 200
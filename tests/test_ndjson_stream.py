@@ -0,0 +1,80 @@
+import asyncio
+import json
+
+from benchmarks.synthetic import FEATURE_COLS, fit_model, make_flights
+from services.ndjson import LineTooLong, iter_lines
+
+# ───────────────────────────────────────────────────────────────
+# Test: NDJSON Streaming
+# ───────────────────────────────────────────────────────────────
+
+
+async def _chunks(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def _collect(*chunks, max_line_bytes=64):
+    async def run():
+        return [item async for item in iter_lines(_chunks(*chunks), max_line_bytes)]
+
+    return asyncio.run(run())
+
+
+def test_iter_lines_reassembles_lines_split_across_chunks():
+    """
+    Ensure lines are rebuilt across chunk boundaries, blank lines are skipped
+    and a final line without a trailing newline is still emitted.
+    """
+    lines = _collect(b'{"a": ', b'1}\n\n{"b"', b": 2}\n", b'{"c": 3}')
+    assert lines == [(1, b'{"a": 1}'), (3, b'{"b": 2}'), (4, b'{"c": 3}')]
+
+
+def test_iter_lines_reports_oversized_lines_and_continues():
+    """
+    Ensure an oversized line becomes a LineTooLong marker without buffering
+    it, and the following lines keep their numbers.
+    """
+    lines = _collect(b"x" * 50, b"y" * 50, b"z" * 50 + b"\n", b'{"ok": 1}\n')
+
+    assert len(lines) == 2
+    assert lines[0][0] == 1 and isinstance(lines[0][1], LineTooLong)
+    assert lines[1] == (2, b'{"ok": 1}')
+
+
+def test_predict_stream_scores_lines_and_reports_bad_ones(monkeypatch):
+    """
+    Ensure /predict/stream returns one NDJSON record per input line, in order,
+    with predictions for valid flights and errors for invalid lines.
+    """
+    from fastapi.testclient import TestClient
+
+    from endpoints import predict
+    from main import app
+    from services import prediction_service
+
+    model, preprocessor = fit_model("lightgbm", n=2000, lgbm_n_estimators=20)
+    prediction_service.set_model(model, preprocessor, version="test")
+    monkeypatch.setattr(predict, "STREAM_CHUNK_SIZE", 2)
+
+    flights = make_flights(3, seed=3)[FEATURE_COLS].to_dict("records")
+    body = "\n".join(
+        [
+            json.dumps(flights[0]),
+            "not json",
+            json.dumps({"month": 1}),
+            json.dumps(flights[1]),
+            json.dumps(flights[2]),
+        ]
+    )
+
+    with TestClient(app) as client:
+        response = client.post("/predict/stream", content=body)
+
+    assert response.status_code == 200
+    assert response.headers["X-Model-Version"] == "test"
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["line"] for r in results] == [1, 2, 3, 4, 5]
+    assert [("errors" in r) for r in results] == [False, True, True, False, False]
+    assert results[1]["errors"][0]["type"] == "json_invalid"
+    assert 0.0 <= results[0]["delay_probability"] <= 1.0
@@ -0,0 +1,56 @@
+from services.prediction_cache import PredictionCache, make_key
+
+# ───────────────────────────────────────────────────────────────
+# Test: Prediction Cache
+# ───────────────────────────────────────────────────────────────
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_evicts_least_recently_used_entry():
+    """
+    Ensure the cache stays bounded and evicts the least recently used key.
+    """
+    cache = PredictionCache(maxsize=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_entries_expire_after_ttl():
+    """
+    Ensure entries older than the TTL are reported as misses.
+    """
+    clock = FakeClock()
+    cache = PredictionCache(maxsize=10, ttl=5, clock=clock)
+    cache.put("a", 1)
+
+    clock.now = 4.9
+    assert cache.get("a") == 1
+    clock.now = 5.0
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 0)
+
+
+def test_make_key_normalizes_numbers_and_field_order():
+    """
+    Ensure equivalent feature dicts share one cache key.
+    """
+    first = {"month": 5, "distance": 500, "origin": "JFK"}
+    second = {"origin": "JFK", "distance": 500.0, "month": 5.0}
+    assert make_key(first) == make_key(second)
+    assert make_key(first) != make_key({**first, "origin": "LAX"})
@@ -0,0 +1,46 @@
+import joblib
+import numpy as np
+
+from benchmarks.synthetic import FEATURE_COLS, fit_model, make_flights
+from services.model_registry import ModelRegistry
+from services.process_backend import ProcessBackend
+
+# ───────────────────────────────────────────────────────────────
+# Test: Process-pool Inference Backend
+# ───────────────────────────────────────────────────────────────
+
+
+def test_process_backend_matches_in_process_scoring(tmp_path):
+    """
+    Ensure batches encoded in the parent and scored by worker processes
+    (including batches split across workers) match in-process scoring.
+    """
+    model, preprocessor = fit_model("lightgbm", n=2000, lgbm_n_estimators=20)
+    model_path = str(tmp_path / "lightgbm_model.pkl")
+    preprocessor_path = str(tmp_path / "lightgbm_preprocessor.pkl")
+    joblib.dump(model, model_path)
+    joblib.dump(preprocessor, preprocessor_path)
+
+    loaded = ModelRegistry("lightgbm", model_path, preprocessor_path).load()
+    records = make_flights(300, seed=7)[FEATURE_COLS].to_dict("records")
+
+    # The compact encoding expands to exactly the preprocessor's output
+    np.testing.assert_array_equal(
+        loaded.encoder.transform_encoded(*loaded.encoder.encode(records)),
+        loaded.transform(records),
+    )
+
+    backend = ProcessBackend(
+        {"lightgbm": (model_path, preprocessor_path, None)},
+        workers=2,
+        split_size=100,
+    )
+    backend.start()
+    try:
+        labels, probas = backend.score(loaded, records)
+    finally:
+        backend.stop()
+
+    expected_labels, expected_probas = loaded.score(records)
+    np.testing.assert_array_equal(labels, expected_labels)
+    np.testing.assert_allclose(probas, expected_probas, atol=1e-12)
@@ -0,0 +1,96 @@
+import tracemalloc
+
+import numpy as np
+from benchmarks.synthetic import (
+    CATEGORICAL_COLS,
+    NUMERICAL_COLS,
+    TARGET_COL,
+    make_flights_db,
+)
+from ml.training.profiling import StageProfiler, format_profile
+
+# ───────────────────────────────────────────────────────────────
+# Test: Training Pipeline Profiling
+# ───────────────────────────────────────────────────────────────
+
+
+def test_stage_profiler_records_time_and_memory_per_stage():
+    """
+    Ensure each stage gets its own duration, RSS growth and traced peak,
+    repeated stages accumulate, and tracemalloc is stopped again afterwards.
+    """
+    profiler = StageProfiler(trace_memory=True)
+    with profiler.stage("allocate"):
+        block = np.ones(5_000_000)  # 40 MB
+        del block
+    with profiler.stage("small"):
+        np.ones(1000)
+    with profiler.stage("small"):
+        np.ones(1000)
+
+    assert not tracemalloc.is_tracing()
+    assert list(profiler.stages) == ["allocate", "small"]
+    assert profiler.stages["allocate"]["traced_peak_mb"] >= 38
+    assert profiler.stages["small"]["traced_peak_mb"] < 1
+    assert all(stats["rss_growth_mb"] >= 0 for stats in profiler.stages.values())
+
+    metrics = profiler.metrics()
+    assert metrics["profile_allocate_traced_peak_mb"] >= 38
+    assert metrics["profile_total_seconds"] >= metrics["profile_small_seconds"]
+    assert metrics["profile_peak_rss_mb"] > 0
+
+    summary = profiler.summary(run="test")
+    assert [s["stage"] for s in summary["stages"]] == ["allocate", "small"]
+    assert summary["untracked_seconds"] >= 0
+    assert "allocate" in format_profile(summary)
+
+
+def test_rss_growth_is_charged_to_the_stage_that_raised_the_peak():
+    """
+    Ensure a stage that stays under the peak reached by an earlier stage
+    reports no growth, instead of the process-wide peak.
+    """
+    profiler = StageProfiler(trace_memory=False)
+    with profiler.stage("large"):
+        block = np.ones(20_000_000)  # 160 MB
+        block += 1
+        del block
+    with profiler.stage("small"):
+        block = np.ones(1_000_000)
+        block += 1
+
+    assert profiler.stages["large"]["rss_growth_mb"] >= 100
+    assert profiler.stages["small"]["rss_growth_mb"] == 0
+    assert "RSS growth MB" in format_profile(profiler.summary())
+
+
+def test_feature_loading_reports_the_data_stages(tmp_path, monkeypatch):
+    """
+    Ensure an uncached feature build times the SQL load, dropna, sampling,
+    fit_transform and split separately.
+    """
+    import database.services.flight_service as flight_service
+    from ml.training.feature_cache import load_features
+
+    engine = make_flights_db(str(tmp_path / "flights.db"), n=3000)
+    monkeypatch.setattr(flight_service, "engine", engine)
+
+    profiler = StageProfiler(trace_memory=False)
+    load_features(
+        NUMERICAL_COLS,
+        CATEGORICAL_COLS,
+        TARGET_COL,
+        mode="sparse",
+        cache_dir=None,
+        profiler=profiler,
+    )
+
+    assert list(profiler.stages) == [
+        "sql_load",
+        "dropna",
+        "sampling",
+        "fit_transform",
+        "split",
+    ]
+    assert all(stats["seconds"] > 0 for stats in profiler.stages.values())
+    assert "traced_peak_mb" not in profiler.stages["sql_load"]
@@ -0,0 +1,135 @@
+import os
+
+import pytest
+from benchmarks.synthetic import make_flights_db
+from sqlalchemy import create_engine, inspect, text
+
+# ───────────────────────────────────────────────────────────────
+# Test: Flights Indexes and Query Plans
+# ───────────────────────────────────────────────────────────────
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def query_plan(engine, query: str, params=None) -> str:
+    """SQLite's EXPLAIN QUERY PLAN details, one step per line."""
+    with engine.connect() as connection:
+        rows = connection.execute(text("EXPLAIN QUERY PLAN " + query), params or {})
+        return "\n".join(row[3] for row in rows)
+
+
+@pytest.fixture(scope="module", params=[False, True], ids=["no-stats", "analyzed"])
+def flights_engine(request, tmp_path_factory):
+    """
+    Synthetic database with the model's indexes, with and without ANALYZE
+    statistics (which change SQLite's join order). Enough airports for the
+    statistics to make per-route lookups look cheap.
+    """
+    path = str(tmp_path_factory.mktemp("plans") / "flights.db")
+    airports = [f"A{i:03}" for i in range(50)]
+    engine = make_flights_db(path, n=50_000, airports=airports)
+    if request.param:
+        with engine.begin() as connection:
+            connection.execute(text("ANALYZE"))
+    return engine
+
+
+def test_training_query_reads_the_covering_partial_index(flights_engine):
+    """
+    Ensure the training query reads ix_flights_training in one pass, never
+    the flights table, and joins the dimension tables by primary key.
+    """
+    from database.services.flight_service import TRAINING_QUERY
+
+    outer, *joins = query_plan(flights_engine, TRAINING_QUERY).splitlines()
+
+    assert outer == "SCAN flights USING COVERING INDEX ix_flights_training"
+    assert all("USING INTEGER PRIMARY KEY" in join for join in joins)
+
+
+def test_training_query_does_not_return_rows_sorted_by_label(flights_engine):
+    """
+    Ensure the index the training query reads is not keyed on the label:
+    the first rows it returns hold both classes.
+    """
+    from database.services.flight_service import TRAINING_QUERY
+
+    with flights_engine.connect() as connection:
+        labels = [row.arr_del15 for row in connection.execute(text(TRAINING_QUERY))]
+
+    assert set(labels[:1000]) == {0.0, 1.0}
+
+
+def test_application_queries_never_read_flights_through_the_route_index(
+    flights_engine,
+):
+    """
+    Ensure the full-table queries (training chunks, sampling, frequent
+    combinations) are not turned into per-route lookups through
+    ix_flights_route, with or without statistics.
+    """
+    from database.services.flight_service import (
+        FREQUENT_COMBINATIONS_QUERY,
+        SAMPLE_QUERY,
+        TRAINING_QUERY,
+    )
+
+    for query, params in (
+        (TRAINING_QUERY, {}),
+        (SAMPLE_QUERY, {"n": 10}),
+        (FREQUENT_COMBINATIONS_QUERY, {"limit": 10}),
+    ):
+        assert "ix_flights_route" not in query_plan(flights_engine, query, params)
+
+
+def test_scoring_chunks_search_the_primary_key(flights_engine):
+    """Ensure batch scoring reads id ranges through the primary key."""
+    from database.services.flight_service import SCORING_QUERY
+
+    plan = query_plan(flights_engine, SCORING_QUERY, {"start_id": 1, "stop_id": 100})
+
+    assert "SEARCH flights USING INTEGER PRIMARY KEY (rowid>? AND rowid<?)" in plan
+
+
+def test_migrations_create_the_model_indexes(tmp_path):
+    """
+    Ensure upgrading an empty database to head creates the same flights
+    indexes as the models, and downgrading one step drops them.
+    """
+    from alembic import command
+    from alembic.config import Config
+
+    url = "sqlite:///" + str(tmp_path / "migrated.db")
+    config = Config()
+    config.set_main_option("script_location", os.path.join(ROOT, "database/migrations"))
+    config.set_main_option("sqlalchemy.url", url)
+    command.upgrade(config, "head")
+
+    engine = create_engine(url)
+    migrated = {ix["name"]: ix for ix in inspect(engine).get_indexes("flights")}
+    models = {
+        ix["name"]: ix
+        for ix in inspect(
+            make_flights_db(str(tmp_path / "models.db"), n=10)
+        ).get_indexes("flights")
+    }
+    assert (
+        set(migrated)
+        == set(models)
+        == {
+            "ix_flights_airline_id",
+            "ix_flights_dest_id",
+            "ix_flights_route",
+            "ix_flights_training",
+        }
+    )
+    for name, index in models.items():
+        assert migrated[name]["column_names"] == index["column_names"]
+    with engine.connect() as connection:
+        (sql,) = connection.execute(
+            text("SELECT sql FROM sqlite_master WHERE name = 'ix_flights_training'")
+        ).one()
+    assert "WHERE arr_del15 IS NOT NULL AND cancelled = 0" in sql
+
+    command.downgrade(config, "-1")
+    assert inspect(create_engine(url)).get_indexes("flights") == []
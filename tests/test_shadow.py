@@ -0,0 +1,58 @@
+import json
+import logging
+
+from benchmarks.synthetic import FEATURE_COLS, fit_model, make_flights
+from services.model_registry import LoadedModel, ModelRegistry
+from services.shadow import ShadowScorer
+
+# ───────────────────────────────────────────────────────────────
+# Test: Shadow Scoring
+# ───────────────────────────────────────────────────────────────
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(json.loads(record.getMessage()))
+
+
+def _registry(name, model_type, **params):
+    registry = ModelRegistry(name, "unused.pkl", "unused.pkl")
+    model, preprocessor = fit_model(model_type, n=2000, **params)
+    registry.activate(LoadedModel(name, f"{name}-v1", model, preprocessor))
+    return registry
+
+
+def test_shadow_scorer_logs_primary_and_shadow_outputs():
+    """
+    Ensure submitted primary results are scored by the shadow model in the
+    background and logged side by side, and that the shadow model's own
+    traffic is never shadowed.
+    """
+    primary = _registry("lightgbm", "lightgbm", lgbm_n_estimators=20)
+    secondary = _registry("random_forest", "random_forest", n_estimators=10)
+    handler = ListHandler()
+    logger = logging.getLogger("shadow-test")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+    shadow = ShadowScorer(secondary, logger=logger)
+    shadow.start()
+    records = make_flights(20, seed=2)[FEATURE_COLS].to_dict("records")
+    labels, probas = primary.current().score(records)
+
+    assert shadow.submit(primary.current(), records, labels, probas)
+    assert not shadow.submit(secondary.current(), records, labels, probas)
+    shadow.stop()
+
+    assert shadow.scored == 20 and len(handler.lines) == 20
+    expected = secondary.current().score(records)[1]
+    first = handler.lines[0]
+    assert first["features"] == records[0]
+    assert first["primary"]["model"] == "lightgbm"
+    assert first["primary"]["delay_probability"] == round(float(probas[0]), 4)
+    assert first["shadow"]["version"] == "random_forest-v1"
+    assert first["shadow"]["delay_probability"] == round(float(expected[0]), 4)
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from benchmarks.synthetic import make_flights
+from ml.evaluation.metrics import SLICE_DIMENSIONS, SlicedMetrics
+
+# ───────────────────────────────────────────────────────────────
+# Test: Sliced Metrics Engine
+# ───────────────────────────────────────────────────────────────
+
+
+@pytest.fixture(scope="module")
+def scored_flights():
+    df = make_flights(6000, seed=3)
+    rng = np.random.default_rng(3)
+    y_pred = np.where(rng.random(len(df)) < 0.8, df["arr_del15"], 1 - df["arr_del15"])
+    return df, df["arr_del15"].astype(int).to_numpy(), y_pred.astype(int)
+
+
+def _naive_slices(df, y_true, y_pred, columns):
+    """One boolean filter per slice value: the quadratic reference."""
+    key = df[list(columns)].astype(str).agg("-".join, axis=1)
+    counts = {}
+    for value in key.unique():
+        mask = (key == value).to_numpy()
+        t, p = y_true[mask], y_pred[mask]
+        counts[value] = (
+            int(np.sum((t == 0) & (p == 0))),
+            int(np.sum((t == 0) & (p == 1))),
+            int(np.sum((t == 1) & (p == 0))),
+            int(np.sum((t == 1) & (p == 1))),
+        )
+    return counts
+
+
+def test_sliced_counts_match_per_slice_filters(scored_flights):
+    """
+    Ensure every slice of every dimension gets the confusion counts a
+    per-slice filter would give, whether rows come in batches or merged.
+    """
+    df, y_true, y_pred = scored_flights
+    batched = SlicedMetrics()
+    for start in range(0, len(df), 1700):
+        rows = slice(start, start + 1700)
+        batched.update(df.iloc[rows], y_true[rows], y_pred[rows])
+    merged = SlicedMetrics()
+    merged.update(df.iloc[:2500], y_true[:2500], y_pred[:2500])
+    other = SlicedMetrics()
+    other.update(df.iloc[2500:], y_true[2500:], y_pred[2500:])
+    merged.merge(other)
+
+    for sliced in (batched, merged):
+        table = sliced.result(min_support=0)
+        for name, columns in SLICE_DIMENSIONS.items():
+            expected = _naive_slices(df, y_true, y_pred, columns)
+            rows = table[table["dimension"] == name]
+            got = {
+                str(row.slice): (row.tn, row.fp, row.fn, row.tp)
+                for row in rows.itertuples()
+            }
+            assert got == expected, name
+            assert rows["rows"].sum() == len(df)
+
+
+def test_slice_table_filters_support_and_orders_worst_first(scored_flights):
+    """
+    Ensure slices under the minimum support are dropped, and each
+    dimension lists its lowest F1 first with metrics matching its counts.
+    """
+    df, y_true, y_pred = scored_flights
+    sliced = SlicedMetrics({"route": ("origin", "dest"), "month": ("month",)})
+    sliced.update(df, y_true, y_pred)
+
+    table = sliced.result(min_support=70)
+    assert (table["rows"] >= 70).all()
+    assert set(table["dimension"]) == {"route", "month"}
+    assert len(table[table["dimension"] == "month"]) == 12
+    for _, group in table.groupby("dimension"):
+        assert group["f1_score"].is_monotonic_increasing
+
+    row = table.iloc[0]
+    assert row["precision"] == pytest.approx(row["tp"] / (row["tp"] + row["fp"]))
+    assert row["delay_rate"] == pytest.approx((row["tp"] + row["fn"]) / row["rows"])
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.synthetic import FEATURE_COLS, TARGET_COL, fit_model, make_flights_db
+from ml.evaluation.metrics import SlicedMetrics, StreamingMetrics
+from sklearn.metrics import (
+    confusion_matrix,
+    f1_score,
+    log_loss,
+    precision_score,
+    recall_score,
+    roc_auc_score,
+)
+
+# ───────────────────────────────────────────────────────────────
+# Test: Streaming Evaluation
+# ───────────────────────────────────────────────────────────────
+
+
+def test_streaming_metrics_match_sklearn_in_any_batching():
+    """
+    Ensure metrics accumulated batch by batch, or merged from separate
+    accumulators, equal sklearn's on the whole arrays.
+    """
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 2, 20_000)
+    proba = np.clip(0.3 * y + 0.7 * rng.random(20_000), 0, 1)
+    proba[:10] = [0.0, 1.0, 0.5, 0.5, 1e-20, 1 - 1e-20, 0.25, 0.75, 0.5, 0.9]
+
+    batched = StreamingMetrics()
+    for start in range(0, len(y), 3001):
+        batched.update(y[start : start + 3001], proba[start : start + 3001])
+    first, second = StreamingMetrics(), StreamingMetrics()
+    first.update(y[:7000], proba[:7000])
+    second.update(y[7000:], proba[7000:])
+    merged = first.merge(second)
+
+    y_pred = (proba > 0.5).astype(int)
+    for accumulator in (batched, merged):
+        result = accumulator.result()
+        expected_cm = confusion_matrix(y, y_pred)
+        np.testing.assert_array_equal(accumulator.confusion, expected_cm)
+        assert result["rows"] == len(y)
+        assert result["precision"] == pytest.approx(precision_score(y, y_pred))
+        assert result["recall"] == pytest.approx(recall_score(y, y_pred))
+        assert result["f1_score"] == pytest.approx(f1_score(y, y_pred))
+        assert result["roc_auc"] == pytest.approx(roc_auc_score(y, proba), abs=1e-4)
+        assert result["log_loss"] == pytest.approx(log_loss(y, proba), rel=1e-6)
+
+
+def test_streaming_metrics_with_a_single_class():
+    """Ensure ROC-AUC is undefined, not an error, when one class is missing."""
+    accumulator = StreamingMetrics()
+    accumulator.update(np.ones(5), np.full(5, 0.8))
+    result = accumulator.result()
+    assert np.isnan(result["roc_auc"])
+    assert result["recall"] == 1.0
+
+
+def test_streamed_evaluation_matches_scoring_the_whole_table(tmp_path, monkeypatch):
+    """
+    Ensure streaming the table through the fitted preprocessor and model
+    gives the same metrics as scoring all labelled rows at once.
+    """
+    import database.services.flight_service as flight_service
+    from ml.evaluation.evaluate import stream_metrics
+
+    engine = make_flights_db(str(tmp_path / "flights.db"), n=5000)
+    monkeypatch.setattr(flight_service, "engine", engine)
+    model, preprocessor = fit_model("lightgbm", n=3000, lgbm_n_estimators=20)
+
+    accumulator, sliced = StreamingMetrics(), SlicedMetrics()
+    timing = stream_metrics(
+        model,
+        preprocessor,
+        flight_service.iter_training_chunks(700),
+        accumulator,
+        sliced,
+    )
+
+    df = pd.concat(flight_service.iter_training_chunks(10_000))
+    X = preprocessor.transform(df[FEATURE_COLS])
+    y = df[TARGET_COL].astype(int)
+    result = accumulator.result()
+    assert timing["chunks"] == -(-len(df) // 700)
+    assert timing["rows_per_second"] > 0
+    assert result["rows"] == len(df)
+    assert result["f1_score"] == pytest.approx(f1_score(y, model.predict(X)))
+    assert result["log_loss"] == pytest.approx(
+        log_loss(y, model.predict_proba(X)[:, 1]), rel=1e-6
+    )
+    carriers = sliced.result(min_support=0).query("dimension == 'unique_carrier'")
+    assert carriers["tp"].sum() == accumulator.confusion[1, 1]
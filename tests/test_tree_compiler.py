@@ -0,0 +1,63 @@
+import lightgbm as lgb
+import numpy as np
+import pytest
+from benchmarks.synthetic import fit_model, make_flights
+from services.tree_compiler import compile_model
+
+# ───────────────────────────────────────────────────────────────
+# Test: Flattened Trees vs Native predict_proba
+# ───────────────────────────────────────────────────────────────
+
+
+@pytest.mark.parametrize(
+    "model_type, params",
+    [
+        ("lightgbm", {"lgbm_n_estimators": 60}),
+        ("random_forest", {"n_estimators": 30, "max_depth": 8}),
+    ],
+)
+def test_compiled_forest_matches_predict_proba(model_type, params):
+    """
+    Ensure flattened trees reproduce predict_proba and predict of the fitted model.
+    """
+    model, preprocessor = fit_model(model_type, n=3000, **params)
+    compiled = compile_model(model)
+
+    X = preprocessor.transform(make_flights(n=1000, seed=11))
+
+    np.testing.assert_allclose(
+        compiled.predict_proba(X), model.predict_proba(X), rtol=0, atol=1e-9
+    )
+    assert np.array_equal(compiled.predict(X), model.predict(X))
+
+
+def test_compiled_forest_handles_categorical_and_missing_values():
+    """
+    Ensure native categorical splits and NaN routing follow LightGBM.
+    """
+    rng = np.random.default_rng(0)
+    X = np.column_stack([rng.integers(0, 40, 3000), rng.normal(size=3000)])
+    X[::17, 1] = np.nan
+    y = ((X[:, 0] % 3 == 0) ^ (rng.random(3000) < 0.1)).astype(int)
+
+    model = lgb.LGBMClassifier(n_estimators=40, verbosity=-1)
+    model.fit(X, y, categorical_feature=[0])
+    compiled = compile_model(model)
+
+    X_test = X.copy()
+    X_test[::11, 0] = -1  # negative categories go right
+    X_test[::19, 0] = 77  # unseen category
+    X_test[::23, 0] = np.nan
+
+    np.testing.assert_allclose(
+        compiled.predict_proba(X_test), model.predict_proba(X_test), atol=1e-9
+    )
+
+
+def test_compile_model_rejects_unsupported_estimators():
+    """
+    Ensure non-tree models are reported as not compilable.
+    """
+    model, _ = fit_model("logistic_regression", n=500)
+    with pytest.raises(ValueError):
+        compile_model(model)
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+optuna = pytest.importorskip("optuna")
+
+# ───────────────────────────────────────────────────────────────
+# Test: Parallel Optuna Search
+# ───────────────────────────────────────────────────────────────
+
+
+def _quadratic(trial):
+    x = trial.suggest_float("x", -1.0, 1.0)
+    return -x * x
+
+
+def test_pruning_callback_reports_validation_f1_and_prunes(fitted_preprocessor):
+    """
+    Ensure the callback reports the validation F1 to the trial every
+    REPORT_EVERY rounds and stops training once the pruner says so.
+    """
+    from lightgbm import LGBMClassifier
+
+    from ml.training.tuning import REPORT_EVERY, LightGBMPruningCallback, lgbm_f1
+
+    X, y, _ = fitted_preprocessor
+    # Every reported value is below the threshold: pruned at the first report
+    study = optuna.create_study(
+        direction="maximize", pruner=optuna.pruners.ThresholdPruner(lower=1.1)
+    )
+    trial = study.ask()
+    model = LGBMClassifier(n_estimators=50, verbosity=-1)
+
+    with pytest.raises(optuna.TrialPruned):
+        model.fit(
+            X,
+            y,
+            eval_set=[(X, y)],
+            eval_metric=lgbm_f1,
+            callbacks=[LightGBMPruningCallback(trial)],
+        )
+
+    reported = study.trials[0].intermediate_values
+    assert list(reported) == [REPORT_EVERY]
+    assert 0.0 < reported[REPORT_EVERY] <= 1.0
+
+
+def test_lgbm_f1_matches_sklearn():
+    """Ensure the LightGBM eval metric is sklearn's F1 at the 0.5 threshold."""
+    from sklearn.metrics import f1_score
+
+    from ml.training.tuning import lgbm_f1
+
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(0, 2, 500)
+    proba = rng.random(500)
+
+    name, value, higher_is_better = lgbm_f1(y_true, proba)
+    assert name == "f1" and higher_is_better
+    assert value == pytest.approx(f1_score(y_true, proba > 0.5))
+
+
+def test_run_study_shares_storage_across_workers_and_resumes(tmp_path):
+    """
+    Ensure worker processes fill one study stored in SQLite up to the trial
+    budget, and that a second run extends it instead of starting over.
+    """
+    from ml.training.tuning import run_study
+
+    storage = f"sqlite:///{tmp_path}/optuna.db"
+    study = run_study(_quadratic, 4, workers=2, storage=storage, study_name="t")
+    first = len(study.trials)
+    # Workers stop at the budget; a trial in flight may still finish
+    assert 4 <= first <= 5
+    assert all(t.state == optuna.trial.TrialState.COMPLETE for t in study.trials)
+
+    study = run_study(_quadratic, 3, storage=storage, study_name="t")
+    assert len(study.trials) == first + 3
+    assert study.best_value <= 0.0